@@ -1,68 +1,312 @@
 # app.py
-import streamlit as st
-import pandas as pd
-from dotenv import load_dotenv
-from components import visualizer, llm_tab
+import importlib
 import os
+import streamlit as st
+from components.ingest import (
+    load_uploaded, load_uploaded_many, load_paths, expand_sources, cache_stats, content_hash, data_root, resolve_local_path
+)
+from components.compaction import enable_copy_on_write, memory_footprint
+from components import profiling, snapshot_store
 
 st.set_page_config(page_title="InfluenShow Dashboard", layout="wide")
+enable_copy_on_write()
+
+# 🐞 Per-rerun stage timings; a requested cProfile capture covers this whole rerun
+run_profile = profiling.start_rerun(capture=st.session_state.pop("profile_next_rerun", False))
+# Set by main(); end_rerun() reads it even when the rerun stops before the toggle
+debug_mode = profiling.ENABLED
 
 # Load CSS
 def local_css(file_name):
     with open(file_name) as f:
         st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 
-local_css("styles.css")
-load_dotenv()
-
-st.title("🎯 InfluenShow – Influencer Intelligence Dashboard")
-
-# 🔁 Column Normalization Logic
-def normalize_columns(df):
-    rename_map = {
-        'channel_info': 'channel_id',
-        'influencer_name': 'channel_id',
-        'engagement_rate': '60_day_eng_rate',
-        'niche': 'domain',
-        'personalized_offer': 'offer_type'
-    }
-    df.columns = df.columns.str.strip().str.lower()
-    df.rename(columns={k.lower(): v for k, v in rename_map.items()}, inplace=True)
-    return df
-
-# 📂 File uploader
-uploaded_file = st.file_uploader("Upload influencer data (.csv)", type=["csv"])
-
-if uploaded_file is not None:
-    df = pd.read_csv(uploaded_file)
-    df = normalize_columns(df)
-    st.success("✅ Data uploaded and standardized!")
-
-    tabs = st.tabs([
-        "📊 Overview",
-        "🧩 Segmentation",
-        "🎯 Offer Analysis",
-        "🔍 Discovery Filters",
-        "🏆 Score Ranking",
-        "📈 Charts",
-        "🤖 LLM Advisor"
-    ])
-
-    with tabs[0]:
-        st.markdown('<div class="fadein">', unsafe_allow_html=True)
-        visualizer.show_overview(df)
-        st.markdown('</div>', unsafe_allow_html=True)
-
-    with tabs[1]:
-        st.markdown('<div class="fadein">', unsafe_allow_html=True)
-        visualizer.show_segmentation(df)
-        st.markdown('</div>', unsafe_allow_html=True)
-
-    with tabs[2]: visualizer.show_offer_analysis(df)
-    with tabs[3]: visualizer.show_discovery_filters(df)
-    with tabs[4]: visualizer.show_score_ranking(df)
-    with tabs[5]: visualizer.show_advanced_charts(df)
-    with tabs[6]: llm_tab.show_llm_tab(df)
-
-else:
-    st.info("📁 Please upload a CSV file to get started.")
+# 🧭 View label -> (module, function); modules are imported on first use
+VIEWS = {
+    "📊 Overview": ("components.visualizer", "show_overview"),
+    "🧩 Segmentation": ("components.visualizer", "show_segmentation"),
+    "🎯 Offer Analysis": ("components.visualizer", "show_offer_analysis"),
+    "🔍 Discovery Filters": ("components.visualizer", "show_discovery_filters"),
+    "🏆 Score Ranking": ("components.visualizer", "show_score_ranking"),
+    "📈 Charts": ("components.visualizer", "show_advanced_charts"),
+    "🧬 Lookalikes": ("components.visualizer", "show_lookalikes"),
+    "🤖 LLM Advisor": ("components.llm_tab", "show_llm_tab"),
+}
+FADE_IN_VIEWS = {"📊 Overview", "🧩 Segmentation"}
+
+def render_view(label, df):
+    module_name, func_name = VIEWS[label]
+    with profiling.stage(f"import:{module_name}"):
+        view = getattr(importlib.import_module(module_name), func_name)
+    with profiling.stage(f"view:{label}", rows=len(df)):
+        if label in FADE_IN_VIEWS:
+            st.markdown('<div class="fadein">', unsafe_allow_html=True)
+            view(df)
+            st.markdown('</div>', unsafe_allow_html=True)
+        else:
+            view(df)
+
+def end_rerun():
+    run = profiling.finish_rerun(write=debug_mode or profiling.ENABLED)
+    if not debug_mode or run is None:
+        return
+    with st.sidebar.expander(f"🐞 Stage timings · {run.seconds:.2f}s total", expanded=True):
+        rows = [
+            {"stage": "· " * r["depth"] + r["stage"], "seconds": r["seconds"], "rows": r["rows"], "Δ RSS MB": r["rss_delta_mb"]}
+            for r in run.summary()
+        ]
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+        st.caption(f"Logged to `{profiling.PROFILE_LOG}` · metrics in `{profiling.PROMETHEUS_PATH}`")
+        if run.profile_text:
+            st.caption(f"cProfile saved to `{run.profile_path}`")
+            st.code(run.profile_text)
+
+# 🗂️ Saved snapshots (memory-mapped, no CSV re-parse)
+def snapshot_sidebar():
+    st.sidebar.header("🗂️ Snapshots")
+    snapshots = snapshot_store.list_snapshots()
+    if not snapshots:
+        st.sidebar.caption("No saved snapshots yet.")
+        return None, None
+
+    labels = {s['name']: f"{s['name']} ({s['size_mb']:,.1f} MB · {s['modified']:%Y-%m-%d %H:%M})" for s in snapshots}
+    choice = st.sidebar.selectbox(
+        "Open snapshot", [None] + list(labels), format_func=lambda n: "— none —" if n is None else labels[n]
+    )
+    if choice is None:
+        return None, None
+
+    columns = st.sidebar.multiselect(
+        "Load only these columns",
+        [col for col in snapshot_store.snapshot_columns(choice) if col not in snapshot_store.CORE_COLUMNS],
+        help="Leave empty to load every column. Core columns (channel_id, followers, engagement, likes, "
+             "country, domain, offer_type) are always loaded."
+    )
+    return choice, columns or None
+
+# 🧠 Memory readout (before/after dtype compaction when known)
+def memory_sidebar(df):
+    footprint = df.attrs.get('memory_footprint')
+    if footprint and footprint['before']:
+        saved = 1 - footprint['after'] / footprint['before']
+        st.sidebar.caption(
+            f"🧠 Memory footprint: {footprint['before'] / 1024 ** 2:,.1f} MB → "
+            f"{footprint['after'] / 1024 ** 2:,.1f} MB ({saved:.0%} smaller)"
+        )
+    else:
+        st.sidebar.caption(f"🧠 Memory footprint: {memory_footprint(df) / 1024 ** 2:,.1f} MB")
+
+# 🧹 Same creator under differently spelled handles (e.g. across merged exports)
+def dedup_sidebar(df):
+    st.sidebar.header("🧹 Duplicate Creators")
+    if 'channel_id' not in df.columns:
+        st.sidebar.caption("Needs a channel_id column.")
+        return df
+    # On by default when several files were combined, where duplicates are most likely
+    if not st.sidebar.toggle("Detect duplicate creators", value='source_file' in df.columns):
+        return df
+
+    from components import dedup
+    threshold = st.sidebar.slider(
+        "Handle similarity", 0.5, 1.0, dedup.DEFAULT_THRESHOLD, 0.05,
+        help="Handles are compared after removing case, '@', spaces and punctuation; "
+             "different handles at least this similar are proposed as one creator."
+    )
+    collapse = st.sidebar.radio(
+        "Duplicates", ["Collapse", "Keep & tag"], horizontal=True,
+        help="Collapse keeps each creator's largest account; Keep & tag keeps every row with a cluster_id. "
+             "Totals count each creator once either way."
+    ) == "Collapse"
+
+    with profiling.stage("dedup.find", len(df)):
+        report = dedup.find_duplicates(df, threshold)
+
+    rejected = []
+    if len(report.pairs):
+        with st.sidebar.expander(f"Review {len(report.pairs):,} fuzzy matches"):
+            review = report.review_table(limit=dedup.REVIEW_ROWS)
+            edited = st.data_editor(
+                review, hide_index=True, disabled=[col for col in review.columns if col != 'merge'],
+                column_config={'pair': None}, key=f"dedup_review_{df.attrs.get('dataset_version')}_{threshold}"
+            )
+            rejected = edited.loc[~edited['merge'], 'pair'].tolist()
+            if len(report.pairs) > len(review):
+                st.caption(f"Showing the {len(review):,} least similar; the rest are merged.")
+
+    with profiling.stage("dedup.assign", len(df)):
+        deduped = dedup.deduplicate(df, threshold, rejected, collapse)
+    creators = len(deduped) if collapse else int(deduped['cluster_primary'].sum())
+    st.sidebar.caption(
+        f"🧹 {len(df):,} rows → {creators:,} creators · {report.exact_duplicates:,} same handle, "
+        f"{len(report.pairs) - len(rejected):,} fuzzy matches merged"
+    )
+    return deduped
+
+# 🔁 Daily delta upserts on top of the loaded roster (kept per session)
+def delta_sidebar(df):
+    st.sidebar.header("🔁 Delta Refresh")
+    base = df.attrs.get('dataset_version')
+    state = st.session_state.get("delta_roster")
+    if state is None or state["base"] != base:
+        state = {"base": base, "df": df, "applied": []}
+
+    # Discarding bumps the generation so the uploader widget is reset too
+    generation = st.session_state.get("delta_generation", 0)
+    delta_file = st.sidebar.file_uploader(
+        "Upsert a delta CSV", type=["csv"], key=f"delta_upload_{generation}",
+        help="Rows are matched on channel_id (case, spaces and '@' ignored); new ids are appended."
+    )
+    if delta_file is not None:
+        data = delta_file.getvalue()
+        delta_id = content_hash(data)
+        if delta_id not in [applied["id"] for applied in state["applied"]]:
+            from components.delta_merge import upsert_csv
+            with profiling.stage("delta_upsert") as record:
+                try:
+                    merged, summary = upsert_csv(state["df"], data)
+                except ValueError as e:
+                    st.sidebar.error(f"❌ {e}")
+                    merged, summary = None, None
+                record["rows"] = summary["updated"] + summary["inserted"] if summary else 0
+            if merged is not None:
+                state = {**state, "df": merged, "applied": state["applied"] + [{"id": delta_id, "name": delta_file.name, **summary}]}
+
+    if not state["applied"]:
+        st.session_state.pop("delta_roster", None)
+        return df
+
+    for applied in state["applied"]:
+        st.sidebar.caption(f"✅ {applied['name']}: {applied['updated']:,} updated · {applied['inserted']:,} added")
+    if st.sidebar.button("↩️ Discard delta updates"):
+        st.session_state.pop("delta_roster", None)
+        st.session_state["delta_generation"] = generation + 1
+        st.rerun()
+    st.session_state["delta_roster"] = state
+    return state["df"].copy(deep=False)
+
+def save_snapshot_sidebar(df):
+    name = st.sidebar.text_input("Snapshot name", "roster")
+    if st.sidebar.button("💾 Save snapshot"):
+        with st.spinner("Writing snapshot..."):
+            path = snapshot_store.save_snapshot(df, name)
+        st.sidebar.success(f"Saved to {path}")
+
+
+def main():
+    global debug_mode
+    debug_mode = st.sidebar.toggle("🐞 Debug timings", value=profiling.ENABLED,
+                                   help="Show per-stage timings and write them to the profile log and Prometheus file.")
+    if debug_mode and st.sidebar.button("📸 Profile one rerun (cProfile)"):
+        st.session_state["profile_next_rerun"] = True
+        st.rerun()
+
+    local_css("styles.css")
+
+    st.title("🎯 InfluenShow – Influencer Intelligence Dashboard")
+
+    # 📂 File uploader (several files are parsed in parallel worker processes)
+    uploaded_files = st.file_uploader("Upload influencer data (.csv)", type=["csv"], accept_multiple_files=True) or []
+    uploaded_file = uploaded_files[0] if uploaded_files else None
+    snapshot_name, snapshot_cols = snapshot_sidebar()
+    df = None
+
+    st.sidebar.header("🌊 Large Files")
+    # Server-side paths are only read under INFLUENSHOW_DATA_ROOT; without it, uploads only
+    root = data_root()
+    folder_source = st.sidebar.text_input(
+        "📁 …or load a local folder / glob", "",
+        help=f"Relative to `{root}`, e.g. `exports/` or `exports/**/*.csv`; every file is read and normalized in parallel."
+    ) if root else ""
+    if not root:
+        st.sidebar.caption("Set `INFLUENSHOW_DATA_ROOT` to load folders and local files from the server.")
+    streaming = st.sidebar.toggle("Streaming mode", help="Read the CSV in chunks and only keep running totals in memory.")
+    local_path = st.sidebar.text_input("…or stream a local CSV path", "", help=f"Relative to `{root}`") if streaming and root else ""
+
+    if streaming and (uploaded_file is not None or local_path):
+        from components import visualizer
+        if local_path:
+            try:
+                local_path = resolve_local_path(local_path, root)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                st.stop()
+            if not os.path.isfile(local_path):
+                st.error(f"❌ File not found: {local_path}")
+                st.stop()
+            with open(local_path, 'rb') as source, profiling.stage("streaming"):
+                visualizer.show_streaming_overview(source, total_bytes=os.path.getsize(local_path))
+        else:
+            with profiling.stage("streaming"):
+                visualizer.show_streaming_overview(uploaded_file, total_bytes=uploaded_file.size)
+        st.stop()
+
+    if uploaded_files or folder_source:
+        paths = expand_sources(folder_source, root) if not uploaded_files else []
+        if folder_source and not uploaded_files and not paths:
+            st.error(f"❌ No CSV files match: {folder_source}")
+            st.stop()
+
+        # Cached on content hash (or path + mtime), so widget reruns skip parsing entirely
+        with profiling.stage("ingest") as record:
+            try:
+                if len(uploaded_files) == 1:
+                    df, cache_hit = load_uploaded(uploaded_file)
+                elif uploaded_files:
+                    df, cache_hit = load_uploaded_many(uploaded_files)
+                else:
+                    df, cache_hit = load_paths(paths)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                st.stop()
+            record["rows"] = len(df)
+
+        for failed in df.attrs.get("ingest_errors", []):
+            st.warning(f"⚠️ Skipped {failed['file']}: {failed['error']}")
+        n_files = df['source_file'].nunique() if 'source_file' in df.columns else 1
+        st.success(f"✅ Data uploaded and standardized! ({n_files} file{'s' if n_files != 1 else ''}, {len(df):,} rows)")
+
+        stats = cache_stats()
+        st.sidebar.caption(
+            f"{'⚡ Parse cache hit' if cache_hit else '🐢 Parse cache miss'} · "
+            f"{stats['hits']} hits / {stats['misses']} misses · "
+            f"{stats['entries']} cached ({stats['bytes'] / 1024 ** 2:,.1f} MB)"
+        )
+
+    elif snapshot_name is not None:
+        with profiling.stage("snapshot_load") as record:
+            df = snapshot_store.load_snapshot(snapshot_name, columns=snapshot_cols)
+            record["rows"] = len(df)
+        st.success(f"✅ Snapshot '{snapshot_name}' loaded ({len(df):,} rows)")
+
+    if df is not None:
+        df = dedup_sidebar(df)
+        df = delta_sidebar(df)
+        if 'bulk_suitability' in st.session_state:
+            from components.llm_tab import attach_bulk_suitability
+            df = attach_bulk_suitability(df)
+        memory_sidebar(df)
+        if uploaded_files or folder_source:
+            save_snapshot_sidebar(df)
+        lazy_nav = st.sidebar.radio(
+            "Navigation", ["Active view only", "All tabs"],
+            help="'Active view only' runs just the selected view on each interaction; "
+                 "'All tabs' computes every tab body on every rerun."
+        ) == "Active view only"
+
+        if lazy_nav:
+            active = st.radio("View", list(VIEWS), horizontal=True, label_visibility="collapsed", key="active_view")
+            render_view(active, df)
+        else:
+            for tab, label in zip(st.tabs(list(VIEWS)), VIEWS):
+                with tab:
+                    render_view(label, df)
+
+    else:
+        st.info("📁 Please upload a CSV file or open a saved snapshot to get started.")
+
+
+# Every exit path (normal end, st.stop() inside a view, st.rerun()) closes the rerun record
+try:
+    main()
+finally:
+    end_rerun()
@@ -0,0 +1,97 @@
+# benchmarks/fake_gemini_server.py
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 🧪 Local stand-in for the Gemini REST API, for exercising bulk scoring offline:
+#   python -m benchmarks.fake_gemini_server --port 8765 --drop-rate 0.1 --invalid-rate 0.05
+#   GEMINI_API_KEY=fake GEMINI_API_ENDPOINT=http://127.0.0.1:8765 streamlit run app.py
+
+PROFILE_RE = re.compile(r"^### Profile (\S+)\n(.*?)(?=^### Profile |\Z)", re.S | re.M)
+USERNAME_RE = re.compile(r"Username: @(\S+)")
+FLAGS = ['Low engagement for size', 'Audience outside target region', 'Inconsistent posting', 'Heavy sponsored content']
+
+
+def _score(text):
+    # Deterministic per profile, so repeated runs and re-splits agree
+    return int(hashlib.md5(text.encode()).hexdigest(), 16) % 101
+
+
+def bulk_reply(prompt, rng, drop_rate=0.0, invalid_rate=0.0):
+    """JSON array answering every '### Profile <id>' section, with some items dropped or broken."""
+    items = []
+    for pid, body in PROFILE_RE.findall(prompt):
+        if rng.random() < drop_rate:
+            continue
+        match = USERNAME_RE.search(body)
+        name = match.group(1) if match else pid
+        score = _score(body)
+        item = {
+            'id': pid,
+            'score': score,
+            'alignment': f"@{name} reaches an audience that overlaps the brief at about {score}%.",
+            'risk_flags': [FLAGS[score % len(FLAGS)]] if score < 40 else [],
+        }
+        if rng.random() < invalid_rate:
+            item['score'] = rng.choice([150, -5, 'high', None])
+        items.append(item)
+    return json.dumps(items)
+
+
+def make_handler(drop_rate=0.0, invalid_rate=0.0, garbage_rate=0.0, latency=0.0, seed=None):
+    rng = random.Random(seed)
+
+    class FakeGeminiHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            prompt = body['contents'][0]['parts'][0]['text']
+            if latency:
+                time.sleep(latency)
+
+            if not PROFILE_RE.search(prompt):
+                text = "**Brand Suitability Summary:** fake response for local testing."
+            elif rng.random() < garbage_rate:
+                text = "Sorry, here are the results: [{\"id\": "
+            else:
+                text = bulk_reply(prompt, rng, drop_rate, invalid_rate)
+
+            out = json.dumps({'candidates': [{
+                'content': {'parts': [{'text': text}], 'role': 'model'},
+                'finishReason': 'STOP',
+                'index': 0,
+            }]}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+
+        def log_message(self, *args):
+            pass
+
+    return FakeGeminiHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake Gemini endpoint for offline bulk-scoring runs.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--drop-rate', type=float, default=0.0, help="share of profiles left out of a reply")
+    parser.add_argument('--invalid-rate', type=float, default=0.0, help="share of profiles with an invalid score")
+    parser.add_argument('--garbage-rate', type=float, default=0.0, help="share of bulk replies that are not JSON")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds per request")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    handler = make_handler(args.drop_rate, args.invalid_rate, args.garbage_rate, args.latency, args.seed)
+    print(f"Fake Gemini listening on http://{args.host}:{args.port}")
+    ThreadingHTTPServer((args.host, args.port), handler).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
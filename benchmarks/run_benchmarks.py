@@ -0,0 +1,306 @@
+# benchmarks/run_benchmarks.py
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_data import DEFAULT_SEED, SIZES, ensure_dataset
+from components import dataset_memo
+from components.dedup import DuplicateReport, assign_clusters
+from components.domain_detection import detect_content_domain
+from components.export_formats import write_export
+from components.filter_index import get_filter_index
+from components.ingest import load_files, normalize_columns
+from components.insight_generator import generate_derived_features
+from components.lookalike import LookalikeIndex
+from components.rollup import RollupCube
+from components.scoring import add_scores, top_k
+from components.segmentation import segment_counts, segment_followers
+from influencer_dashboard.utils.data_loader import load_data
+from influencer_dashboard.utils.metrics import calculate_metrics
+
+BASELINE_PATH = os.path.join('benchmarks', 'baseline.json')
+RESULTS_PATH = os.path.join('.cache', 'bench', 'results.json')
+# The dataset is also split into this many files for the multi-file ingest stage
+INGEST_PARTS = 4
+
+# A stage regresses when it is slower/larger than baseline by this ratio AND this absolute amount
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.20
+MIN_SECONDS = 0.05
+MIN_MB = 5.0
+
+
+# ---------------------- PIPELINE STAGES ----------------------
+# Each stage reads the shared state and returns new entries; inputs are never mutated,
+# so a stage can be re-run on the same state for the memory pass.
+
+def _load(state):
+    return {'df': load_data(state['path'])}
+
+
+def _normalize(state):
+    df = normalize_columns(state['df'].copy(deep=False))
+    df.attrs['dataset_version'] = f"bench:{os.path.basename(state['path'])}"
+    return {'df': df}
+
+
+def _part_files(path, parts=INGEST_PARTS):
+    # Written once next to the dataset, like ensure_dataset(); reused by later runs
+    folder = os.path.splitext(path)[0] + f"_parts{parts}"
+    files = [os.path.join(folder, f"part_{i}.csv") for i in range(parts)]
+    if not all(os.path.exists(f) for f in files):
+        os.makedirs(folder, exist_ok=True)
+        df = pd.read_csv(path, dtype=str)
+        for i, rows in enumerate(np.array_split(np.arange(len(df)), parts)):
+            df.iloc[rows].to_csv(files[i], index=False)
+    return files
+
+
+def _multi_file_ingest(state):
+    # load_files() directly, so the parse cache never turns a repeat into a hit
+    files = _part_files(state['path'])
+    return {'multi_file': load_files({os.path.basename(f): f for f in files})}
+
+
+def _derive(state):
+    return {'df': generate_derived_features(state['df'].copy(deep=False))}
+
+
+def _domains(state):
+    return {'df': detect_content_domain(state['df'].copy(deep=False))}
+
+
+def _segmentation(state):
+    segments = segment_followers(state['df']['followers'])
+    return {'segments': segment_counts(pd.DataFrame({'Segment': segments}))}
+
+
+def _metrics(state):
+    return {'metrics': calculate_metrics(state['df'])}
+
+
+def _rollup(state):
+    # Cube build plus the slices the chart views ask for
+    cube = RollupCube().update(state['df'])
+    sliced = cube.where({'country': ['India', 'USA'], 'domain': ['Tech']})
+    return {'cube': [cube.metrics(), cube.summary('Segment'), sliced.offer_counts, sliced.summary('Segment', 'offer_type')]}
+
+
+def _discovery(state):
+    index = get_filter_index(state['df'])
+    rows = index.query(
+        ranges={'followers': (10_000, 1_000_000), '60_day_eng_rate': (2.0, 8.0)},
+        members={'country': ['India', 'USA', 'UK'], 'domain': ['Fashion', 'Beauty', 'Fitness']}
+    )
+    return {'rows': rows}
+
+
+def _ranking(state):
+    df = add_scores(state['df'].copy(deep=False), preset='Engagement')
+    return {'top': top_k(df['influence_score'].to_numpy(), 100, df['Segment'])}
+
+
+def _dedup(state):
+    # Candidate search + clustering; kept out of 'df' so later stages see every row
+    report = DuplicateReport(state['df'])
+    return {'deduped': assign_clusters(state['df'], report, collapse=True)}
+
+
+def _lookalike(state):
+    # Index build plus a handful of unfiltered and filtered queries
+    index = LookalikeIndex(state['df'])
+    queries = np.linspace(0, len(state['df']) - 1, 5).astype(int)
+    return {'lookalikes': [index.query(q, 50, rows=rows) for q in queries for rows in (None, state['rows'])]}
+
+
+def _report(state):
+    # Streamlit-free core of download_report_builder: chunked csv.gz of the filtered rows
+    fd, path = tempfile.mkstemp(suffix='.csv.gz')
+    os.close(fd)
+    try:
+        written = write_export(state['df'], path, 'csv.gz', rows=state['rows'])
+    finally:
+        os.remove(path)
+    return {'exported': written}
+
+
+STAGES = [
+    ('load_data', _load),
+    ('normalize_columns', _normalize),
+    ('multi_file_ingest', _multi_file_ingest),
+    ('generate_derived_features', _derive),
+    ('detect_content_domain', _domains),
+    ('segmentation', _segmentation),
+    ('calculate_metrics', _metrics),
+    ('rollup_cube', _rollup),
+    ('discovery_filter', _discovery),
+    ('ranking', _ranking),
+    ('lookalike_search', _lookalike),
+    ('deduplicate', _dedup),
+    ('report_export', _report),
+]
+
+
+# ---------------------- RUNNER ----------------------
+
+def _timed_pass(path):
+    dataset_memo.clear()
+    state, seconds = {'path': path}, {}
+    for name, stage in STAGES:
+        gc.collect()
+        start = time.perf_counter()
+        state.update(stage(state))
+        seconds[name] = time.perf_counter() - start
+    return seconds
+
+
+def _memory_pass(path):
+    # Separate from timing: tracemalloc slows allocation-heavy code considerably
+    dataset_memo.clear()
+    state, peaks = {'path': path}, {}
+    tracemalloc.start()
+    try:
+        for name, stage in STAGES:
+            gc.collect()
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            state.update(stage(state))
+            peaks[name] = (tracemalloc.get_traced_memory()[1] - before) / 1024 ** 2
+    finally:
+        tracemalloc.stop()
+    return peaks, len(state['df'])
+
+
+def run_size(size, seed=DEFAULT_SEED, repeat=3, memory=True):
+    path = ensure_dataset(size, seed)
+    runs = [_timed_pass(path) for _ in range(repeat)]
+    peaks, rows = _memory_pass(path) if memory else ({}, None)
+
+    return {
+        'rows': rows if rows is not None else SIZES[size],
+        'stages': {
+            name: {
+                'seconds': round(min(run[name] for run in runs), 4),
+                'peak_mb': round(peaks[name], 2) if name in peaks else None,
+            }
+            for name, _ in STAGES
+        }
+    }
+
+
+def environment():
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results, baseline):
+    """List of (size, stage, metric, baseline, current) for every regression beyond tolerance."""
+    regressions = []
+    for size, current in results.items():
+        base = baseline.get(size)
+        if base is None:
+            continue
+        for stage, now in current['stages'].items():
+            then = base['stages'].get(stage)
+            if then is None:
+                continue
+            checks = [('seconds', TIME_TOLERANCE, MIN_SECONDS), ('peak_mb', MEMORY_TOLERANCE, MIN_MB)]
+            for metric, tolerance, floor in checks:
+                old, new = then.get(metric), now.get(metric)
+                if old is None or new is None:
+                    continue
+                if new > old * (1 + tolerance) and new - old > floor:
+                    regressions.append((size, stage, metric, old, new))
+    return regressions
+
+
+def _print_table(size, result, baseline):
+    base = (baseline.get(size) or {}).get('stages', {})
+    print(f"\n📏 {size} ({result['rows']:,} rows)")
+    print(f"{'stage':<28}{'seconds':>10}{'baseline':>10}{'peak MB':>10}{'baseline':>10}")
+    for stage, now in result['stages'].items():
+        then = base.get(stage, {})
+        fmt = lambda v, spec: format(v, spec) if v is not None else f"{'—':>10}"
+        print(
+            f"{stage:<28}{fmt(now['seconds'], '10.3f')}{fmt(then.get('seconds'), '10.3f')}"
+            f"{fmt(now['peak_mb'], '10.1f')}{fmt(then.get('peak_mb'), '10.1f')}"
+        )
+
+
+def _read_json(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_json(path, payload):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time every pipeline stage on synthetic data and compare to a baseline.")
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=['10k'])
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--repeat', type=int, default=3, help="Timed passes per size; the fastest is reported")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    parser.add_argument('--output', default=RESULTS_PATH)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help="Store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = {size: run_size(size, args.seed, args.repeat, memory=not args.no_memory) for size in args.sizes}
+    _write_json(args.output, {'environment': environment(), 'seed': args.seed, 'results': results})
+
+    stored = _read_json(args.baseline)
+    baseline = stored['results'] if stored else {}
+    for size, result in results.items():
+        _print_table(size, result, baseline)
+    print(f"\n📝 Results written to {args.output}")
+
+    if args.update_baseline:
+        merged = {**baseline, **results}
+        _write_json(args.baseline, {'environment': environment(), 'seed': args.seed, 'results': merged})
+        print(f"📌 Baseline updated: {args.baseline}")
+        return 0
+
+    # Without a baseline nothing is checked, which must not pass as "no regressions"
+    if not stored:
+        print(f"❌ No baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 2
+    missing = [size for size in results if size not in baseline]
+    if missing:
+        print(f"❌ Baseline has no results for {', '.join(missing)}; run with --update-baseline --sizes {' '.join(missing)}.")
+        return 2
+
+    regressions = compare(results, baseline)
+    for size, stage, metric, old, new in regressions:
+        print(f"❌ {size} {stage}: {metric} {old} → {new}")
+    if regressions:
+        return 1
+    print("✅ No regressions against baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# benchmarks/synthetic_data.py
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# 📏 Named dataset sizes used by the benchmark suite
+SIZES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+DEFAULT_SEED = 42
+DATA_DIR = os.path.join('.cache', 'bench')
+
+_CHUNK_ROWS = 250_000
+
+COUNTRIES = ['India', 'USA', 'UK', 'Brazil', 'Germany', 'Indonesia', 'Japan', 'Nigeria', 'unknown']
+DOMAINS = ['Fashion', 'Beauty', 'Fitness', 'Tech', 'Food', 'Travel', 'Gaming', 'N/A']
+OFFERS = ['Discount Code', 'Free Product', 'Ambassador Deal', 'Sponsorship', 'Event Invite', 'Affiliate', 'N/A', 'unknown', '']
+HANDLE_WORDS = ['fitness', 'beauty', 'makeup', 'fashion', 'tech', 'daily', 'vibes', 'life', 'studio', 'official', 'the', 'real']
+
+
+def _format_counts(values, rng):
+    """Render counts the way scraped exports do: 15000, 15,000, 15k, 1.2M, unknown."""
+    values = np.asarray(values, dtype='int64')
+    style = rng.choice(5, size=len(values), p=[0.35, 0.2, 0.2, 0.2, 0.05])
+    out = pd.Series(values).astype(str).to_numpy(dtype=object)
+
+    commas = style == 1
+    out[commas] = [f"{v:,}" for v in values[commas]]
+
+    thousands = style == 2
+    out[thousands] = [f"{v / 1_000:.1f}k" for v in values[thousands]]
+
+    millions = style == 3
+    out[millions] = [f"{v / 1_000_000:.2f}M" if v >= 1_000_000 else f"{v / 1_000:.1f}K" for v in values[millions]]
+
+    out[style == 4] = rng.choice(['unknown', '', 'N/A'], size=int((style == 4).sum()))
+    return out
+
+
+def _format_rates(rates, rng):
+    """Engagement as "4.5%", "4.5", multi-value "4.1% 5.2%" cells or placeholders."""
+    style = rng.choice(4, size=len(rates), p=[0.7, 0.1, 0.15, 0.05])
+    out = np.char.add(np.char.mod('%.2f', rates), '%').astype(object)
+
+    bare = style == 1
+    out[bare] = np.char.mod('%.2f', rates[bare])
+
+    multi = style == 2
+    second = np.clip(rates[multi] + rng.normal(0, 0.8, multi.sum()), 0, None)
+    out[multi] = [f"{a:.1f}% {b:.1f}%" for a, b in zip(rates[multi], second)]
+
+    out[style == 3] = rng.choice(['N/A', 'unknown', ''], size=int((style == 3).sum()))
+    return out
+
+
+def generate_frame(rows, seed=DEFAULT_SEED, start=0):
+    """Rows [start, start + rows) of the synthetic dataset; identical for the same seed and offset."""
+    rng = np.random.default_rng([seed, start])
+    ids = np.arange(start, start + rows)
+
+    followers = np.clip(rng.lognormal(mean=10.5, sigma=2.0, size=rows), 50, 400_000_000).astype('int64')
+    # Engagement falls off with reach, as it does for real accounts
+    rates = np.clip(rng.gamma(2.0, 2.5, rows) * (1.6 - 0.1 * np.log10(followers)), 0.05, 40.0)
+    likes = (followers * rates / 100 * rng.uniform(0.6, 1.1, rows)).astype('int64')
+
+    words = rng.choice(HANDLE_WORDS, size=(rows, 2))
+    handles = np.char.add(np.char.add(np.char.add('@', words[:, 0]), words[:, 1]), ids.astype(str))
+
+    return pd.DataFrame({
+        'channel_info': handles,
+        'followers': _format_counts(followers, rng),
+        'avg_likes': _format_counts(likes, rng),
+        '60_day_eng_rate': _format_rates(rates, rng),
+        'country': rng.choice(COUNTRIES, size=rows),
+        'domain': rng.choice(DOMAINS, size=rows),
+        'offer_type': rng.choice(OFFERS, size=rows),
+    })
+
+
+def write_csv(path, rows, seed=DEFAULT_SEED, chunk_rows=_CHUNK_ROWS):
+    # Written chunk by chunk so 10M rows never sit in memory at once
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.partial'
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+        for start in range(0, rows, chunk_rows):
+            chunk = generate_frame(min(chunk_rows, rows - start), seed, start)
+            chunk.to_csv(f, index=False, header=(start == 0))
+    os.replace(tmp_path, path)
+    return path
+
+
+def dataset_path(size, seed=DEFAULT_SEED, root=DATA_DIR):
+    return os.path.join(root, f"influencers_{size}_seed{seed}.csv")
+
+
+def ensure_dataset(size, seed=DEFAULT_SEED, root=DATA_DIR):
+    """Path to the synthetic CSV for a named size, generating it on first use."""
+    path = dataset_path(size, seed, root)
+    if not os.path.exists(path):
+        write_csv(path, SIZES[size], seed)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic influencer CSV.")
+    parser.add_argument('--size', choices=list(SIZES), default='10k')
+    parser.add_argument('--rows', type=int, help="Exact row count (overrides --size)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--out', help="Output path (default: .cache/bench/influencers_<size>_seed<seed>.csv)")
+    args = parser.parse_args(argv)
+
+    rows = args.rows or SIZES[args.size]
+    path = args.out or dataset_path(args.size if not args.rows else f"{rows}rows", args.seed)
+    write_csv(path, rows, args.seed)
+    print(f"Wrote {rows:,} rows to {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+# components/batch_scoring.py
+
+import argparse
+import glob
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from components.domain_detection import detect_content_domain
+from components.features import FEATURES, is_rowwise
+from components.ingest import COLUMN_MAP, expand_sources, normalize_columns, prepare_frame
+from components.insight_generator import generate_derived_features
+from components.scoring import DEFAULT_PRESET, WEIGHT_PRESETS, add_scores, merge_bounds, score_bounds
+from components.snapshot_store import SNAPSHOT_DIR, save_snapshot_parts
+from components.streaming import RunningAggregates
+
+# Columns every input file must provide (after COLUMN_MAP renames)
+REQUIRED_COLUMNS = ['channel_id', 'followers', 'avg_likes']
+OUTPUT_FORMATS = {'parquet': '.parquet', 'csv': '.csv.gz'}
+SCORE_COLUMNS = ['influence_score', 'brand_fit_score']
+DEFAULT_PARTITION_MB = 128
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_SCHEMA = 2
+
+
+# ---------------------- PLANNING ----------------------
+
+def check_schema(paths, column_map=COLUMN_MAP, required=REQUIRED_COLUMNS):
+    """{path: problem} for inputs whose header is unreadable or lacks a required column."""
+    problems = {}
+    for path in paths:
+        try:
+            header = normalize_columns(pd.read_csv(path, nrows=0), column_map)
+        except Exception as e:
+            problems[path] = f"{type(e).__name__}: {e}"
+            continue
+        missing = [col for col in required if col not in header.columns]
+        if missing:
+            problems[path] = f"missing column(s) {', '.join(missing)}"
+    return problems
+
+
+def plan_partitions(paths, partition_bytes):
+    """(path, start, end) byte ranges splitting each CSV after its header on line boundaries.
+
+    Assumes no quoted field spans several lines; pass partition_bytes=None to read
+    such files whole.
+    """
+    partitions = []
+    for path in paths:
+        size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            start = len(f.readline())
+            if start >= size:
+                partitions.append((path, start, start))
+            while start < size:
+                end = size if partition_bytes is None else min(start + partition_bytes, size)
+                if end < size:
+                    f.seek(end)
+                    f.readline()
+                    end = f.tell()
+                partitions.append((path, start, end))
+                start = end
+    return partitions
+
+
+def _unify_schemas(schemas):
+    """One Arrow schema for every partition: conflicting numeric types widen to float64,
+    anything else that disagrees becomes string."""
+    import pyarrow as pa
+
+    types = {}
+    for schema in schemas:
+        for field in schema:
+            types.setdefault(field.name, set()).add(field.type)
+
+    fields = []
+    for name, seen in types.items():
+        seen = {t for t in seen if t != pa.null()} or {pa.null()}
+        if len(seen) == 1:
+            dtype = seen.pop()
+        elif all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in seen):
+            dtype = pa.float64()
+        else:
+            dtype = pa.large_string()
+        fields.append(pa.field(name, dtype))
+    return pa.schema(fields)
+
+
+def _align(table, schema):
+    import pyarrow as pa
+
+    columns = [
+        table.column(field.name).cast(field.type) if field.name in table.column_names
+        else pa.nulls(len(table), field.type)
+        for field in schema
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+# ---------------------- WORKERS ----------------------
+
+def _read_partition(path, start, end, column_map):
+    with open(path, 'rb') as f:
+        header = f.readline()
+        f.seek(start)
+        body = f.read(end - start)
+    return prepare_frame(pd.read_csv(io.BytesIO(header + body)), column_map)
+
+
+def _derive_partition(task):
+    """Pass 1: parse, rowwise features and content domains; staged as Arrow IPC."""
+    import pyarrow as pa
+
+    index, (path, start, end), staging, column_map = task
+    df = _read_partition(path, start, end, column_map)
+    # Dataset-wide features (influence_score, brand_fit_score) wait for the global bounds
+    df = generate_derived_features(df, [name for name in FEATURES if is_rowwise(name)])
+    df = detect_content_domain(df)
+    df['source_file'] = path
+
+    table = pa.Table.from_pandas(df.drop(columns=SCORE_COLUMNS, errors='ignore'), preserve_index=False)
+    staged = os.path.join(staging, f"derived-{index:05d}.arrow")
+    with pa.OSFile(staged, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    domains = df['content_domain'].value_counts().to_dict() if 'content_domain' in df.columns else {}
+    return {
+        'staged': staged,
+        'rows': len(df),
+        'schema': table.schema,
+        'bounds': score_bounds(df),
+        'aggregates': RunningAggregates().update(df),
+        'domains': domains,
+    }
+
+
+def _score_partition(task):
+    """Pass 2: align to the shared schema, score against the global bounds, write outputs."""
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+
+    index, staged, schema, bounds, weights, fmt, out_dir, keep_staged = task
+    with pa.memory_map(staged, 'r') as source:
+        table = _align(pa.ipc.open_file(source).read_all(), schema)
+
+    # Only the score inputs go through pandas; every other column stays in Arrow
+    inputs = [col for col in ('followers', 'avg_likes', '60_day_eng_rate') if col in table.column_names]
+    scored = add_scores(table.select(inputs).to_pandas(), weights, bounds=bounds)
+    for col in SCORE_COLUMNS:
+        table = table.append_column(col, pa.array(scored[col].to_numpy(), type=pa.float64()))
+
+    output = os.path.join(out_dir, f"part-{index:05d}{OUTPUT_FORMATS[fmt]}")
+    if fmt == 'parquet':
+        pq.write_table(table, output, compression='zstd')
+    else:
+        with pa.CompressedOutputStream(output, 'gzip') as sink:
+            pa_csv.write_csv(table, sink)
+
+    # A scored Arrow copy is kept for assembling the snapshot afterwards; the staged
+    # file is still memory-mapped by `table`, so it is never rewritten in place
+    scored_path = None
+    if keep_staged:
+        scored_path = os.path.join(os.path.dirname(staged), f"scored-{index:05d}.arrow")
+        with pa.OSFile(scored_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.remove(staged)
+
+    scores = scored['influence_score']
+    return {
+        'output': output,
+        'scored': scored_path,
+        'score_sum': float(scores.sum()),
+        'score_min': float(scores.min()),
+        'score_max': float(scores.max()),
+    }
+
+
+def _run(func, tasks, max_workers):
+    """(results, errors) of func over tasks, in task order, across worker processes."""
+    results, errors = [None] * len(tasks), []
+    if max_workers <= 1:
+        for i, task in enumerate(tasks):
+            try:
+                results[i] = func(task)
+            except Exception as e:
+                errors.append((i, f"{type(e).__name__}: {e}"))
+        return results, errors
+
+    # spawn matches components.ingest, so the pipeline behaves the same in the dashboard
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        futures = [pool.submit(func, task) for task in tasks]
+        for i, future in enumerate(futures):
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                errors.append((i, f"{type(e).__name__}: {e}"))
+    return results, errors
+
+
+# ---------------------- PIPELINE ----------------------
+
+def _partition_error(partition, error):
+    path, start, end = partition
+    return {'file': path, 'bytes': [start, end], 'error': error}
+
+
+def run_batch(paths, out_dir, fmt='parquet', preset=DEFAULT_PRESET, weights=None, snapshot=None,
+              snapshot_root=SNAPSHOT_DIR, partition_mb=DEFAULT_PARTITION_MB, max_workers=None,
+              column_map=COLUMN_MAP, log=print):
+    """Run the dashboard pipeline over CSV `paths` and write scored parts plus _metrics.json.
+
+    Returns the summary dict; summary['errors'] lists partitions that failed (their rows
+    are missing from the outputs and no snapshot is written).
+    """
+    started = time.perf_counter()
+    seconds = {}
+    weights = {**WEIGHT_PRESETS[preset], **(weights or {})}
+    max_workers = max_workers or os.cpu_count() or 1
+
+    os.makedirs(out_dir, exist_ok=True)
+    for old in glob.glob(os.path.join(out_dir, 'part-*')):
+        os.remove(old)
+    staging = os.path.join(out_dir, '.staging')
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    partitions = plan_partitions(paths, partition_mb * 1024 ** 2 if partition_mb else None)
+    workers = min(max_workers, len(partitions)) or 1
+    log(f"🗂️ {len(paths)} file(s) → {len(partitions)} partition(s) on {workers} worker(s)")
+
+    t = time.perf_counter()
+    tasks = [(i, partition, staging, column_map) for i, partition in enumerate(partitions)]
+    derived, failed = _run(_derive_partition, tasks, workers)
+    seconds['derive'] = time.perf_counter() - t
+    errors = [_partition_error(partitions[i], error) for i, error in failed]
+    derived = [(i, part) for i, part in enumerate(derived) if part is not None]
+    log(f"🧮 Parsed and derived {sum(p['rows'] for _, p in derived):,} rows in {seconds['derive']:.1f}s")
+
+    schema = _unify_schemas(part['schema'] for _, part in derived)
+    bounds = merge_bounds(part['bounds'] for _, part in derived)
+    keep_staged = snapshot is not None and not errors
+
+    t = time.perf_counter()
+    tasks = [(i, part['staged'], schema, bounds, weights, fmt, out_dir, keep_staged) for i, part in derived]
+    scored, failed = _run(_score_partition, tasks, workers)
+    seconds['score_write'] = time.perf_counter() - t
+    errors += [_partition_error(partitions[derived[i][0]], error) for i, error in failed]
+    log(f"🏆 Scored and wrote {len([s for s in scored if s])} part(s) in {seconds['score_write']:.1f}s")
+
+    snapshot_path = None
+    if snapshot is not None and not errors:
+        t = time.perf_counter()
+        snapshot_path = save_snapshot_parts([part['scored'] for part in scored], snapshot, snapshot_root)
+        seconds['snapshot'] = time.perf_counter() - t
+        log(f"📸 Snapshot written to {snapshot_path}")
+    elif snapshot is not None:
+        log("⚠️ Snapshot skipped: some partitions failed")
+    shutil.rmtree(staging, ignore_errors=True)
+
+    aggregates = RunningAggregates()
+    domains = pd.Series(dtype='int64')
+    for _, part in derived:
+        aggregates.merge(part['aggregates'])
+        domains = domains.add(pd.Series(part['domains'], dtype='int64'), fill_value=0)
+    scored_rows = sum(derived[i][1]['rows'] for i, s in enumerate(scored) if s)
+    scored = [s for s in scored if s]
+    seconds['total'] = time.perf_counter() - started
+
+    summary = {
+        'inputs': list(paths),
+        'partitions': len(partitions),
+        'workers': workers,
+        'rows': aggregates.rows,
+        'metrics': {k: float(v) if isinstance(v, float) else int(v) for k, v in aggregates.metrics().items()},
+        'segments': {str(k): int(v) for k, v in aggregates.segment_counts.items()},
+        'offers': {str(k): int(v) for k, v in aggregates.offer_counts.items()},
+        'content_domains': {str(k): int(v) for k, v in domains.sort_values(ascending=False).items()},
+        'influence_score': {
+            'preset': preset,
+            'weights': weights,
+            'mean': sum(s['score_sum'] for s in scored) / scored_rows if scored_rows else None,
+            'min': min((s['score_min'] for s in scored), default=None),
+            'max': max((s['score_max'] for s in scored), default=None),
+        },
+        'outputs': [s['output'] for s in scored],
+        'snapshot': snapshot_path,
+        'seconds': {k: round(v, 3) for k, v in seconds.items()},
+        'errors': errors,
+    }
+    with open(os.path.join(out_dir, '_metrics.json'), 'w') as f:
+        json.dump(summary, f, indent=2, default=str)
+        f.write('\n')
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Score influencer CSVs with the dashboard pipeline, without Streamlit."
+    )
+    parser.add_argument('inputs', nargs='+', help="CSV files, directories or glob patterns")
+    parser.add_argument('--out', required=True, help="Directory for part files and _metrics.json")
+    parser.add_argument('--format', choices=list(OUTPUT_FORMATS), default='parquet')
+    parser.add_argument('--preset', choices=list(WEIGHT_PRESETS), default=DEFAULT_PRESET)
+    parser.add_argument('--snapshot', help="Also save a snapshot with this name for the dashboard to open")
+    parser.add_argument('--snapshot-dir', default=SNAPSHOT_DIR)
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--partition-mb', type=int, default=DEFAULT_PARTITION_MB,
+                        help="Split inputs into ranges of about this size; 0 reads each file whole "
+                             "(needed when quoted fields contain newlines)")
+    args = parser.parse_args(argv)
+
+    paths = [path for pattern in args.inputs for path in (expand_sources(pattern) or [])]
+    if not paths:
+        print(f"❌ No CSV files match: {' '.join(args.inputs)}", file=sys.stderr)
+        return EXIT_SCHEMA
+
+    problems = check_schema(paths)
+    for path, problem in problems.items():
+        print(f"❌ {path}: {problem}", file=sys.stderr)
+    if problems:
+        print(f"Required columns: {', '.join(REQUIRED_COLUMNS)}", file=sys.stderr)
+        return EXIT_SCHEMA
+
+    summary = run_batch(
+        paths, args.out, fmt=args.format, preset=args.preset, snapshot=args.snapshot,
+        snapshot_root=args.snapshot_dir, partition_mb=args.partition_mb or None, max_workers=args.workers
+    )
+    print(f"📝 {summary['rows']:,} rows · metrics in {os.path.join(args.out, '_metrics.json')}")
+    for error in summary['errors']:
+        print(f"❌ {error['file']} bytes {error['bytes'][0]}–{error['bytes'][1]}: {error['error']}", file=sys.stderr)
+    return EXIT_FAILED if summary['errors'] else EXIT_OK
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,5 @@
+from components.numeric_parser import parse_counts
+
 def clean_columns(df):
-    df['followers'] = (
-        df['followers'].astype(str)
-        .str.replace(',', '', regex=False)
-        .str.extract(r'(\d+)', expand=False)
-        .astype(float)
-    )
+    df['followers'] = parse_counts(df['followers'])
     return df
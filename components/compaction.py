@@ -0,0 +1,62 @@
+# components/compaction.py
+
+import numpy as np
+import pandas as pd
+
+# String columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_RATIO = 0.5
+# Identifier-like columns stay as strings even if they repeat
+KEEP_AS_STRING = ('channel_id',)
+
+# Narrower ints save little more and overflow easily in downstream arithmetic
+_INT32 = np.iinfo('int32')
+
+
+def enable_copy_on_write():
+    # Default from pandas 3; on 2.x this makes shallow copies and slices safe to share
+    if int(pd.__version__.split('.')[0]) < 3:
+        pd.set_option('mode.copy_on_write', True)
+
+
+def memory_footprint(df):
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def _fits_int32(values):
+    return len(values) == 0 or (values.min() >= _INT32.min and values.max() <= _INT32.max)
+
+
+def _compact_float(series):
+    values = series.to_numpy()
+    finite = np.isfinite(values)
+
+    if finite.all() and np.array_equal(values, np.round(values)) and _fits_int32(values):
+        return series.astype('int32')
+
+    # float32 only when every value survives the round trip exactly
+    as32 = values.astype('float32')
+    if np.array_equal(as32[finite].astype('float64'), values[finite]):
+        return pd.Series(as32, index=series.index, name=series.name)
+    return series
+
+
+def compact_frame(df, max_category_ratio=CATEGORY_MAX_RATIO, keep_as_string=KEEP_AS_STRING):
+    """Shrink dtypes in place: low-cardinality strings to categoricals and
+    numerics to the smallest type that holds every value exactly."""
+    n_rows = max(len(df), 1)
+    for col in df.columns:
+        series = df[col]
+        dtype = series.dtype
+
+        if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype):
+            continue
+        if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            if col not in keep_as_string and series.nunique(dropna=True) <= max_category_ratio * n_rows:
+                df[col] = series.astype('category')
+        elif not isinstance(dtype, np.dtype):
+            continue  # nullable extension dtypes are left alone
+        elif dtype.kind == 'f':
+            df[col] = _compact_float(series)
+        elif dtype.kind == 'i' and dtype.itemsize > 4 and _fits_int32(series.to_numpy()):
+            df[col] = series.astype('int32')
+    return df
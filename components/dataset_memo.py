@@ -0,0 +1,78 @@
+# components/dataset_memo.py
+
+from collections import OrderedDict
+import pandas as pd
+from components.ingest import dataset_version
+
+# (dataset version, row identity, kind, params) -> built object; shared across reruns and sessions
+_MEMO = OrderedDict()
+_MAX_ENTRIES = 32
+# Index labels sampled into the row identity of frames without a RangeIndex
+_IDENTITY_SAMPLES = 64
+
+
+def row_identity(df):
+    """Cheap fingerprint of which rows a frame holds, in which order.
+
+    Derived frames (filtered or re-ordered slices) inherit attrs, so the version alone
+    would hand them the full frame's entries. A RangeIndex is identified by its bounds;
+    any other index by its length, ends and evenly spaced labels.
+    """
+    index = df.index
+    if isinstance(index, pd.RangeIndex):
+        return ('range', index.start, index.stop, index.step)
+    step = max(1, len(index) // _IDENTITY_SAMPLES)
+    return ('labels', len(index), hash(tuple(index[::step])), hash(tuple(index[-1:])))
+
+
+def memoize(df, kind, builder, *params):
+    """Build `builder(df)` once per dataset version; frames without a version are never cached."""
+    version = dataset_version(df)
+    if version is None:
+        return builder(df)
+
+    # Views adding helper columns to their shallow copy still hit the same entry
+    key = (version, row_identity(df), kind, params)
+    if key in _MEMO:
+        _MEMO.move_to_end(key)
+        return _MEMO[key]
+
+    value = builder(df)
+    _MEMO[key] = value
+    while len(_MEMO) > _MAX_ENTRIES:
+        _MEMO.popitem(last=False)
+    return value
+
+
+def store(df, kind, value, *params):
+    """Seed the entry memoize() would build, e.g. with a value maintained incrementally."""
+    version = dataset_version(df)
+    if version is None:
+        return value
+    _MEMO[(version, row_identity(df), kind, params)] = value
+    while len(_MEMO) > _MAX_ENTRIES:
+        _MEMO.popitem(last=False)
+    return value
+
+
+def forget(version):
+    for key in [k for k in _MEMO if k[0] == version]:
+        del _MEMO[key]
+
+
+def column_token(df, col):
+    """Revision of a data column within the dataset version; bumped by mark_changed()."""
+    return df.attrs.get('column_versions', {}).get(col, 0)
+
+
+def mark_changed(df, columns):
+    # Reassign rather than mutate: shallow copies may share the attrs dict
+    versions = dict(df.attrs.get('column_versions', {}))
+    for col in columns:
+        versions[col] = versions.get(col, 0) + 1
+    df.attrs['column_versions'] = versions
+    return df
+
+
+def clear():
+    _MEMO.clear()
@@ -0,0 +1,197 @@
+# components/dedup.py
+
+import json
+
+import numpy as np
+import pandas as pd
+from components.dataset_memo import memoize
+from components.features import is_rowwise
+from components.ingest import content_hash, dataset_version
+
+KEY_COLUMN = 'channel_id'
+
+# 🧹 Candidate search: neighbours in sorted order (forward and reversed handles)
+WINDOW = 4
+DEFAULT_THRESHOLD = 0.8
+MIN_LENGTH = 4
+# Longer handles are compared on their first characters only
+MAX_COMPARE_LENGTH = 32
+# Pairs beyond this many are merged without being listed for review
+REVIEW_ROWS = 1000
+_SENTINEL = np.uint64(2 ** 64 - 1)
+
+
+def canonical_handles(values):
+    # "@Riley.Brown", "Riley Brown" and "rileybrown_" all become "rileybrown";
+    # letters, digits and combining marks of any script are kept
+    handles = pd.Series(values).astype('string[pyarrow]').str.lower()
+    return handles.str.replace(r'[^\p{L}\p{N}\p{M}]+', '', regex=True).reset_index(drop=True)
+
+
+def _padded(handles, max_length=MAX_COMPARE_LENGTH):
+    # Fixed-width unicode array: each row is viewable as a vector of code points
+    return np.array([f"  {h[:max_length]} " for h in handles])
+
+
+def _trigram_sets(padded):
+    """Sorted trigram codes per padded handle (a sentinel marks unused slots) and set sizes."""
+    chars = padded.view(np.uint32).reshape(len(padded), -1).astype(np.uint64)
+    # Code points fit in 21 bits, so three of them pack losslessly into one integer
+    grams = (chars[:, :-2] << np.uint64(42)) | (chars[:, 1:-1] << np.uint64(21)) | chars[:, 2:]
+    valid = np.arange(grams.shape[1]) < (np.char.str_len(padded) - 2)[:, None]
+    grams = np.sort(np.where(valid, grams, _SENTINEL), axis=1)
+    grams[:, 1:][grams[:, 1:] == grams[:, :-1]] = _SENTINEL
+    return grams, (grams != _SENTINEL).sum(axis=1)
+
+
+def trigram_similarity(left, right, chunk_size=8192):
+    """Jaccard similarity of padded character trigrams for each pair of handles.
+
+    `left` and `right` are handle arrays, or the output of _padded() when the same
+    handles appear in many pairs.
+    """
+    left = left if left.dtype.kind == 'U' else _padded(left)
+    right = right if right.dtype.kind == 'U' else _padded(right)
+    scores = np.empty(len(left), dtype='float64')
+    for start in range(0, len(left), chunk_size):
+        stop = start + chunk_size
+        a, size_a = _trigram_sets(left[start:stop])
+        b, size_b = _trigram_sets(right[start:stop])
+        # Both rows are sets, so a trigram shared by the pair shows up as an adjacent repeat
+        merged = np.sort(np.concatenate([a, b], axis=1), axis=1)
+        common = ((merged[:, 1:] == merged[:, :-1]) & (merged[:, 1:] != _SENTINEL)).sum(axis=1)
+        scores[start:stop] = common / (size_a + size_b - common)
+    return scores
+
+
+def candidate_pairs(handles, threshold=DEFAULT_THRESHOLD, window=WINDOW):
+    """Likely-duplicate pairs among distinct canonical handles, as (left, right, score) positions.
+
+    Sorted-neighbourhood blocking: only handles within `window` places of each other
+    when sorted (forwards, and reversed to catch differing prefixes) are compared, so
+    the work grows with n · window instead of n². Pairs whose digits differ
+    ("riley2" / "riley3") or whose lengths rule out reaching `threshold` are dropped
+    before any string similarity is computed.
+    """
+    handles = pd.Series(handles, dtype='string')
+    lengths = handles.str.len().to_numpy(dtype='int64', na_value=0)
+    # Digit runs as integer codes, so the per-pair comparison is a vectorized int compare
+    digits = pd.factorize(handles.str.replace(r'[^0-9]+', '', regex=True))[0]
+
+    left, right = [], []
+    for keys in (handles, handles.str[::-1]):
+        order = keys.array.argsort(kind='stable')
+        for offset in range(1, window + 1):
+            a, b = order[:-offset], order[offset:]
+            short, long = np.minimum(lengths[a], lengths[b]), np.maximum(lengths[a], lengths[b])
+            # Trigram sets have len + 2 members, which caps the Jaccard at (short + 2) / (long + 2)
+            keep = (short >= MIN_LENGTH) & (short + 2 >= threshold * (long + 2)) & (digits[a] == digits[b])
+            left.append(np.minimum(a[keep], b[keep]))
+            right.append(np.maximum(a[keep], b[keep]))
+
+    pairs = pd.DataFrame({'left': np.concatenate(left), 'right': np.concatenate(right)}).drop_duplicates()
+    padded = _padded(handles.to_numpy(dtype=object))
+    pairs['score'] = trigram_similarity(padded[pairs['left'].to_numpy()], padded[pairs['right'].to_numpy()])
+    return pairs[pairs['score'] >= threshold].sort_values(['left', 'right']).reset_index(drop=True)
+
+
+def connected_components(n, left, right):
+    """Component label (smallest member) for each of n nodes joined by the given edges."""
+    labels = np.arange(n)
+    left, right = np.asarray(left, dtype=np.intp), np.asarray(right, dtype=np.intp)
+    while True:
+        low = np.minimum(labels[left], labels[right])
+        before = labels.copy()
+        np.minimum.at(labels, left, low)
+        np.minimum.at(labels, right, low)
+        # Pointer jumping: follow labels until every node points at its root
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(before, labels):
+            return labels
+
+
+class DuplicateReport:
+    """Distinct canonical handles of a roster and the fuzzy pairs found among them."""
+
+    def __init__(self, df, threshold=DEFAULT_THRESHOLD, window=WINDOW):
+        self.threshold = threshold
+        self.window = window
+        canonical = canonical_handles(df[KEY_COLUMN])
+        self.row_codes, uniques = pd.factorize(canonical.where(canonical != ''))
+        self.handles = uniques.to_numpy(dtype=object)
+        self.pairs = candidate_pairs(self.handles, threshold, window)
+
+        # One original spelling per handle, so the review table shows real ids
+        codes, first = np.unique(self.row_codes, return_index=True)
+        self.examples = df[KEY_COLUMN].to_numpy(dtype=object)[first[codes >= 0]]
+        self.exact_duplicates = int((self.row_codes >= 0).sum() - len(self.handles))
+
+    def review_table(self, limit=None):
+        """Fuzzy pairs for review, least similar (most doubtful) first."""
+        table = pd.DataFrame({
+            'pair': self.pairs.index,
+            'channel_id': self.examples[self.pairs['left']],
+            'looks like': self.examples[self.pairs['right']],
+            'similarity': self.pairs['score'].round(2),
+            'merge': True,
+        })
+        table = table.sort_values('similarity', kind='stable')
+        return (table if limit is None else table.head(limit)).reset_index(drop=True)
+
+    def cluster_ids(self, rejected=()):
+        """Dense cluster id per row: exact canonical matches plus accepted fuzzy pairs."""
+        accepted = self.pairs.drop(index=list(rejected), errors='ignore')
+        labels = connected_components(len(self.handles), accepted['left'], accepted['right'])
+        # Rows without a usable handle are always their own cluster
+        unmatched = self.row_codes < 0
+        row_labels = np.where(unmatched, len(self.handles) + np.cumsum(unmatched) - 1, labels[np.maximum(self.row_codes, 0)])
+        return pd.factorize(row_labels)[0].astype('int32')
+
+
+def find_duplicates(df, threshold=DEFAULT_THRESHOLD, window=WINDOW):
+    return memoize(df, 'duplicate_report', lambda frame: DuplicateReport(frame, threshold, window), threshold, window)
+
+
+def assign_clusters(df, report, rejected=(), collapse=False):
+    """Tag rows with cluster_id / cluster_size / cluster_primary, or keep one row per cluster.
+
+    The primary row of a cluster is its largest account (most followers, first on ties).
+    Collapsing drops dataset-wide derived features, which are recomputed lazily.
+    """
+    clusters = report.cluster_ids(rejected)
+    sizes = np.bincount(clusters)
+
+    followers = df['followers'] if 'followers' in df.columns else pd.Series(np.nan, index=df.index)
+    ranked = pd.DataFrame({'cluster': clusters, 'followers': pd.to_numeric(followers, errors='coerce').to_numpy()})
+    ranked = ranked.sort_values(['cluster', 'followers'], ascending=[True, False], kind='stable', na_position='last')
+    primary = np.zeros(len(df), dtype=bool)
+    primary[ranked.index[~ranked['cluster'].duplicated()]] = True
+
+    out = df.copy(deep=False)
+    out['cluster_id'] = clusters
+    out['cluster_size'] = sizes[clusters].astype('int32')
+    out['cluster_primary'] = primary
+
+    recorded = df.attrs.get('features', {})
+    stale = [name for name in recorded if collapse and name in out.columns and not is_rowwise(name)]
+    if collapse:
+        out = out[primary].drop(columns=stale).reset_index(drop=True)
+
+    token = json.dumps([report.threshold, report.window, sorted(int(r) for r in rejected), collapse]).encode()
+    out.attrs = {
+        **df.attrs,
+        'dataset_version': f"{dataset_version(df)}+dedup:{content_hash(token)}",
+        'features': {k: v for k, v in recorded.items() if k not in stale},
+    }
+    return out
+
+
+def deduplicate(df, threshold=DEFAULT_THRESHOLD, rejected=(), collapse=True):
+    """find_duplicates() + assign_clusters(), memoized per dataset version and review decisions."""
+    rejected = tuple(sorted(int(pair) for pair in rejected))
+    report = find_duplicates(df, threshold)
+    return memoize(df, 'deduplicated', lambda frame: assign_clusters(frame, report, rejected, collapse), threshold, rejected, collapse)
@@ -0,0 +1,149 @@
+# components/delta_merge.py
+
+import copy
+import io
+
+import numpy as np
+import pandas as pd
+from components.dataset_memo import memoize, store
+from components.features import FEATURES, ensure, is_rowwise
+from components.ingest import COLUMN_MAP, content_hash, dataset_version, prepare_frame
+from components.rollup import rollup_cube
+
+KEY_COLUMN = 'channel_id'
+
+
+def normalize_keys(values):
+    # "@Jane ", "jane" and "@jane" are the same influencer
+    return pd.Series(values).astype('string').str.strip().str.lower().str.lstrip('@')
+
+
+class KeyIndex:
+    """Normalized channel_id -> row position for a roster; later duplicates win.
+
+    Keys appended by upserts live in a small side index, so the roster-sized
+    hash table is built once and reused by every later delta.
+    """
+
+    def __init__(self, keys, positions, extra_keys=(), extra_positions=()):
+        self.keys = pd.Index(keys, dtype=object)
+        self.positions = np.asarray(positions, dtype=np.intp)
+        self.extra_keys = pd.Index(extra_keys, dtype=object)
+        self.extra_positions = np.asarray(extra_positions, dtype=np.intp)
+
+    @classmethod
+    def build(cls, df):
+        keys = normalize_keys(df[KEY_COLUMN]).to_numpy(dtype=object)
+        last = ~pd.Series(keys).duplicated(keep='last').to_numpy()
+        return cls(keys[last], np.flatnonzero(last))
+
+    def lookup(self, keys):
+        keys = pd.Index(keys, dtype=object)
+        found = self.keys.get_indexer(keys)
+        positions = np.where(found >= 0, self.positions[found], -1)
+        if len(self.extra_keys):
+            extra = self.extra_keys.get_indexer(keys)
+            positions = np.where(extra >= 0, self.extra_positions[extra], positions)
+        return positions
+
+    def extended(self, keys, positions):
+        if len(keys) == 0:
+            return self
+        return KeyIndex(
+            self.keys, self.positions,
+            self.extra_keys.append(pd.Index(keys, dtype=object)),
+            np.concatenate([self.extra_positions, positions])
+        )
+
+
+def key_index(df):
+    return memoize(df, 'channel_key_index', KeyIndex.build)
+
+
+def _merged_dtype(current, incoming):
+    if isinstance(current.dtype, pd.CategoricalDtype):
+        extra = pd.Index(incoming.dropna().unique()).difference(current.cat.categories)
+        return current.cat.add_categories(extra).dtype if len(extra) else current.dtype
+    # Let pandas pick the common dtype (int32 + NaN -> float64, etc.)
+    return pd.concat([current.iloc[:0], incoming.iloc[:0]]).dtype
+
+
+def _changed_rows(roster, delta, positions):
+    """Full rows after the upsert: roster values overlaid with the delta's columns."""
+    existing = positions >= 0
+    updated = roster.iloc[positions[existing]].reset_index(drop=True)
+    for col in delta.columns:
+        updated[col] = delta[col].to_numpy()[existing]
+    inserted = delta[~existing].reset_index(drop=True)
+    return pd.concat([updated, inserted], ignore_index=True)
+
+
+def upsert(roster, delta, delta_id=None, column_map=COLUMN_MAP):
+    """Merge `delta` rows into `roster` keyed on normalized channel_id.
+
+    Only the delta rows are parsed, get rowwise derived features and update the
+    running totals; dataset-wide features (e.g. influence_score) are dropped and
+    recomputed lazily. Returns (merged frame, summary dict).
+    """
+    delta = prepare_frame(delta, column_map)
+    if KEY_COLUMN not in delta.columns or KEY_COLUMN not in roster.columns:
+        raise ValueError(f"Delta upserts need a '{KEY_COLUMN}' column in both the roster and the delta.")
+
+    keys = normalize_keys(delta[KEY_COLUMN])
+    duplicated = keys.duplicated(keep='last').to_numpy()
+    delta, keys = delta[~duplicated].reset_index(drop=True), keys[~duplicated].to_numpy(dtype=object)
+
+    index = key_index(roster)
+    positions = index.lookup(keys)
+    existing = positions >= 0
+
+    # Features present on the roster: rowwise ones are computed for the delta rows only
+    derived = [name for name in FEATURES if name in roster.attrs.get('features', {}) and name in roster.columns]
+    rowwise = [name for name in derived if is_rowwise(name)]
+    stale = [name for name in derived if name not in rowwise]
+
+    changed = _changed_rows(roster.drop(columns=stale), delta.drop(columns=derived, errors='ignore'), positions)
+    changed = ensure(changed.drop(columns=rowwise, errors='ignore'), *rowwise)
+
+    cube = copy.copy(rollup_cube(roster))
+    cube.update(roster.iloc[positions[existing]], sign=-1)
+    cube.update(changed)
+
+    merged = roster.drop(columns=stale)
+    for col in changed.columns:
+        if col not in merged.columns:
+            merged[col] = pd.Series(np.nan, index=merged.index).astype(changed[col].dtype, errors='ignore')
+        dtype = _merged_dtype(merged[col], changed[col])
+        if merged[col].dtype != dtype:
+            merged[col] = merged[col].astype(dtype)
+        changed[col] = changed[col].astype(dtype)
+
+    n_updated = int(existing.sum())
+    if n_updated:
+        merged_positions = positions[existing]
+        # Existing rows keep their channel_id spelling; only the values change
+        for col in changed.columns.drop(KEY_COLUMN):
+            merged.iloc[merged_positions, merged.columns.get_loc(col)] = changed[col].iloc[:n_updated].to_numpy()
+
+    inserted = changed.iloc[n_updated:][merged.columns]
+    new_positions = np.arange(len(merged), len(merged) + len(inserted))
+    if len(inserted):
+        merged = pd.concat([merged, inserted], ignore_index=True)
+
+    merged.attrs = {
+        **roster.attrs,
+        'dataset_version': f"{dataset_version(roster)}+delta:{delta_id or content_hash(pd.util.hash_pandas_object(delta).to_numpy().tobytes())}",
+        'features': {k: v for k, v in roster.attrs.get('features', {}).items() if k not in stale},
+    }
+
+    # Seed the new version's memo entries so nothing is rebuilt from the full roster
+    store(merged, 'rollup_cube', cube)
+    store(merged, 'channel_key_index', index.extended(keys[~existing], new_positions))
+
+    summary = {'updated': n_updated, 'inserted': len(inserted), 'duplicates_dropped': int(duplicated.sum())}
+    return merged, summary
+
+
+def upsert_csv(roster, data, column_map=COLUMN_MAP):
+    """upsert() for raw CSV bytes; the content hash becomes part of the new dataset version."""
+    return upsert(roster, pd.read_csv(io.BytesIO(data)), delta_id=content_hash(data), column_map=column_map)
@@ -1,15 +1,130 @@
-def detect_content_domain(df):
-    def get_domain(row):
-        bio = str(row.get('channel_info', '')).lower()
-        if 'fitness' in bio:
-            return 'Fitness'
-        elif 'beauty' in bio or 'makeup' in bio:
-            return 'Beauty'
-        elif 'fashion' in bio:
-            return 'Fashion'
-        elif 'tech' in bio:
-            return 'Tech'
-        return 'General'
-
-    df['content_domain'] = df.apply(get_domain, axis=1)
+# components/domain_detection.py
+
+import json
+import re
+from functools import lru_cache
+
+import pandas as pd
+
+FALLBACK_DOMAIN = 'General'
+
+# domain -> keywords/synonyms; lower priority value wins when a bio matches several domains
+DEFAULT_TAXONOMY = {
+    'Fitness': {'keywords': ['fitness'], 'priority': 0},
+    'Beauty': {'keywords': ['beauty', 'makeup'], 'priority': 1},
+    'Fashion': {'keywords': ['fashion'], 'priority': 2},
+    'Tech': {'keywords': ['tech'], 'priority': 3},
+}
+
+
+def load_taxonomy(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _trie_pattern(words):
+    # Prefix-factored alternation ("make(?:up|over)") so the regex engine walks a trie
+    # instead of retrying every keyword at each character
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        terminal = '' in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != '']
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            return f'(?:{body})?' if len(branches) == 1 else body + '?'
+        return body
+
+    return build(trie)
+
+
+class DomainClassifier:
+    """Classify bios against a keyword taxonomy with one compiled regex over the whole column."""
+
+    def __init__(self, taxonomy=DEFAULT_TAXONOMY, fallback=FALLBACK_DOMAIN, word_boundary=False):
+        self.fallback = fallback
+        self.keyword_domain = {}
+        self.domain_priority = {}
+
+        for order, (domain, spec) in enumerate(taxonomy.items()):
+            # Shorthand: {"Travel": ["travel", "wanderlust"]} uses insertion order as priority
+            keywords = spec['keywords'] if isinstance(spec, dict) else spec
+            priority = spec.get('priority', order) if isinstance(spec, dict) else order
+            self.domain_priority[domain] = priority
+            for keyword in keywords:
+                keyword = keyword.strip().lower()
+                current = self.keyword_domain.get(keyword)
+                if keyword and (current is None or priority < self.domain_priority[current]):
+                    self.keyword_domain[keyword] = domain
+
+        pattern = _trie_pattern(self.keyword_domain)
+        if word_boundary:
+            pattern = rf'\b{pattern}\b'
+        self.pattern = re.compile(f'({pattern})', re.IGNORECASE)
+
+    def classify(self, text):
+        text = pd.Series(text) if not isinstance(text, pd.Series) else text
+        result = pd.DataFrame({
+            'domain': pd.Series(self.fallback, index=text.index, dtype=object),
+            'confidence': 0.0,
+            'keyword': pd.Series(None, index=text.index, dtype=object)
+        })
+        if text.empty or not self.keyword_domain:
+            return result
+
+        # Work positionally so duplicate index labels can't misalign results
+        matches = text.reset_index(drop=True).astype(str).str.findall(self.pattern).explode().dropna()
+        if matches.empty:
+            return result
+
+        hits = pd.DataFrame({
+            'row': matches.index.to_numpy(),
+            'keyword': matches.astype(str).str.lower().to_numpy()
+        })
+        hits['domain'] = hits['keyword'].map(self.keyword_domain)
+        hits['priority'] = hits['domain'].map(self.domain_priority)
+
+        per_domain = hits.groupby(['row', 'domain'], sort=False).agg(
+            hits=('keyword', 'size'), keyword=('keyword', 'first'), priority=('priority', 'first')
+        ).reset_index()
+        per_domain['total'] = per_domain.groupby('row')['hits'].transform('sum')
+        winners = (
+            per_domain.sort_values(['row', 'priority', 'hits'], ascending=[True, True, False])
+            .drop_duplicates('row')
+        )
+
+        rows = winners['row'].to_numpy()
+        result.iloc[rows, result.columns.get_loc('domain')] = winners['domain'].to_numpy()
+        result.iloc[rows, result.columns.get_loc('confidence')] = (winners['hits'] / winners['total']).to_numpy()
+        result.iloc[rows, result.columns.get_loc('keyword')] = winners['keyword'].to_numpy()
+        return result
+
+
+@lru_cache(maxsize=8)
+def _classifier_for(taxonomy_json, fallback, word_boundary):
+    return DomainClassifier(json.loads(taxonomy_json), fallback, word_boundary)
+
+
+def get_classifier(taxonomy=None, fallback=FALLBACK_DOMAIN, word_boundary=False):
+    taxonomy_json = json.dumps(taxonomy or DEFAULT_TAXONOMY, sort_keys=False)
+    return _classifier_for(taxonomy_json, fallback, word_boundary)
+
+
+def detect_content_domain(df, taxonomy=None, source_col='channel_info', word_boundary=False):
+    if source_col not in df.columns and 'channel_id' in df.columns:
+        # normalize_columns renames channel_info to channel_id
+        source_col = 'channel_id'
+    bios = df[source_col] if source_col in df.columns else pd.Series('', index=df.index)
+
+    classified = get_classifier(taxonomy, word_boundary=word_boundary).classify(bios)
+    df['content_domain'] = classified['domain'].to_numpy()
+    df['content_domain_confidence'] = classified['confidence'].to_numpy()
+    df['content_domain_keyword'] = classified['keyword'].to_numpy()
     return df
@@ -0,0 +1,138 @@
+# components/export_formats.py
+
+import gzip
+import io
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+EXPORT_FORMATS = {
+    'csv.gz': {'label': 'CSV (gzip)', 'ext': '.csv.gz', 'mime': 'application/gzip'},
+    'parquet': {'label': 'Parquet', 'ext': '.parquet', 'mime': 'application/vnd.apache.parquet'},
+    'xlsx': {'label': 'Excel (XLSX)', 'ext': '.xlsx',
+             'mime': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'},
+    'csv': {'label': 'CSV', 'ext': '.csv', 'mime': 'text/csv'},
+}
+# Excel sheets hold 1,048,576 rows including the header
+XLSX_MAX_ROWS = 1_048_575
+DEFAULT_CHUNK_ROWS = 100_000
+# Prepared exports live here until downloaded; files left by closed sessions are swept
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), 'influenshow_exports')
+EXPORT_MAX_AGE_SECONDS = 3600
+
+
+def iter_chunks(df, rows=None, columns=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield the export view in slices so only one chunk is materialized at a time."""
+    columns = list(columns) if columns else list(df.columns)
+    positions = np.arange(len(df)) if rows is None else np.asarray(rows)
+    for start in range(0, len(positions), chunk_rows):
+        yield df.iloc[positions[start:start + chunk_rows]][columns]
+
+
+def _write_csv(chunks, target, compress):
+    raw = gzip.GzipFile(fileobj=target, mode='wb', compresslevel=6) if compress else target
+    text = io.TextIOWrapper(raw, encoding='utf-8', newline='', write_through=True)
+    written = 0
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(text, index=False, header=(i == 0))
+        written += len(chunk)
+
+    # Detach so the caller's file object stays open; closing GzipFile writes the trailer
+    text.flush()
+    text.detach()
+    if compress:
+        raw.close()
+    return written
+
+
+def _write_parquet(chunks, target):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer, schema, written = None, None, 0
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pq.ParquetWriter(target, schema, compression='zstd')
+            writer.write_table(table)
+            written += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def _write_xlsx(chunks, target):
+    # constant_memory streams each row to disk instead of holding the whole sheet, but it
+    # flushes a row once a later one is touched; to_excel writes column by column, so
+    # rows are written in order here instead
+    with pd.ExcelWriter(target, engine='xlsxwriter',
+                        engine_kwargs={'options': {'constant_memory': True}}) as writer:
+        sheet = writer.book.add_worksheet('Sheet1')
+        header = writer.book.add_format({'bold': True})
+        written = 0
+        for i, chunk in enumerate(chunks):
+            if i == 0:
+                sheet.write_row(0, 0, [str(col) for col in chunk.columns], header)
+            chunk = chunk.iloc[:XLSX_MAX_ROWS - written]
+            if chunk.empty:
+                break
+            # Missing and infinite values become blank cells; xlsxwriter rejects NaN and inf
+            values = chunk.astype(object).where(chunk.notna() & ~chunk.isin([np.inf, -np.inf]), None)
+            for offset, row in enumerate(values.itertuples(index=False, name=None)):
+                sheet.write_row(written + offset + 1, 0, row)
+            written += len(chunk)
+    return written
+
+
+def write_export(df, target, fmt='csv.gz', rows=None, columns=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Stream df (optionally restricted to positional `rows`/`columns`) into a binary file
+    object or path. Returns the number of rows written."""
+    chunks = iter_chunks(df, rows, columns, chunk_rows)
+    if fmt in ('csv', 'csv.gz'):
+        if isinstance(target, (str, os.PathLike)):
+            with open(target, 'wb') as f:
+                return _write_csv(chunks, f, fmt == 'csv.gz')
+        return _write_csv(chunks, target, fmt == 'csv.gz')
+    if fmt == 'parquet':
+        return _write_parquet(chunks, target)
+    if fmt == 'xlsx':
+        return _write_xlsx(chunks, target)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+def sweep_exports(max_age=EXPORT_MAX_AGE_SECONDS):
+    """Delete prepared exports older than `max_age` seconds."""
+    if not os.path.isdir(EXPORT_DIR):
+        return
+    cutoff = time.time() - max_age
+    for entry in os.scandir(EXPORT_DIR):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def export_to_tempfile(df, fmt='csv.gz', rows=None, columns=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    # The caller removes the file once it has been served
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    sweep_exports()
+    fd, path = tempfile.mkstemp(prefix='influenshow_', suffix=EXPORT_FORMATS[fmt]['ext'], dir=EXPORT_DIR)
+    os.close(fd)
+    try:
+        written = write_export(df, path, fmt, rows, columns, chunk_rows)
+    except Exception:
+        os.remove(path)
+        raise
+    return path, written
+
+
+def discard_export(path):
+    if path and os.path.exists(path):
+        os.remove(path)
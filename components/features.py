@@ -0,0 +1,124 @@
+# components/features.py
+
+from components.dataset_memo import column_token, mark_changed, memoize
+from components.numeric_parser import parse_counts
+from components.profiling import stage
+from components.scoring import BRAND_FIT_FACTOR, compute_scores
+from components.segmentation import segment_followers
+
+# 🧮 Derived column -> (required inputs, optional inputs, compute function)
+FEATURES = {}
+# Features whose value for a row depends only on that row (safe to compute on a subset)
+ROWWISE = set()
+
+
+def register(name, inputs=(), optional=(), rowwise=True):
+    """Declare a derived column: `func(df)` returns it as a Series aligned with df.
+    Pass rowwise=False when values depend on the whole dataset (e.g. min/max rescaling)."""
+    def wrap(func):
+        FEATURES[name] = (tuple(inputs), tuple(optional), func)
+        if rowwise:
+            ROWWISE.add(name)
+        else:
+            ROWWISE.discard(name)
+        return func
+    return wrap
+
+
+def _fingerprint(df, name):
+    # Identifies a feature by the revisions of everything it is computed from
+    inputs, optional, _ = FEATURES[name]
+    parts = []
+    for col in inputs + tuple(col for col in optional if col in df.columns or col in FEATURES):
+        parts.append((col, _fingerprint(df, col) if col in FEATURES else column_token(df, col)))
+    return (name, tuple(parts))
+
+
+def _is_current(df, name):
+    recorded = df.attrs.get('features', {})
+    if name not in df.columns:
+        return False
+    # Present but never computed here means it came with the data (e.g. a snapshot)
+    return name not in recorded or recorded[name] == _fingerprint(df, name)
+
+
+def ensure(df, *names):
+    """Add the requested derived columns (and their dependencies) that are missing or stale.
+
+    Values are memoized per dataset version, so each feature is computed once
+    per dataset no matter how many views or reruns ask for it.
+    """
+    for name in names:
+        if name not in FEATURES:
+            raise KeyError(f"Unknown feature: {name}")
+        if _is_current(df, name):
+            continue
+
+        inputs, optional, func = FEATURES[name]
+        for col in inputs + optional:
+            if col in FEATURES:
+                ensure(df, col)
+            elif col in inputs and col not in df.columns:
+                raise KeyError(f"Feature '{name}' needs column '{col}'")
+
+        fingerprint = _fingerprint(df, name)
+        with stage(f"feature:{name}", len(df)):
+            df[name] = memoize(df, 'feature', func, fingerprint)
+        df.attrs['features'] = {**df.attrs.get('features', {}), name: fingerprint}
+    return df
+
+
+def dependents(columns):
+    """Every registered feature that (transitively) reads one of `columns`."""
+    found, frontier = set(), set(columns)
+    while frontier:
+        frontier = {
+            name for name, (inputs, optional, _) in FEATURES.items()
+            if name not in found and frontier & set(inputs + optional)
+        }
+        found |= frontier
+    return found
+
+
+def is_rowwise(name):
+    # A rowwise function over a dataset-wide input is not rowwise itself
+    inputs, optional, _ = FEATURES[name]
+    return name in ROWWISE and all(is_rowwise(col) for col in inputs + optional if col in FEATURES)
+
+
+def invalidate(df, columns):
+    """Mark data columns as changed and drop the features computed from them."""
+    mark_changed(df, columns)
+    recorded = df.attrs.get('features', {})
+    stale = [name for name in dependents(columns) if name in recorded]
+    df.drop(columns=[name for name in stale if name in df.columns], inplace=True)
+    df.attrs['features'] = {k: v for k, v in recorded.items() if k not in stale}
+    return df
+
+
+# ---------------------- REGISTERED FEATURES ----------------------
+
+@register('Segment', inputs=['followers'])
+def _segment(df):
+    return segment_followers(df['followers'])
+
+
+@register('engagement_quality', inputs=['avg_likes', 'followers'])
+def _engagement_quality(df):
+    followers = parse_counts(df['followers'])
+    return (parse_counts(df['avg_likes']) / followers.where(followers != 0)).fillna(0)
+
+
+@register('fake_follower_score', inputs=['engagement_quality'])
+def _fake_follower_score(df):
+    return 100 - (df['engagement_quality'] * 100).clip(upper=100)
+
+
+@register('influence_score', optional=['followers', 'avg_likes', '60_day_eng_rate'], rowwise=False)
+def _influence_score(df):
+    return compute_scores(df)
+
+
+@register('brand_fit_score', inputs=['influence_score'])
+def _brand_fit_score(df):
+    return (df['influence_score'] * BRAND_FIT_FACTOR).round(2)
@@ -0,0 +1,90 @@
+# components/filter_index.py
+
+import numpy as np
+import pandas as pd
+from components.dataset_memo import memoize
+
+RANGE_COLUMNS = ('followers', '60_day_eng_rate')
+SET_COLUMNS = ('country', 'domain')
+
+
+class FilterIndex:
+    """Sorted arrays for range filters and per-value row ids for multiselect filters.
+
+    Queries start from the most selective constraint and only check the
+    remaining constraints on those candidate rows, so cost scales with the
+    match count rather than the frame size.
+    """
+
+    def __init__(self, df, range_cols=RANGE_COLUMNS, set_cols=SET_COLUMNS):
+        self.n_rows = len(df)
+        self._values = {}
+        self._sorted = {}
+        self._codes = {}
+        self._groups = {}
+        self.bounds = {}
+        self.options = {}
+
+        for col in range_cols:
+            if col not in df.columns:
+                continue
+            values = df[col].to_numpy(dtype='float64', na_value=np.nan)
+            order = np.argsort(values, kind='stable')
+            valid = int((~np.isnan(values)).sum())  # NaNs sort last and never match a range
+            self._values[col] = values
+            self._sorted[col] = (values[order[:valid]], order[:valid])
+            self.bounds[col] = (values[order[0]], values[order[valid - 1]]) if valid else (np.nan, np.nan)
+
+        for col in set_cols:
+            if col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[col])
+            order = np.argsort(codes, kind='stable')
+            starts = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self._codes[col] = codes
+            self._groups[col] = {
+                value: order[starts[i]:starts[i + 1]] for i, value in enumerate(uniques)
+            }
+            self.options[col] = sorted(uniques, key=str)
+
+    def _range_rows(self, col, low, high):
+        sorted_values, order = self._sorted[col]
+        start = np.searchsorted(sorted_values, low, side='left')
+        stop = np.searchsorted(sorted_values, high, side='right')
+        return order[start:stop]
+
+    def _set_rows(self, col, values):
+        groups = [self._groups[col][v] for v in values if v in self._groups[col]]
+        return np.concatenate(groups) if groups else np.empty(0, dtype=np.intp)
+
+    def query(self, ranges=None, members=None):
+        """Return sorted positional row ids matching all `ranges` {col: (low, high)}
+        and `members` {col: [values]}; empty member lists mean "no constraint"."""
+        ranges = {c: r for c, r in (ranges or {}).items() if c in self._sorted}
+        members = {c: v for c, v in (members or {}).items() if c in self._groups and v}
+
+        candidates = [('range', c, self._range_rows(c, *r)) for c, r in ranges.items()]
+        candidates += [('set', c, self._set_rows(c, v)) for c, v in members.items()]
+        if not candidates:
+            return np.arange(self.n_rows)
+
+        candidates.sort(key=lambda item: len(item[2]))
+        rows = candidates[0][2]
+
+        for kind, col, _ in candidates[1:]:
+            if len(rows) == 0:
+                break
+            if kind == 'range':
+                low, high = ranges[col]
+                values = self._values[col][rows]
+                rows = rows[(values >= low) & (values <= high)]
+            else:
+                wanted = set(members[col])
+                allowed = [code for code, value in enumerate(self._groups[col]) if value in wanted]
+                rows = rows[np.isin(self._codes[col][rows], allowed)]
+
+        return np.sort(rows)
+
+
+def get_filter_index(df):
+    return memoize(df, 'filter_index', FilterIndex)
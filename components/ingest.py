@@ -0,0 +1,259 @@
+# components/ingest.py
+
+import glob
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from components.compaction import compact_frame, memory_footprint
+from components.numeric_parser import PARSER_VERSION, coerce_numeric_columns
+
+# 🔁 Alternate column names accepted in uploads
+COLUMN_MAP = {
+    'channel_info': 'channel_id',
+    'influencer_name': 'channel_id',
+    'engagement_rate': '60_day_eng_rate',
+    'niche': 'domain',
+    'personalized_offer': 'offer_type'
+}
+
+_HASH_BLOCK = 8 * 1024 * 1024
+# The app only offers local folder / path inputs when this names the directory they may read
+DATA_ROOT = os.getenv("INFLUENSHOW_DATA_ROOT", "")
+
+
+def normalize_columns(df, column_map=COLUMN_MAP):
+    df.columns = df.columns.str.strip().str.lower()
+    df.rename(columns={k.lower(): v for k, v in column_map.items()}, inplace=True)
+    return df
+
+
+def prepare_frame(df, column_map=COLUMN_MAP):
+    df = normalize_columns(df, column_map)
+    # Derived columns (Segment, scores, ...) are added lazily by components.features
+    return coerce_numeric_columns(df)
+
+
+def content_hash(data):
+    digest = hashlib.blake2b(digest_size=16)
+    view = memoryview(data)
+    for start in range(0, len(view), _HASH_BLOCK):
+        digest.update(view[start:start + _HASH_BLOCK])
+    return digest.hexdigest()
+
+
+def dataset_version(df):
+    return df.attrs.get('dataset_version')
+
+
+class IngestCache:
+    """LRU of parsed, normalized frames keyed on upload content + mapping + parser version.
+
+    Shared by every session of the server process, so lookups are locked and concurrent
+    requests for the same key wait for a single build.
+    """
+
+    def __init__(self, max_entries=4, max_bytes=2 * 1024 ** 3):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # Deep in-memory size per entry, measured once at insert
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self._building = {}
+
+    def make_key(self, data, column_map=COLUMN_MAP):
+        mapping = json.dumps(column_map, sort_keys=True)
+        return f"{content_hash(data)}:{content_hash(mapping.encode())}:v{PARSER_VERSION}"
+
+    def get_or_load(self, data, column_map=COLUMN_MAP):
+        key = self.make_key(data, column_map)
+        return self.get_or_build(key, lambda: prepare_frame(pd.read_csv(io.BytesIO(data)), column_map))
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            building = self._building.setdefault(key, threading.Lock())
+
+        with building:
+            with self._lock:
+                df = self._entries.get(key)
+                if df is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+            hit = df is not None
+
+            if not hit:
+                # Parsed outside the cache lock so other keys are served meanwhile
+                df = build()
+                before = memory_footprint(df)
+                df = compact_frame(df)
+                after = memory_footprint(df)
+                df.attrs['memory_footprint'] = {'before': before, 'after': after}
+                df.attrs['dataset_version'] = key
+                with self._lock:
+                    self.misses += 1
+                    self._entries[key] = df
+                    self._sizes[key] = after
+                    self._building.pop(key, None)
+                    self._evict()
+
+        # Shallow copy: views can add/replace columns without touching the cached frame
+        return df.copy(deep=False), hit
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries or (
+            len(self._entries) > 1 and sum(self._sizes.values()) > self.max_bytes
+        ):
+            key, _ = self._entries.popitem(last=False)
+            del self._sizes[key]
+
+    @property
+    def nbytes(self):
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'bytes': sum(self._sizes.values())
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+
+
+# Module-level so it survives Streamlit reruns within the server process
+_CACHE = IngestCache()
+
+
+def load_uploaded(uploaded_file, column_map=COLUMN_MAP):
+    return _CACHE.get_or_load(uploaded_file.getvalue(), column_map)
+
+
+def cache_stats():
+    return _CACHE.stats()
+
+
+# ---------------------- MULTI-FILE INGESTION ----------------------
+
+def data_root():
+    return os.path.realpath(DATA_ROOT) if DATA_ROOT else None
+
+
+def within_root(path, root):
+    # realpath first, so '..' segments and symlinks cannot step outside
+    real = os.path.realpath(path)
+    return real == root or real.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def resolve_local_path(path, root):
+    """Absolute path for `path` taken relative to `root`; ValueError if it resolves outside."""
+    full = os.path.join(root, path)
+    if not within_root(full, root):
+        raise ValueError(f"{path} is outside the data folder")
+    return os.path.realpath(full)
+
+
+def expand_sources(pattern, root=None):
+    """CSV paths for a directory, a glob pattern or a single file, in sorted order.
+
+    With `root`, the pattern is taken relative to it and matches resolving outside it are dropped.
+    """
+    if root is not None:
+        pattern = os.path.join(root, pattern)
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*.csv')
+    paths = (path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return sorted(path for path in paths if root is None or within_root(path, root))
+
+
+def _load_one(source, column_map):
+    # Runs in a worker process: source is raw bytes (upload) or a local path
+    df = pd.read_csv(io.BytesIO(source) if isinstance(source, bytes) else source)
+    return prepare_frame(df, column_map)
+
+
+def _combine(names, frames):
+    df = pd.concat(frames, ignore_index=True, sort=False) if frames else pd.DataFrame()
+    codes = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames])
+    df['source_file'] = pd.Categorical.from_codes(codes, categories=names)
+    return df
+
+
+def load_files(sources, column_map=COLUMN_MAP, max_workers=None):
+    """Read and normalize {name: bytes or path} in parallel worker processes.
+
+    Returns one frame with a `source_file` column; files that fail are listed in
+    df.attrs['ingest_errors'] as {'file', 'error'} instead of aborting the batch.
+    Raises ValueError when no file could be read, so an empty result is never cached.
+    """
+    max_workers = min(max_workers or os.cpu_count() or 1, len(sources)) or 1
+    results, errors = {}, []
+
+    if max_workers == 1:
+        for name, source in sources.items():
+            try:
+                results[name] = _load_one(source, column_map)
+            except Exception as e:
+                errors.append({'file': name, 'error': f"{type(e).__name__}: {e}"})
+    else:
+        # spawn: forking the multi-threaded Streamlit server is not safe
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+            futures = {name: pool.submit(_load_one, source, column_map) for name, source in sources.items()}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    errors.append({'file': name, 'error': f"{type(e).__name__}: {e}"})
+
+    if not results:
+        details = "; ".join(f"{e['file']}: {e['error']}" for e in errors)
+        raise ValueError(f"None of the {len(sources)} files could be read ({details})")
+
+    names = [name for name in sources if name in results]
+    df = _combine(names, [results[name] for name in names])
+    df.attrs['ingest_errors'] = errors
+    return df
+
+
+def _batch_key(parts, column_map):
+    mapping = json.dumps(column_map, sort_keys=True)
+    return f"batch:{content_hash(json.dumps(parts).encode())}:{content_hash(mapping.encode())}:v{PARSER_VERSION}"
+
+
+def _unique_names(names):
+    # Two uploads may share a file name (from different folders); both are kept
+    seen, unique = {}, []
+    for name in names:
+        seen[name] = seen.get(name, 0) + 1
+        unique.append(name if seen[name] == 1 else f"{name} ({seen[name]})")
+    return unique
+
+
+def load_uploaded_many(uploaded_files, column_map=COLUMN_MAP, max_workers=None):
+    names = _unique_names([f.name for f in uploaded_files])
+    sources = {name: f.getvalue() for name, f in zip(names, uploaded_files)}
+    key = _batch_key([[name, content_hash(data)] for name, data in sources.items()], column_map)
+    return _CACHE.get_or_build(key, lambda: load_files(sources, column_map, max_workers))
+
+
+def load_paths(paths, column_map=COLUMN_MAP, max_workers=None):
+    # Local files are keyed on path + size + mtime instead of hashing their content
+    stats = [[path, os.path.getsize(path), os.path.getmtime(path)] for path in paths]
+    key = _batch_key(stats, column_map)
+    return _CACHE.get_or_build(key, lambda: load_files({path: path for path in paths}, column_map, max_workers))
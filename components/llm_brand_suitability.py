@@ -1,12 +1,88 @@
-import google.generativeai as genai
-from dotenv import load_dotenv
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from components.llm_cache import get_cache, make_key
+from components.profiling import stage, timed
+import json
+import math
 import os
+import random
+import threading
+import time
 
-load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+# The Gemini SDK is imported and configured on first use, not at import time
+DEFAULT_MODEL = "models/gemini-1.5-pro"
+FAST_MODEL = "models/gemini-1.5-flash"
+MAX_POOLED_MODELS = 4
 
-# Use a fast and free model
-model = genai.GenerativeModel("models/gemini-1.5-flash")
+# Bump when build_prompt changes so cached answers to the old wording are not reused
+PROMPT_VERSION = 1
+
+_genai = None
+_models = OrderedDict()
+_client_lock = threading.Lock()
+_env_loaded = False
+
+
+class LLMUnavailable(RuntimeError):
+    pass
+
+
+def _api_key():
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+    return os.getenv("GEMINI_API_KEY")
+
+
+def is_available():
+    return bool(_api_key())
+
+
+def _client():
+    global _genai
+    with _client_lock:
+        if _genai is None:
+            api_key = _api_key()
+            if not api_key:
+                raise LLMUnavailable("Gemini is disabled: set GEMINI_API_KEY to enable brand-suitability analysis.")
+
+            import google.generativeai as genai
+
+            # GEMINI_API_ENDPOINT points the SDK at another host (e.g. a local stub server for testing)
+            endpoint = os.getenv("GEMINI_API_ENDPOINT")
+            genai.configure(
+                api_key=api_key,
+                **({"transport": "rest", "client_options": {"api_endpoint": endpoint}} if endpoint else {})
+            )
+            _genai = genai
+        return _genai
+
+
+def get_model(model_name=DEFAULT_MODEL):
+    # Small LRU pool of model clients shared by every call and worker thread
+    genai = _client()
+    with _client_lock:
+        if model_name not in _models:
+            _models[model_name] = genai.GenerativeModel(model_name)
+            while len(_models) > MAX_POOLED_MODELS:
+                _models.popitem(last=False)
+        _models.move_to_end(model_name)
+        return _models[model_name]
+
+
+def _retryable_errors():
+    # Errors worth retrying; anything else (bad key, invalid prompt) fails immediately
+    from google.api_core import exceptions as google_exceptions
+    return (
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.InternalServerError,
+        TimeoutError,
+        ConnectionError,
+    )
 
 def build_influencer_context(profile):
     return f"""
@@ -20,17 +96,8 @@ Influencer Profile:
 - Offer Type: {profile.get("offer_type", "N/A")}
 """
 
-def get_brand_suitability(context, target_domain, target_audience, model_name=None):
-    try:
-        # Use default model if none provided
-        if model_name is None:
-            model_name = "models/gemini-1.5-pro"
-
-        # Load the Gemini model
-        model = genai.GenerativeModel(model_name)
-
-        # Construct prompt
-        prompt = f"""
+def build_prompt(context, target_domain, target_audience):
+    return f"""
 You are a brand strategist AI.
 
 Based on the following influencer profile, analyze their **brand suitability** for a campaign targeting **{target_audience}** in the **{target_domain}** niche.
@@ -45,9 +112,320 @@ Be brief and highlight:
 {context}
         """
 
-        # Generate response
-        response = model.generate_content(prompt)
+def _generate(prompt, model_name, timeout=None, generation_config=None):
+    with stage("gemini.client"):
+        model = get_model(model_name)
+    request_options = {"timeout": timeout} if timeout else None
+    with stage("gemini.generate"):
+        response = model.generate_content(prompt, generation_config=generation_config, request_options=request_options)
         return response.text
 
+def response_cache_key(context, target_domain, target_audience, model_name):
+    return make_key(model_name, PROMPT_VERSION, context, target_domain, target_audience)
+
+@timed("gemini.brand_suitability")
+def get_brand_suitability(context, target_domain, target_audience, model_name=None, timeout=None,
+                          force_refresh=False):
+    try:
+        # Use default model if none provided
+        if model_name is None:
+            model_name = DEFAULT_MODEL
+
+        cache = get_cache()
+        key = response_cache_key(context, target_domain, target_audience, model_name)
+        if not force_refresh:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        prompt = build_prompt(context, target_domain, target_audience)
+        text = _generate(prompt, model_name, timeout)
+        cache.put(key, text)
+        return text
+
     except Exception as e:
         return f"❌ Gemini Error: {e}"
+
+# ---------------------- CONCURRENT BATCH ANALYSIS ----------------------
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+def call_with_retry(func, retries=3, base_delay=1.0, max_delay=30.0, bucket=None):
+    for attempt in range(retries + 1):
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            return func()
+        except Exception as e:
+            if attempt == retries or not isinstance(e, _retryable_errors()):
+                raise
+            # Exponential backoff with full jitter so parallel workers don't retry in lockstep
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+
+def analyze_many(contexts, target_domain, target_audience, model_name=None, max_workers=4,
+                 requests_per_minute=60, retries=3, timeout=60, force_refresh=False):
+    """Run suitability prompts concurrently and yield (key, text, ok) as each one finishes.
+
+    `contexts` maps any key (e.g. channel_id) to a build_influencer_context() string.
+    Cached answers are yielded first without touching the API.
+    """
+    model_name = model_name or DEFAULT_MODEL
+    bucket = TokenBucket(requests_per_minute / 60.0)
+    cache = get_cache()
+
+    pending = {}
+    for key, context in contexts.items():
+        cache_key = response_cache_key(context, target_domain, target_audience, model_name)
+        cached = None if force_refresh else cache.get(cache_key)
+        if cached is not None:
+            yield key, cached, True
+        else:
+            pending[key] = (context, cache_key)
+
+    def run(context, cache_key):
+        prompt = build_prompt(context, target_domain, target_audience)
+        text = call_with_retry(lambda: _generate(prompt, model_name, timeout), retries=retries, bucket=bucket)
+        cache.put(cache_key, text)
+        return text
+
+    # Not a `with` block: if the caller stops iterating (st.stop(), a rerun), exiting the
+    # context would block the generator's close() until every queued prompt had been sent
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {pool.submit(run, *args): key for key, args in pending.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                yield key, future.result(), True
+            except Exception as e:
+                yield key, f"❌ Gemini Error: {e}", False
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ---------------------- BULK STRUCTURED SCORING ----------------------
+
+# Bump when build_bulk_prompt or the result schema changes
+BULK_PROMPT_VERSION = 1
+DEFAULT_BATCH_SIZE = 10
+# Estimated prompt + reply tokens per request
+DEFAULT_TOKEN_BUDGET = 8000
+# Rough reply size of one result object
+RESULT_TOKENS = 80
+BULK_GENERATION_CONFIG = {"response_mime_type": "application/json", "temperature": 0.2}
+
+BULK_INSTRUCTIONS = """
+You are a brand strategist AI.
+
+Rate each influencer profile below for a campaign targeting **{target_audience}** in the **{target_domain}** niche.
+
+Reply with ONLY a JSON array, one object per profile, in this exact shape:
+[{{"id": "<profile id>", "score": <integer 0-100>, "alignment": "<one sentence on audience fit>", "risk_flags": ["<short flag>", ...]}}]
+
+- "score" is overall brand suitability: 0 = unsuitable, 100 = ideal.
+- "risk_flags" is an empty list when there are none.
+- Include every profile id exactly once.
+"""
+
+
+def estimate_tokens(text):
+    # ~4 characters per token for English prose; only used to size batches
+    return math.ceil(len(text) / 4)
+
+
+def build_bulk_prompt(profiles, target_domain, target_audience):
+    """One prompt for {profile id: build_influencer_context() string}."""
+    sections = [f"### Profile {pid}\n{context.strip()}" for pid, context in profiles.items()]
+    instructions = BULK_INSTRUCTIONS.format(target_domain=target_domain, target_audience=target_audience)
+    return instructions + "\n---\n\n" + "\n\n".join(sections) + "\n"
+
+
+def pack_batches(contexts, batch_size=DEFAULT_BATCH_SIZE, token_budget=DEFAULT_TOKEN_BUDGET):
+    """Split the keys of {key: context} into batches of at most `batch_size` profiles
+    whose estimated prompt and reply fit `token_budget`; an oversized profile goes alone."""
+    budget = token_budget - estimate_tokens(BULK_INSTRUCTIONS)
+    batches, current, used = [], [], 0
+    for key, context in contexts.items():
+        cost = estimate_tokens(context) + RESULT_TOKENS
+        if current and (len(current) >= batch_size or used + cost > budget):
+            batches.append(current)
+            current, used = [], 0
+        current.append(key)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def validate_result(item):
+    """Normalized {'score', 'alignment', 'risk_flags'} for one reply object; ValueError if invalid."""
+    score = item.get("score")
+    if isinstance(score, str):
+        score = score.strip().rstrip("%")
+    try:
+        score = float(score)
+    except (TypeError, ValueError):
+        raise ValueError(f"score is not a number: {item.get('score')!r}")
+    if not math.isfinite(score) or not 0 <= score <= 100:
+        raise ValueError(f"score out of range: {score}")
+
+    alignment = item.get("alignment")
+    if not isinstance(alignment, str) or not alignment.strip():
+        raise ValueError("alignment is missing")
+
+    flags = item.get("risk_flags") or []
+    if isinstance(flags, str):
+        flags = [flags]
+    if not isinstance(flags, list) or not all(isinstance(flag, str) for flag in flags):
+        raise ValueError("risk_flags is not a list of strings")
+
+    return {"score": round(score, 1), "alignment": alignment.strip(), "risk_flags": [f.strip() for f in flags if f.strip()]}
+
+
+def _json_block(text):
+    text = text.strip()
+    if text.startswith("```"):
+        # ```json ... ``` fences despite the JSON response type
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    if not text.startswith(("[", "{")) and "[" in text:
+        text = text[text.index("["):text.rindex("]") + 1]
+    return text
+
+
+def parse_bulk_response(text, expected_ids):
+    """({id: result}, {id: problem}) for a bulk reply; every expected id lands in exactly one."""
+    try:
+        payload = json.loads(_json_block(text))
+    except ValueError as e:
+        return {}, {pid: f"Unparseable response: {e}" for pid in expected_ids}
+    if isinstance(payload, dict):
+        payload = payload.get("results", [payload])
+    if not isinstance(payload, list):
+        return {}, {pid: "Response is not a JSON array" for pid in expected_ids}
+
+    results, problems = {}, {}
+    for item in payload:
+        pid = str(item.get("id")) if isinstance(item, dict) else None
+        if pid not in expected_ids or pid in results:
+            continue
+        try:
+            results[pid] = validate_result(item)
+            problems.pop(pid, None)
+        except ValueError as e:
+            problems[pid] = str(e)
+    for pid in expected_ids:
+        if pid not in results:
+            problems.setdefault(pid, "Missing from response")
+    return results, problems
+
+
+def bulk_cache_key(context, target_domain, target_audience, model_name):
+    return make_key(model_name, "bulk", BULK_PROMPT_VERSION, context, target_domain, target_audience)
+
+
+def score_many(contexts, target_domain, target_audience, model_name=None, batch_size=DEFAULT_BATCH_SIZE,
+               token_budget=DEFAULT_TOKEN_BUDGET, max_workers=4, requests_per_minute=60, retries=3,
+               timeout=60, force_refresh=False, stats=None):
+    """Score several profiles per request and yield (key, result, ok) as results arrive.
+
+    `contexts` maps any key to a build_influencer_context() string. `result` is a
+    validate_result() dict when ok, else an error message. Profiles the model skipped
+    or answered invalidly are re-sent in smaller batches, down to one per request;
+    the rest of their batch is kept. Pass a dict as `stats` to receive request counts.
+    """
+    model_name = model_name or DEFAULT_MODEL
+    stats = {} if stats is None else stats
+    stats.update(requests=0, resplits=0, cached=0)
+    bucket = TokenBucket(requests_per_minute / 60.0)
+    cache = get_cache()
+
+    pending = {}
+    for key, context in contexts.items():
+        cache_key = bulk_cache_key(context, target_domain, target_audience, model_name)
+        cached = None if force_refresh else cache.get(cache_key)
+        if cached is not None:
+            stats["cached"] += 1
+            yield key, json.loads(cached), True
+        else:
+            pending[key] = (context, cache_key)
+
+    def run(batch):
+        ids = {f"P{i + 1}": key for i, key in enumerate(batch)}
+        prompt = build_bulk_prompt({pid: pending[key][0] for pid, key in ids.items()}, target_domain, target_audience)
+        text = call_with_retry(
+            lambda: _generate(prompt, model_name, timeout, BULK_GENERATION_CONFIG), retries=retries, bucket=bucket
+        )
+        results, problems = parse_bulk_response(text, ids)
+        return {ids[pid]: r for pid, r in results.items()}, {ids[pid]: p for pid, p in problems.items()}
+
+    # Shut down without waiting, as in analyze_many(), so abandoning the generator drops queued batches
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        batches = pack_batches({key: context for key, (context, _) in pending.items()}, batch_size, token_budget)
+        futures = {pool.submit(run, batch): batch for batch in batches}
+        stats["requests"] += len(futures)
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = futures.pop(future)
+                try:
+                    results, problems = future.result()
+                except Exception as e:
+                    # Already retried; re-splitting would only repeat the failing call
+                    for key in batch:
+                        yield key, f"❌ Gemini Error: {e}", False
+                    continue
+
+                for key, result in results.items():
+                    cache.put(pending[key][1], json.dumps(result))
+                    yield key, result, True
+
+                failed = [key for key in batch if key in problems]
+                if len(batch) == 1:
+                    for key in failed:
+                        yield key, f"❌ Invalid result: {problems[key]}", False
+                    continue
+                # Only the failed profiles are re-sent, in batches half the size of this one
+                size = max(1, len(batch) // 2)
+                for start in range(0, len(failed), size):
+                    retry = failed[start:start + size]
+                    futures[pool.submit(run, retry)] = retry
+                    stats["requests"] += 1
+                    stats["resplits"] += 1
+
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def suitability_columns(results, index):
+    """suitability_score / _alignment / _risk_flags columns for `index` from {key: result}."""
+    import pandas as pd
+
+    # Built from the (few) results, then aligned, so a full roster index costs one reindex
+    rows = {key: r for key, r in results.items() if isinstance(r, dict)}
+    return pd.DataFrame({
+        "suitability_score": pd.Series({key: r["score"] for key, r in rows.items()}, dtype="float64"),
+        "suitability_alignment": pd.Series({key: r["alignment"] for key, r in rows.items()}, dtype="object"),
+        "suitability_risk_flags": pd.Series({key: "; ".join(r["risk_flags"]) for key, r in rows.items()}, dtype="object"),
+    }).reindex(index)
@@ -0,0 +1,175 @@
+import math
+import streamlit as st
+from components.llm_brand_suitability import (
+    DEFAULT_BATCH_SIZE, DEFAULT_TOKEN_BUDGET, FAST_MODEL, build_influencer_context, get_brand_suitability,
+    is_available, score_many, suitability_columns
+)
+from components.ingest import dataset_version
+from components.dataset_memo import mark_changed
+from components.features import ensure
+from components.scoring import top_k
+
+def safe_int(value):
+    try:
+        return int(float(value)) if value is not None and not math.isnan(float(value)) else 0
+    except:
+        return 0
+
+def show_llm_tab(df):
+    from streamlit_extras.stylable_container import stylable_container
+
+    required_cols = ['channel_id', 'domain']
+    missing = [col for col in required_cols if col not in df.columns]
+    if missing:
+        st.error(f"❌ Missing columns: {', '.join(missing)}")
+        st.stop()
+
+    df = ensure(df, 'influence_score')
+
+    if not is_available():
+        st.info("🔒 Gemini is disabled. Set `GEMINI_API_KEY` (e.g. in `.env`) to enable the LLM Advisor.")
+        return
+
+    st.sidebar.header("🎯 LLM Target Preferences")
+    domain_options = sorted(df['domain'].dropna().unique())
+    if not domain_options:
+        st.warning("No valid domains available.")
+        return
+
+    target_domain = st.sidebar.selectbox("Select Domain", domain_options)
+    target_audience = st.sidebar.text_input("Describe Target Audience", "Urban Gen Z Females")
+
+    in_domain = df[df['domain'] == target_domain]
+    df_filtered = in_domain.iloc[top_k(in_domain['influence_score'].to_numpy(), 5)]
+
+    if df_filtered.empty:
+        st.warning("⚠️ No influencers found for this domain")
+        return
+
+    st.markdown('<div class="fadein">', unsafe_allow_html=True)
+    st.markdown("### ✨ Top 5 Influencers in selected domain")
+
+    tabs = st.tabs([
+        f"@{row['channel_id']} ({row['influence_score']:.1f})"
+        for _, row in df_filtered.iterrows()
+    ])
+
+    for i, (idx, profile) in enumerate(df_filtered.iterrows()):
+        channel_id = str(profile['channel_id'])
+
+        with tabs[i]:
+            with stylable_container(
+                key=f"chat_container_{channel_id}_{i}",
+                css_styles="""
+                    padding: 14px;
+                    background-color: rgba(255, 255, 255, 0.04);
+                    border-radius: 12px;
+                    border: 1px solid rgba(0,0,0,0.1);
+                    box-shadow: 0 0 8px rgba(0,0,0,0.05);
+                """,
+            ):
+                followers = safe_int(profile.get('followers'))
+                likes = safe_int(profile.get('avg_likes'))
+                try:
+                    eng = float(profile.get('60_day_eng_rate', 0))
+                    eng_rate = f"{eng:.2f}%"
+                except:
+                    eng_rate = "N/A"
+
+                st.markdown(f"### 👤 Influencer: @{channel_id}")
+                st.markdown(f"- **Country:** {profile.get('country', 'N/A')}")
+                st.markdown(f"- **Followers:** {followers:,}")
+                st.markdown(f"- **Average Likes:** {likes:,}")
+                st.markdown(f"- **Engagement Rate:** {eng_rate}")
+                st.markdown(f"- **Offer Type:** {profile.get('offer_type', 'N/A')}")
+
+                if st.button(f"💬 Analyze @{channel_id}", key=f"analyze_btn_{channel_id}_{i}"):
+                    with st.spinner("🔍 Generating Gemini brand suitability insights..."):
+                        try:
+                            context = build_influencer_context(profile)
+                            result = get_brand_suitability(
+                                context,
+                                target_domain,
+                                target_audience,
+                                model_name=FAST_MODEL
+                            )
+                            st.success("✅ Gemini Response")
+                            st.markdown(result)
+                        except Exception as e:
+                            st.error(f"❌ Gemini Error: {e}")
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    show_bulk_screening(df, in_domain, target_domain, target_audience)
+
+
+# ---------------------- BULK SCREENING ----------------------
+
+def show_bulk_screening(df, in_domain, target_domain, target_audience):
+    st.markdown("### 📋 Bulk Suitability Screening")
+    st.caption("Scores a shortlist several profiles per Gemini request; profiles with a missing or invalid answer are re-sent in smaller batches.")
+
+    col1, col2, col3 = st.columns(3)
+    shortlist_size = col1.number_input("Shortlist size", min_value=1, max_value=max(1, len(in_domain)), value=min(50, max(1, len(in_domain))), step=10)
+    batch_size = col2.slider("Profiles per request", 1, 50, DEFAULT_BATCH_SIZE)
+    token_budget = col3.number_input("Token budget per request", min_value=1000, max_value=100_000, value=DEFAULT_TOKEN_BUDGET, step=1000)
+
+    # Keyed by roster row label so results join back onto the full frame
+    shortlist = in_domain.iloc[top_k(in_domain['influence_score'].to_numpy(), int(shortlist_size))]
+    run_key = (dataset_version(df), target_domain, target_audience, int(shortlist_size))
+
+    if st.button(f"🚀 Score {len(shortlist)} influencers", key="bulk_score_btn"):
+        contexts = {i: build_influencer_context(profile) for i, profile in shortlist.iterrows()}
+        results, stats = {}, {}
+        progress = st.progress(0.0, text="Scoring shortlist...")
+        for key, result, ok in score_many(
+            contexts, target_domain, target_audience, model_name=FAST_MODEL,
+            batch_size=batch_size, token_budget=int(token_budget), stats=stats
+        ):
+            results[key] = result
+            progress.progress(len(results) / len(contexts), text=f"Scored {len(results)} / {len(contexts)}")
+        progress.empty()
+        st.session_state['bulk_suitability'] = {'key': run_key, 'results': results, 'stats': stats}
+        attach_bulk_suitability(df)
+
+    run = st.session_state.get('bulk_suitability')
+    if not run or run['key'] != run_key:
+        return
+
+    results, stats = run['results'], run['stats']
+    failed = {key: error for key, error in results.items() if not isinstance(error, dict)}
+    st.caption(
+        f"{len(results) - len(failed)} scored · {stats.get('cached', 0)} from cache · "
+        f"{stats.get('requests', 0)} requests ({stats.get('resplits', 0)} re-splits) · {len(failed)} failed"
+    )
+
+    columns = [col for col in ['channel_id', 'country', 'followers', '60_day_eng_rate', 'influence_score'] if col in shortlist.columns]
+    table = shortlist[columns].join(suitability_columns(results, shortlist.index))
+    st.dataframe(
+        table.sort_values('suitability_score', ascending=False, na_position='last'),
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'suitability_score': st.column_config.ProgressColumn("Suitability", min_value=0, max_value=100, format="%.0f"),
+        },
+    )
+
+    if failed:
+        with st.expander(f"⚠️ {len(failed)} profiles could not be scored"):
+            for key, error in failed.items():
+                label = f"@{shortlist.loc[key, 'channel_id']}" if 'channel_id' in shortlist.columns else f"Row {key}"
+                st.markdown(f"- {label}: {error}")
+
+
+def attach_bulk_suitability(df):
+    """Add the last bulk screening's suitability_* columns to the roster (NaN where unscored)
+    so every view can sort and filter on them. No-op for a run on another dataset version."""
+    run = st.session_state.get('bulk_suitability')
+    if not run or run['key'][0] != dataset_version(df) or df.attrs.get('suitability_run') == run['key']:
+        return df
+    scored = suitability_columns(run['results'], df.index)
+    for col in scored.columns:
+        df[col] = scored[col]
+    mark_changed(df, scored.columns)
+    df.attrs['suitability_run'] = run['key']
+    return df
@@ -0,0 +1,140 @@
+# components/lookalike.py
+
+import numpy as np
+import pandas as pd
+from components.dataset_memo import memoize
+
+# 🧬 Numeric features (counts are log-scaled, then everything is z-scored)
+NUMERIC_FEATURES = ['followers', '60_day_eng_rate', 'avg_likes', 'engagement_quality']
+LOG_FEATURES = {'followers', 'avg_likes'}
+# Categorical features and their one-hot weight relative to one standard deviation
+CATEGORICAL_FEATURES = {'domain': 1.0, 'country': 0.5, 'Segment': 0.5}
+
+BLOCK_ROWS = 1_000_000
+
+
+class LookalikeIndex:
+    """Standardized feature matrix for k-nearest-neighbour search.
+
+    Categoricals are kept as integer codes: the squared distance between two
+    one-hot vectors with weight w is 2·w² when the values differ and 0 otherwise,
+    so the codes give exactly the one-hot distance without an n × categories matrix.
+    """
+
+    def __init__(self, df, numeric=NUMERIC_FEATURES, categorical=CATEGORICAL_FEATURES):
+        self.n_rows = len(df)
+        self.numeric = [col for col in numeric if col in df.columns]
+        self.categorical = {col: w for col, w in categorical.items() if col in df.columns}
+
+        matrix = np.zeros((self.n_rows, len(self.numeric)), dtype='float32')
+        for i, col in enumerate(self.numeric):
+            values = df[col].to_numpy(dtype='float64', na_value=np.nan)
+            if col in LOG_FEATURES:
+                values = np.log1p(np.clip(values, 0, None))
+            finite = np.isfinite(values)
+            mean = values[finite].mean() if finite.any() else 0.0
+            std = values[finite].std() if finite.any() else 0.0
+            # Missing values sit at the mean, so they neither attract nor repel
+            matrix[:, i] = np.where(finite, (values - mean) / (std or 1.0), 0.0)
+        self.matrix = matrix
+
+        self.codes = {}
+        self.mismatch_cost = {}
+        for col, weight in self.categorical.items():
+            codes, _ = pd.factorize(df[col])
+            self.codes[col] = codes.astype('int32')
+            self.mismatch_cost[col] = np.float32(2 * weight ** 2)
+
+        # Rows grouped by their combination of categorical values; every row in a group
+        # is the same categorical distance from the query, which bounds the whole group
+        combined = np.zeros(self.n_rows, dtype='int64')
+        for codes in self.codes.values():
+            combined = combined * (codes.max(initial=-1) + 2) + (codes + 1)
+        group_ids, _ = pd.factorize(combined)
+        self.order = np.argsort(group_ids, kind='stable')
+        self.starts = np.searchsorted(group_ids[self.order], np.arange(group_ids.max(initial=-1) + 2))
+        first = self.order[self.starts[:-1]]
+        self.group_codes = np.empty((len(first), len(self.codes)), dtype='int32')
+        for i, codes in enumerate(self.codes.values()):
+            self.group_codes[:, i] = codes[first]
+
+    def distances(self, position, rows):
+        """Squared distance from row `position` to each of the positional `rows`."""
+        diff = self.matrix[rows] - self.matrix[position]
+        dist = np.einsum('ij,ij->i', diff, diff)
+        for col, codes in self.codes.items():
+            # Unknown (-1) on either side is treated as a mismatch
+            query = codes[position]
+            dist += self.mismatch_cost[col] * ((codes[rows] != query) | (query < 0))
+        return dist
+
+    def _group_bounds(self, position):
+        bounds = np.zeros(len(self.group_codes), dtype='float32')
+        for i, (col, codes) in enumerate(self.codes.items()):
+            query = codes[position]
+            bounds += self.mismatch_cost[col] * ((self.group_codes[:, i] != query) | (query < 0))
+        return bounds
+
+    def query(self, position, k=50, rows=None, include_self=False, block_rows=BLOCK_ROWS):
+        """(positions, distances) of the k nearest rows to `position`, nearest first.
+
+        `rows` restricts the search to candidate positions (e.g. a FilterIndex result),
+        so filters are applied inside the search rather than to its output. Groups are
+        visited nearest-first and the scan stops once no remaining group can beat the
+        current k-th distance, so the result is exact without touching most rows.
+        """
+        best_rows = np.empty(0, dtype=np.intp)
+        best_dist = np.empty(0, dtype='float32')
+
+        if rows is not None and len(rows) <= block_rows:
+            rows = np.asarray(rows, dtype=np.intp)
+            if not include_self:
+                rows = rows[rows != position]
+            return _finish(*_merge_top(best_rows, best_dist, rows, self.distances(position, rows), k))
+
+        allowed = None
+        if rows is not None:
+            allowed = np.zeros(self.n_rows, dtype=bool)
+            allowed[rows] = True
+
+        bounds = self._group_bounds(position)
+        for group in np.argsort(bounds, kind='stable'):
+            if len(best_dist) == k and bounds[group] >= best_dist.max():
+                break
+            members = self.order[self.starts[group]:self.starts[group + 1]]
+            if allowed is not None:
+                members = members[allowed[members]]
+            if not include_self:
+                members = members[members != position]
+
+            # Blocked so huge groups never materialize a full-size temporary
+            for start in range(0, len(members), block_rows):
+                block = members[start:start + block_rows]
+                diff = self.matrix[block] - self.matrix[position]
+                dist = np.einsum('ij,ij->i', diff, diff) + bounds[group]
+                best_rows, best_dist = _merge_top(best_rows, best_dist, block, dist, k)
+
+        return _finish(best_rows, best_dist)
+
+
+def _merge_top(best_rows, best_dist, rows, dist, k):
+    rows = np.concatenate([best_rows, rows])
+    dist = np.concatenate([best_dist, dist])
+    if len(dist) > k:
+        keep = np.argpartition(dist, k - 1)[:k]
+        rows, dist = rows[keep], dist[keep]
+    return rows, dist
+
+
+def _finish(rows, dist):
+    order = np.lexsort((rows, dist))
+    return rows[order], np.sqrt(dist[order])
+
+
+def get_lookalike_index(df):
+    return memoize(df, 'lookalike_index', LookalikeIndex)
+
+
+def similarity(distances):
+    # 100 for an identical profile, falling off smoothly with distance
+    return np.round(100 / (1 + np.asarray(distances, dtype='float64')), 1)
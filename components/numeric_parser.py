@@ -0,0 +1,107 @@
+# components/numeric_parser.py
+
+import numpy as np
+import pandas as pd
+
+# Bump whenever parsing rules change so cached/parsed datasets are rebuilt
+PARSER_VERSION = 2
+
+# Placeholders exported by scrapers instead of a real value
+SENTINELS = ['', 'unknown', 'unnown', 'na', 'n/a', 'nan', 'none', 'null', '-', '?', '<na>']
+
+COUNT_SUFFIXES = {'k': 1e3, 'm': 1e6, 'b': 1e9}
+
+# One number with an optional sign and k/m/b suffix, e.g. "2.5k", "-1.1 m", "4.1". A sign only
+# counts at the start of a value, so the dash in "10k-20k" stays a range separator
+_NUMBER_PATTERN = r'(?P<sign>(?<![\w.])[-+])?(?P<num>\d+(?:\.\d+)?|\.\d+)\s*(?P<suffix>[kmb]?)'
+_PLAIN_PATTERN = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?'
+# A whole multi-value cell: numbers separated by spaces, "-", "/", "|", ";", "~" or "to"
+_VALUE = r'[-+]?(?:\d+(?:\.\d+)?|\.\d+)\s*[kmb]?'
+_MULTI_PATTERN = rf'{_VALUE}(?:(?:\s*[-/|;~]\s*|\s*\bto\b\s*|\s+){_VALUE})+'
+
+COUNT_COLUMNS = ['followers', 'avg_likes', 'posts', 'new_post_avg_like', 'total_likes']
+PERCENT_COLUMNS = ['60_day_eng_rate']
+
+
+def _scale(parts, suffixes):
+    numbers = parts['num'].astype('float64')
+    numbers = numbers.where(parts['sign'] != '-', -numbers)
+    return numbers * parts['suffix'].map(suffixes).fillna(1.0).astype('float64')
+
+
+def _parse_unique(text, suffixes):
+    text = (
+        text.str.strip()
+        .str.lower()
+        .str.replace(',', '', regex=False)
+        .str.replace('%', '', regex=False)
+    )
+    text = text.mask(text.isin(SENTINELS))
+    result = np.full(len(text), np.nan)
+
+    # Plain numbers ("15000", "4.5") convert in one C-level cast
+    plain = text.str.fullmatch(_PLAIN_PATTERN, na=False).to_numpy()
+    if plain.any():
+        result[plain] = text[plain].astype('float64').to_numpy()
+
+    # Single suffixed values ("2.5k", "1.1 m")
+    pending = ~plain & text.notna().to_numpy()
+    if pending.any():
+        single = text[pending].str.extract(f'^{_NUMBER_PATTERN}$')
+        matched = single['num'].notna()
+        if matched.any():
+            result[single.index[matched]] = _scale(single[matched], suffixes).to_numpy()
+        pending[single.index[matched]] = False
+
+    # Multi-value cells ("4.1 5.2", "10k-20k") are averaged; anything else
+    # ("1.2M followers", "12abc") is malformed and stays NaN
+    if pending.any():
+        pending &= text.str.fullmatch(_MULTI_PATTERN, na=False).to_numpy()
+    if pending.any():
+        parts = text[pending].str.extractall(_NUMBER_PATTERN)
+        if not parts.empty:
+            averaged = _scale(parts, suffixes).groupby(level=0).mean()
+            result[averaged.index.to_numpy()] = averaged.to_numpy()
+
+    return result
+
+
+def _parse_numeric(values, suffixes):
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_bool_dtype(series):
+        return series.astype('float64')
+    if pd.api.types.is_numeric_dtype(series):
+        # Keep compacted int32/float32 columns as they are instead of re-widening them
+        return series
+
+    # Exports repeat the same strings heavily, so parse each distinct value once
+    codes, uniques = pd.factorize(series.to_numpy(dtype=object, na_value=None))
+    parsed = _parse_unique(pd.Series(uniques, dtype=object).astype(str), suffixes)
+    result = np.where(codes >= 0, parsed[codes] if len(parsed) else np.nan, np.nan)
+
+    return pd.Series(result, index=series.index, name=series.name)
+
+
+def parse_counts(values):
+    """Parse follower/like counts such as "1.2M", "15,000" or "2.5k" into floats.
+
+    Sentinels ("unknown", "n/a", ...) and cells that are not entirely numbers become NaN;
+    multi-value cells are averaged.
+    """
+    return _parse_numeric(values, COUNT_SUFFIXES)
+
+
+def parse_percent(values):
+    """Parse rates such as "4.5%" or "4.1% 5.2%" (averaged) into floats."""
+    return _parse_numeric(values, {})
+
+
+def coerce_numeric_columns(df, count_cols=COUNT_COLUMNS, percent_cols=PERCENT_COLUMNS):
+    # Already-numeric columns are returned as-is, so calling this twice is cheap
+    for col in count_cols:
+        if col in df.columns:
+            df[col] = parse_counts(df[col])
+    for col in percent_cols:
+        if col in df.columns:
+            df[col] = parse_percent(df[col])
+    return df
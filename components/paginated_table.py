@@ -0,0 +1,53 @@
+# components/paginated_table.py
+
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 250]
+DEFAULT_COLUMNS = ['channel_id', 'followers', '60_day_eng_rate', 'avg_likes', 'country', 'domain', 'offer_type', 'Segment']
+
+
+def _sorted_positions(values, descending, needed):
+    """Order of `values` (NaN last); numeric columns only fully sort the first `needed` entries."""
+    if pd.api.types.is_numeric_dtype(values) and needed < len(values):
+        keys = values.to_numpy(dtype='float64', na_value=np.nan)
+        keys = np.where(np.isnan(keys), np.inf, -keys if descending else keys)
+        head = np.argpartition(keys, needed - 1)[:needed]
+        return head[np.argsort(keys[head], kind='stable')]
+
+    ordered = values.reset_index(drop=True).sort_values(ascending=not descending, na_position='last', kind='stable')
+    return ordered.index.to_numpy()[:needed]
+
+
+def show_paginated_table(df, rows=None, key='results'):
+    """Render one page of `df.iloc[rows]`; only the sort column and the visible page are materialized."""
+    rows = np.arange(len(df)) if rows is None else np.asarray(rows)
+    total = len(rows)
+
+    col1, col2, col3, col4 = st.columns([4, 2, 1, 1])
+    default_cols = [col for col in DEFAULT_COLUMNS if col in df.columns] or list(df.columns)[:8]
+    columns = col1.multiselect("Columns", list(df.columns), default=default_cols, key=f"{key}_cols")
+    sort_col = col2.selectbox("Sort by", [None] + list(df.columns), format_func=lambda c: "— none —" if c is None else c, key=f"{key}_sort")
+    descending = col3.toggle("Descending", True, key=f"{key}_desc")
+    page_size = col4.selectbox("Rows / page", PAGE_SIZES, key=f"{key}_size")
+
+    pages = max(1, math.ceil(total / page_size))
+    page_key = f"{key}_page"
+    # Seeded through Session State only; a widget default alongside it is ignored with a warning
+    st.session_state.setdefault(page_key, 1)
+    if st.session_state[page_key] > pages:
+        st.session_state[page_key] = pages  # filters shrank the result set
+    page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, key=page_key)
+    st.caption(f"**{total:,}** matching influencers · showing {page_size} per page")
+
+    start, stop = (page - 1) * page_size, min(page * page_size, total)
+    if sort_col is not None and total:
+        order = _sorted_positions(df[sort_col].iloc[rows], descending, stop)
+        page_rows = rows[order[start:stop]]
+    else:
+        page_rows = rows[start:stop]
+
+    st.dataframe(df.iloc[page_rows][columns or default_cols], hide_index=True, use_container_width=True)
@@ -0,0 +1,193 @@
+# components/profiling.py
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+
+# Log/metrics sinks are written when the debug panel is on or INFLUENSHOW_PROFILE=1
+ENABLED = os.getenv("INFLUENSHOW_PROFILE", "") not in ("", "0")
+PROFILE_LOG = os.getenv("INFLUENSHOW_PROFILE_LOG", os.path.join(".cache", "profile.jsonl"))
+PROMETHEUS_PATH = os.getenv("INFLUENSHOW_PROMETHEUS_FILE", os.path.join(".cache", "influenshow.prom"))
+PROFILE_DIR = os.path.join(".cache", "profiles")
+PROFILE_TOP_N = 30
+
+_MB = 1024 ** 2
+
+# Streamlit runs each session's script in its own thread, so the active rerun is thread-local;
+# stages timed on worker threads (e.g. Gemini calls) only feed the process-wide totals
+_local = threading.local()
+_totals = {}
+_totals_lock = threading.Lock()
+
+
+def _rss():
+    # Current resident set size; None where /proc is unavailable
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class RerunProfile:
+    """Stage records for one script rerun, optionally under cProfile."""
+
+    def __init__(self, capture=False):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = time.time()
+        self.records = []
+        self.depth = 0
+        self.seconds = None
+        self.profile_text = None
+        self.profile_path = None
+        self._start = time.perf_counter()
+        self._profiler = cProfile.Profile() if capture else None
+        if self._profiler is not None:
+            self._profiler.enable()
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def stop_profiler(self):
+        if self._profiler is None:
+            return
+        self._profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        self.profile_path = os.path.join(PROFILE_DIR, f"rerun_{self.run_id}.prof")
+        self._profiler.dump_stats(self.profile_path)
+
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+        self.profile_text = out.getvalue()
+        self._profiler = None
+
+    def summary(self):
+        # Records are appended as stages finish; sort so parents precede their children
+        return sorted(self.records, key=lambda r: r["start"])
+
+
+def start_rerun(capture=False):
+    run = RerunProfile(capture)
+    _local.run = run
+    return run
+
+
+def current_run():
+    return getattr(_local, "run", None)
+
+
+def _accumulate(record):
+    with _totals_lock:
+        totals = _totals.setdefault(record["stage"], {"calls": 0, "seconds": 0.0, "rows": 0})
+        totals["calls"] += 1
+        totals["seconds"] += record["seconds"]
+        totals["rows"] += record["rows"] or 0
+        totals["last_seconds"] = record["seconds"]
+
+
+@contextmanager
+def stage(name, rows=None):
+    """Time a block: wall time, rows handled and RSS change. The yielded dict can be
+    updated inside the block, e.g. `record['rows'] = len(result)`."""
+    run = current_run()
+    record = {"stage": name, "rows": rows, "depth": run.depth if run else 0,
+              "start": round(run.elapsed(), 4) if run else 0.0}
+    rss_before = _rss()
+    started = time.perf_counter()
+    if run:
+        run.depth += 1
+    try:
+        yield record
+    finally:
+        record["seconds"] = round(time.perf_counter() - started, 4)
+        rss_after = _rss()
+        record["rss_delta_mb"] = (
+            round((rss_after - rss_before) / _MB, 2) if rss_before is not None and rss_after is not None else None
+        )
+        if run:
+            run.depth -= 1
+            run.records.append(record)
+        _accumulate(record)
+
+
+def timed(name=None):
+    """Decorator form of stage(); rows are taken from a DataFrame first argument."""
+    def wrap(func):
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def inner(*args, **kwargs):
+            rows = len(args[0]) if args and hasattr(args[0], "shape") else None
+            with stage(label, rows):
+                return func(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def finish_rerun(write=ENABLED):
+    run = current_run()
+    if run is None:
+        return None
+    run.seconds = round(run.elapsed(), 4)
+    run.stop_profiler()
+    if write:
+        write_log(run)
+        write_prometheus()
+    _local.run = None
+    return run
+
+
+# ---------------------- SINKS ----------------------
+
+def write_log(run, path=None):
+    # One JSON object per rerun
+    path = path or PROFILE_LOG
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    entry = {
+        "run_id": run.run_id,
+        "timestamp": run.started_at,
+        "seconds": run.seconds,
+        "stages": run.summary(),
+        "profile": run.profile_path,
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def prometheus_text():
+    with _totals_lock:
+        totals = {name: dict(values) for name, values in _totals.items()}
+
+    metrics = [
+        ("influenshow_stage_calls_total", "counter", "Times each stage ran.", "calls"),
+        ("influenshow_stage_seconds_total", "counter", "Wall time spent in each stage.", "seconds"),
+        ("influenshow_stage_rows_total", "counter", "Rows processed by each stage.", "rows"),
+        ("influenshow_stage_last_seconds", "gauge", "Wall time of the most recent run of each stage.", "last_seconds"),
+    ]
+    lines = []
+    for metric, kind, help_text, field in metrics:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        for name in sorted(totals):
+            lines.append(f"{metric}{{stage=\"{_label(name)}\"}} {totals[name][field]:g}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path=None):
+    # Atomic replace so a textfile collector never reads a half-written file
+    path = path or PROMETHEUS_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
@@ -1,21 +1,52 @@
 # components/report_export.py
 
+import os
 import streamlit as st
-import io
+from components.export_formats import EXPORT_FORMATS, XLSX_MAX_ROWS, discard_export, export_to_tempfile
 
-def download_report_builder(df):
+def download_report_builder(df, rows=None, key="report"):
     st.subheader("📁 Export Influencer Report")
 
-    # Clean for export (optional: drop internal or temp cols)
-    export_df = df.copy()
-    export_buffer = io.StringIO()
-    export_df.to_csv(export_buffer, index=False)
-    csv_data = export_buffer.getvalue()
-
-    st.download_button(
-        label="📥 Download CSV",
-        data=csv_data,
-        file_name="influencer_report.csv",
-        mime="text/csv",
-        help="Download the processed influencer report as a CSV file."
+    col1, col2 = st.columns([3, 1])
+    columns = col1.multiselect("Columns to export", list(df.columns), default=list(df.columns), key=f"{key}_cols")
+    fmt = col2.selectbox(
+        "Format", list(EXPORT_FORMATS), format_func=lambda f: EXPORT_FORMATS[f]['label'], key=f"{key}_fmt"
     )
+    if rows is not None:
+        filtered_only = st.checkbox(f"Only the {len(rows):,} filtered rows", value=True, key=f"{key}_filtered")
+        rows = rows if filtered_only else None
+
+    n_rows = len(df) if rows is None else len(rows)
+    if fmt == 'xlsx' and n_rows > XLSX_MAX_ROWS:
+        st.warning(f"Excel holds at most {XLSX_MAX_ROWS:,} rows; the export will be truncated. Use Parquet or CSV for the full set.")
+
+    # Written in chunks to a temp file only on request, never as one in-memory string
+    state_key = f"{key}_export"
+    if st.button("⚙️ Prepare export", key=f"{key}_prepare"):
+        discard_prepared(state_key)
+        with st.spinner(f"Writing {n_rows:,} rows..."):
+            path, written = export_to_tempfile(df, fmt, rows=rows, columns=columns or None)
+        st.session_state[state_key] = {'path': path, 'fmt': fmt, 'rows': written}
+
+    prepared = st.session_state.get(state_key)
+    if prepared and os.path.exists(prepared['path']):
+        spec = EXPORT_FORMATS[prepared['fmt']]
+        size_mb = os.path.getsize(prepared['path']) / 1024 ** 2
+        with open(prepared['path'], 'rb') as f:
+            st.download_button(
+                label=f"📥 Download {spec['label']} ({prepared['rows']:,} rows · {size_mb:,.1f} MB)",
+                data=f,
+                file_name=f"influencer_report{spec['ext']}",
+                mime=spec['mime'],
+                help="Download the processed influencer report.",
+                key=f"{key}_download",
+                # The button already holds the bytes, so the file can go once it is clicked
+                on_click=discard_prepared,
+                args=(state_key,)
+            )
+
+
+def discard_prepared(state_key):
+    prepared = st.session_state.pop(state_key, None)
+    if prepared:
+        discard_export(prepared['path'])
@@ -0,0 +1,172 @@
+# components/rollup.py
+
+import numpy as np
+import pandas as pd
+from components.dataset_memo import memoize
+from components.segmentation import SEGMENT_LABELS, segment_followers
+from components.streaming import INVALID_OFFERS
+
+# 🧊 Cube axes and the measures summed per cell
+DIMENSIONS = ['Segment', 'domain', 'country', 'offer_type']
+MEASURES = ['followers', 'avg_likes', '60_day_eng_rate']
+HIGH_PERFORMER_THRESHOLD = 5
+
+
+class RollupCube:
+    """Row count, high-performer count and count / sum / sum of squares per measure for
+    every Segment × domain × country × offer_type combination present in a roster.
+
+    The cube has one row per occupied cell (thousands, not millions), so any chart
+    grouped by, or filtered on, its dimensions is answered without touching the frame.
+    Missing dimension values are kept as their own (NaN) cell.
+    """
+
+    def __init__(self, dimensions=DIMENSIONS, measures=MEASURES, high_performer_threshold=HIGH_PERFORMER_THRESHOLD):
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.high_performer_threshold = high_performer_threshold
+        self.stats = ['rows', 'high_performers'] + [f"{m}_{s}" for m in self.measures for s in ('count', 'sum', 'sumsq')]
+        self.cells = pd.DataFrame({**{d: pd.Series(dtype=object) for d in self.dimensions},
+                                   **{s: pd.Series(dtype='float64') for s in self.stats}})
+
+    def _chunk_cells(self, chunk):
+        # Dimension codes are combined arithmetically, so grouping is one factorize + bincounts
+        combined = np.zeros(len(chunk), dtype='int64')
+        codes, levels = [], []
+        for dim in self.dimensions:
+            if dim in chunk.columns:
+                values = chunk[dim]
+            elif dim == 'Segment' and 'followers' in chunk.columns:
+                values = segment_followers(chunk['followers'])
+            else:
+                values = pd.Series(np.nan, index=chunk.index)
+            dim_codes, uniques = pd.factorize(values)
+            uniques = np.append(np.asarray(uniques, dtype=object), np.nan)
+            dim_codes = np.where(dim_codes < 0, len(uniques) - 1, dim_codes)
+            combined = combined * len(uniques) + dim_codes
+            codes.append(dim_codes)
+            levels.append(uniques)
+
+        cell_ids, cell_keys = pd.factorize(combined)
+        n_cells = len(cell_keys)
+        first = np.zeros(n_cells, dtype=np.intp)
+        first[cell_ids[::-1]] = np.arange(len(chunk))[::-1]
+
+        cells = {dim: levels[i][codes[i][first]] for i, dim in enumerate(self.dimensions)}
+        cells['rows'] = np.bincount(cell_ids, minlength=n_cells).astype('float64')
+        high = np.zeros(len(chunk), dtype='float64')
+        for measure in self.measures:
+            if measure in chunk.columns:
+                values = pd.to_numeric(chunk[measure], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+            else:
+                values = np.full(len(chunk), np.nan)
+            present = ~np.isnan(values)
+            filled = np.where(present, values, 0.0)
+            cells[f"{measure}_count"] = np.bincount(cell_ids, weights=present, minlength=n_cells)
+            cells[f"{measure}_sum"] = np.bincount(cell_ids, weights=filled, minlength=n_cells)
+            cells[f"{measure}_sumsq"] = np.bincount(cell_ids, weights=filled * filled, minlength=n_cells)
+            if measure == '60_day_eng_rate':
+                high = (filled > self.high_performer_threshold).astype('float64')
+        cells['high_performers'] = np.bincount(cell_ids, weights=high, minlength=n_cells)
+        return pd.DataFrame(cells)
+
+    def update(self, chunk, sign=1):
+        # sign=-1 retracts rows that were previously added
+        if 'cluster_primary' in chunk.columns:
+            # Duplicate accounts of one creator count once; rows added later (NaN) count as their own
+            chunk = chunk[chunk['cluster_primary'].ne(False)]
+        if len(chunk):
+            added = self._chunk_cells(chunk)
+            added[self.stats] *= sign
+            self._combine(added)
+        return self
+
+    def merge(self, other):
+        self._combine(other.cells)
+        return self
+
+    def _combine(self, added):
+        parts = [frame for frame in (self.cells, added) if len(frame)]
+        combined = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+        cells = combined.groupby(self.dimensions, dropna=False, sort=False, observed=True)[self.stats].sum().reset_index()
+        # Fully retracted cells disappear; rounding keeps float sums of counts exact
+        cells[['rows', 'high_performers']] = cells[['rows', 'high_performers']].round()
+        self.cells = cells[cells['rows'] > 0].reset_index(drop=True)
+
+    # ---------------------- SLICING ----------------------
+
+    def where(self, members=None):
+        """Sub-cube of the cells whose dimension values are in `members` ({dim: values});
+        empty value lists leave a dimension unfiltered, like FilterIndex.query()."""
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, values in (members or {}).items():
+            if values:
+                mask &= self.cells[dim].isin(list(values)).to_numpy()
+        sliced = RollupCube(self.dimensions, self.measures, self.high_performer_threshold)
+        sliced.cells = self.cells[mask].reset_index(drop=True)
+        return sliced
+
+    def values(self, dim):
+        # Non-missing values of one dimension, for filter widgets
+        values = self.cells[dim].dropna().unique().tolist()
+        if dim == 'Segment':
+            return [label for label in SEGMENT_LABELS if label in values]
+        return sorted(values, key=str)
+
+    def summary(self, *dims):
+        """One row per combination of `dims` (missing values dropped): count, high_performers
+        and sum / mean / std per measure. With no dims, a single row for the whole cube."""
+        stats = self.cells[self.stats]
+        if dims:
+            cells = self.cells.dropna(subset=list(dims))
+            stats = cells.groupby(list(dims), sort=False, observed=True)[self.stats].sum()
+        else:
+            stats = stats.sum().to_frame().T
+
+        out = pd.DataFrame(index=stats.index)
+        out['count'] = stats['rows'].astype('int64')
+        out['high_performers'] = stats['high_performers'].astype('int64')
+        for measure in self.measures:
+            n, total, sumsq = stats[f"{measure}_count"], stats[f"{measure}_sum"], stats[f"{measure}_sumsq"]
+            out[f"{measure}_sum"] = total
+            out[f"{measure}_mean"] = total / n.where(n > 0)
+            # Sample variance from the running sums, clipped at 0 against rounding
+            out[f"{measure}_std"] = np.sqrt(((sumsq - total * total / n.where(n > 0)) / (n - 1).where(n > 1)).clip(lower=0))
+        out = out.reset_index(drop=not dims)
+        if 'Segment' in dims:
+            out['Segment'] = pd.Categorical(out['Segment'], categories=SEGMENT_LABELS, ordered=True)
+            out = out.sort_values(list(dims), kind='stable').reset_index(drop=True)
+        return out
+
+    # Same interface as streaming.RunningAggregates, so KPI cards read either
+
+    @property
+    def rows(self):
+        return int(self.cells['rows'].sum())
+
+    @property
+    def segment_counts(self):
+        counts = self.summary('Segment').set_index('Segment')['count']
+        return counts.reindex(SEGMENT_LABELS, fill_value=0).astype('int64')
+
+    @property
+    def offer_counts(self):
+        counts = self.summary('offer_type').set_index('offer_type')['count']
+        return counts[~counts.index.isin(INVALID_OFFERS)].sort_values(ascending=False, kind='stable')
+
+    def metrics(self):
+        # Same keys as utils.metrics.calculate_metrics
+        total = self.cells[self.stats].sum()
+        eng_count = total['60_day_eng_rate_count']
+        return {
+            "total_influencers": int(total['rows']),
+            "total_reach": float(total['followers_sum']),
+            "avg_eng_rate": float(total['60_day_eng_rate_sum'] / eng_count) if eng_count else float('nan'),
+            "high_performers": int(total['high_performers'])
+        }
+
+
+def rollup_cube(df):
+    """Cube for a loaded frame, built once per dataset version; delta upserts
+    seed the next version's entry instead of rebuilding it."""
+    return memoize(df, 'rollup_cube', lambda frame: RollupCube().update(frame))
@@ -0,0 +1,148 @@
+# components/scoring.py
+
+import numpy as np
+import pandas as pd
+from components.dataset_memo import column_token, memoize
+
+# Score inputs, each rescaled to 0–100 over the dataset before weighting
+SCORE_FEATURES = ['reach', 'engagement', 'likes', 'quality']
+
+WEIGHT_PRESETS = {
+    'Balanced': {'reach': 0.3, 'engagement': 0.3, 'likes': 0.2, 'quality': 0.2},
+    'Reach': {'reach': 0.6, 'engagement': 0.15, 'likes': 0.25, 'quality': 0.0},
+    'Engagement': {'reach': 0.1, 'engagement': 0.5, 'likes': 0.1, 'quality': 0.3},
+    'Likes-weighted': {'reach': 0.3, 'engagement': 0.0, 'likes': 0.7, 'quality': 0.0},
+}
+DEFAULT_PRESET = 'Balanced'
+BRAND_FIT_FACTOR = 0.8
+
+
+def _rescale(values, bounds=None):
+    # 0–100 between `bounds` (low, high); defaults to the values' own finite range
+    values = np.asarray(values, dtype='float64')
+    finite = np.isfinite(values)
+    if bounds is None:
+        if not finite.any():
+            return np.zeros(len(values), dtype='float32')
+        bounds = (values[finite].min(), values[finite].max())
+    low, high = bounds
+    span = high - low
+    scaled = (values - low) / span * 100 if span > 0 else np.zeros(len(values))
+    return np.where(finite, scaled, 0).astype('float32')
+
+
+def _column(df, col):
+    if col not in df.columns:
+        return None
+    return df[col].to_numpy(dtype='float64', na_value=np.nan)
+
+
+def _raw_features(df):
+    followers = _column(df, 'followers')
+    likes = _column(df, 'avg_likes')
+    eng = _column(df, '60_day_eng_rate')
+
+    raw = {
+        # Counts are heavy-tailed; log keeps one mega account from flattening everyone else
+        'reach': np.log1p(np.clip(followers, 0, None)) if followers is not None else None,
+        'engagement': eng,
+        'likes': np.log1p(np.clip(likes, 0, None)) if likes is not None else None,
+        'quality': None,
+    }
+    if followers is not None and likes is not None:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            raw['quality'] = np.where(followers > 0, likes / followers, np.nan)
+    return raw
+
+
+def _feature_matrix(df, bounds=None):
+    raw = _raw_features(df)
+    available = [name for name in SCORE_FEATURES if raw[name] is not None]
+    matrix = np.zeros((len(df), len(SCORE_FEATURES)), dtype='float32')
+    for i, name in enumerate(SCORE_FEATURES):
+        if raw[name] is not None:
+            matrix[:, i] = _rescale(raw[name], (bounds or {}).get(name))
+    return matrix, available
+
+
+def score_bounds(df):
+    """Finite (low, high) of each raw score feature, so partitions can be rescaled identically."""
+    bounds = {}
+    for name, values in _raw_features(df).items():
+        if values is None:
+            continue
+        finite = values[np.isfinite(values)]
+        bounds[name] = (float(finite.min()), float(finite.max())) if len(finite) else None
+    return bounds
+
+
+def merge_bounds(parts):
+    merged = {}
+    for bounds in parts:
+        for name, value in bounds.items():
+            current = merged.get(name)
+            if value is None or current is None:
+                merged[name] = value or current
+            else:
+                merged[name] = (min(current[0], value[0]), max(current[1], value[1]))
+    return merged
+
+
+SCORE_INPUTS = ('followers', 'avg_likes', '60_day_eng_rate')
+
+
+def score_features(df):
+    tokens = tuple(column_token(df, col) for col in SCORE_INPUTS)
+    return memoize(df, 'score_features', _feature_matrix, tokens)
+
+
+def resolve_weights(weights=None, preset=DEFAULT_PRESET):
+    return {**WEIGHT_PRESETS[preset], **(weights or {})}
+
+
+def compute_scores(df, weights=None, preset=DEFAULT_PRESET, bounds=None):
+    """Weighted 0–100 influence score; features missing from the frame are dropped from the weighting.
+    `bounds` (see score_bounds) rescales against a whole dataset when df is one partition of it."""
+    matrix, available = score_features(df) if bounds is None else _feature_matrix(df, bounds)
+    weights = resolve_weights(weights, preset)
+    vector = np.array(
+        [weights.get(name, 0.0) if name in available else 0.0 for name in SCORE_FEATURES],
+        dtype='float32'
+    )
+    total = vector.sum()
+    scores = matrix @ (vector / total) if total > 0 else np.zeros(len(df), dtype='float32')
+    return pd.Series(scores.astype('float64'), index=df.index, name='influence_score')
+
+
+def add_scores(df, weights=None, preset=DEFAULT_PRESET, bounds=None):
+    df['influence_score'] = compute_scores(df, weights, preset, bounds)
+    df['brand_fit_score'] = (df['influence_score'] * BRAND_FIT_FACTOR).round(2)
+    return df
+
+
+def _top_positions(scores, k):
+    if k <= 0 or len(scores) == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        # O(n) partial selection, then only the k winners get sorted
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+def top_k(scores, k=10, groups=None):
+    """Positional row ids of the k highest scores, overall or per group (NaN scores rank last)."""
+    scores = np.nan_to_num(np.asarray(scores, dtype='float64'), nan=-np.inf)
+    if groups is None:
+        return _top_positions(scores, k)
+
+    codes, _ = pd.factorize(groups)
+    order = np.argsort(codes, kind='stable')
+    starts = np.searchsorted(codes[order], np.arange(codes.max() + 2)) if len(codes) else [0]
+
+    picked = []
+    for start, stop in zip(starts[:-1], starts[1:]):
+        members = order[start:stop]
+        picked.append(members[_top_positions(scores[members], k)])
+    return np.concatenate(picked) if picked else np.empty(0, dtype=np.intp)
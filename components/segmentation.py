@@ -0,0 +1,39 @@
+# components/segmentation.py
+
+import numpy as np
+import pandas as pd
+from components.numeric_parser import parse_counts
+
+# Follower tiers: [0, 10k) Nano, [10k, 100k) Micro, [100k, 1M) Macro, 1M+ Mega
+SEGMENT_LABELS = ['Nano', 'Micro', 'Macro', 'Mega']
+SEGMENT_BOUNDARIES = [10_000, 100_000, 1_000_000]
+
+
+def segment_followers(followers, boundaries=SEGMENT_BOUNDARIES, labels=SEGMENT_LABELS):
+    if len(labels) != len(boundaries) + 1:
+        raise ValueError("Need exactly one more segment label than tier boundaries.")
+
+    bins = [-np.inf, *boundaries, np.inf]
+    segments = pd.cut(parse_counts(followers), bins=bins, labels=labels, right=False, ordered=True)
+    return segments.rename('Segment')
+
+
+def add_segment(df, boundaries=SEGMENT_BOUNDARIES, labels=SEGMENT_LABELS):
+    # Reuse the column when it was already binned with the same tiers
+    existing = df['Segment'] if 'Segment' in df.columns else None
+    if (
+        existing is not None
+        and isinstance(existing.dtype, pd.CategoricalDtype)
+        and list(existing.cat.categories) == list(labels)
+        and df.attrs.get('segment_boundaries', SEGMENT_BOUNDARIES) == list(boundaries)
+    ):
+        return df
+
+    df['Segment'] = segment_followers(df['followers'], boundaries, labels)
+    df.attrs['segment_boundaries'] = list(boundaries)
+    return df
+
+
+def segment_counts(df, count_name='Count'):
+    # Ordered categorical keeps Nano → Mega order in charts
+    return df['Segment'].value_counts(sort=False).rename_axis('Segment').reset_index(name=count_name)
@@ -0,0 +1,150 @@
+# components/snapshot_store.py
+
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime
+
+from components.insight_generator import generate_derived_features
+
+SNAPSHOT_DIR = os.getenv("INFLUENSHOW_SNAPSHOT_DIR", "snapshots")
+SNAPSHOT_FORMATS = {'arrow': '.arrow', 'parquet': '.parquet'}
+# Columns the dashboard views read unconditionally; always part of a projection
+CORE_COLUMNS = ['channel_id', 'followers', '60_day_eng_rate', 'avg_likes', 'country', 'domain', 'offer_type']
+
+# Recently reopened snapshots, so reruns don't rebuild the pandas frame
+_OPEN = OrderedDict()
+_MAX_OPEN = 2
+
+
+def _safe_name(name):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', name.strip()).strip('._') or 'snapshot'
+
+
+def _find(name, root):
+    for ext in SNAPSHOT_FORMATS.values():
+        path = os.path.join(root, _safe_name(name) + ext)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No snapshot named '{name}' in {root}")
+
+
+def save_snapshot(df, name, root=SNAPSHOT_DIR, fmt='arrow', derive=True):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if derive and {'followers', 'avg_likes'}.issubset(df.columns):
+        df = generate_derived_features(df.copy(deep=False))
+
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, _safe_name(name) + SNAPSHOT_FORMATS[fmt])
+    tmp_path = path + '.tmp'
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if fmt == 'arrow':
+        # Uncompressed IPC file so reopening can memory-map it without decoding
+        with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pq.write_table(table, tmp_path)
+
+    os.replace(tmp_path, path)
+    return path
+
+
+def save_snapshot_parts(part_paths, name, root=SNAPSHOT_DIR):
+    """Concatenate Arrow IPC part files (identical schemas) into one snapshot, batch by batch,
+    so a roster too large for memory can still be opened memory-mapped by the dashboard."""
+    import pyarrow as pa
+
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, _safe_name(name) + SNAPSHOT_FORMATS['arrow'])
+    tmp_path = path + '.tmp'
+
+    writer = None
+    try:
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            for part in part_paths:
+                with pa.memory_map(part, 'r') as source:
+                    reader = pa.ipc.open_file(source)
+                    if writer is None:
+                        writer = pa.ipc.new_file(sink, reader.schema)
+                    for i in range(reader.num_record_batches):
+                        writer.write_batch(reader.get_batch(i))
+            if writer is not None:
+                writer.close()
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if writer is None:
+        os.remove(tmp_path)
+        raise ValueError("No parts to write into the snapshot.")
+    os.replace(tmp_path, path)
+    return path
+
+
+def list_snapshots(root=SNAPSHOT_DIR):
+    if not os.path.isdir(root):
+        return []
+
+    snapshots = []
+    for entry in os.scandir(root):
+        stem, ext = os.path.splitext(entry.name)
+        if ext in SNAPSHOT_FORMATS.values() and entry.is_file():
+            stat = entry.stat()
+            snapshots.append({
+                'name': stem,
+                'format': ext.lstrip('.'),
+                'size_mb': stat.st_size / 1024 ** 2,
+                'modified': datetime.fromtimestamp(stat.st_mtime)
+            })
+    return sorted(snapshots, key=lambda s: s['modified'], reverse=True)
+
+
+def snapshot_columns(name, root=SNAPSHOT_DIR):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = _find(name, root)
+    if path.endswith('.parquet'):
+        return pq.read_schema(path).names
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).schema.names
+
+
+def load_snapshot(name, columns=None, root=SNAPSHOT_DIR):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = _find(name, root)
+    mtime = os.stat(path).st_mtime_ns
+    if columns:
+        # Core columns stay loaded so every view works on a narrow projection
+        wanted = set(columns) | set(CORE_COLUMNS)
+        columns = [col for col in snapshot_columns(name, root) if col in wanted]
+    key = (path, mtime, tuple(columns) if columns else None)
+
+    if key not in _OPEN:
+        if path.endswith('.parquet'):
+            # Parquet only reads the projected column chunks from disk
+            table = pq.read_table(path, columns=columns, memory_map=True)
+        else:
+            # Memory-mapped IPC: projection is zero-copy, untouched columns are never paged in;
+            # the table's buffers keep the mapping alive after the file is closed
+            with pa.memory_map(path, 'r') as source:
+                table = pa.ipc.open_file(source).read_all()
+            if columns:
+                table = table.select(columns)
+
+        df = table.to_pandas(split_blocks=True)
+        # The projection is part of the version, so memoized cubes/indexes never cross projections
+        projection = f":{','.join(columns)}" if columns else ""
+        df.attrs['dataset_version'] = f"snapshot:{os.path.basename(path)}:{mtime}{projection}"
+        _OPEN[key] = df
+        while len(_OPEN) > _MAX_OPEN:
+            _OPEN.popitem(last=False)
+
+    _OPEN.move_to_end(key)
+    return _OPEN[key].copy(deep=False)
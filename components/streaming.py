@@ -0,0 +1,90 @@
+# components/streaming.py
+
+import pandas as pd
+from components.ingest import COLUMN_MAP, prepare_frame
+from components.segmentation import segment_followers
+
+# Only these columns are kept from each chunk; everything else is dropped at parse time
+STREAM_COLUMNS = {'followers', '60_day_eng_rate', 'offer_type'}
+INVALID_OFFERS = ['', 'N/A', 'unknown']
+
+
+def _normalized_name(raw, column_map=COLUMN_MAP):
+    name = str(raw).strip().lower()
+    return {k.lower(): v for k, v in column_map.items()}.get(name, name)
+
+
+class RunningAggregates:
+    """Single-pass totals for the Overview KPIs, segment counts and offer counts."""
+
+    def __init__(self, high_performer_threshold=5):
+        self.high_performer_threshold = high_performer_threshold
+        self.rows = 0
+        self.followers_sum = 0.0
+        self.eng_sum = 0.0
+        self.eng_count = 0
+        self.high_performers = 0
+        self.segment_counts = pd.Series(dtype='int64')
+        self.offer_counts = pd.Series(dtype='int64')
+
+    def update(self, chunk, sign=1):
+        # sign=-1 retracts rows that were previously added
+        if 'cluster_primary' in chunk.columns:
+            # Duplicate accounts of one creator count once; rows added later (NaN) count as their own
+            chunk = chunk[chunk['cluster_primary'].ne(False)]
+        self.rows += sign * len(chunk)
+
+        if 'followers' in chunk.columns:
+            followers = chunk['followers']
+            self.followers_sum += sign * float(followers.sum())
+            segments = chunk['Segment'] if 'Segment' in chunk.columns else segment_followers(followers)
+            segments = segments.value_counts()
+            self.segment_counts = self.segment_counts.add(sign * segments, fill_value=0).astype('int64')
+
+        if '60_day_eng_rate' in chunk.columns:
+            eng = chunk['60_day_eng_rate']
+            self.eng_sum += sign * float(eng.sum())
+            self.eng_count += sign * int(eng.count())
+            self.high_performers += sign * int((eng > self.high_performer_threshold).sum())
+
+        if 'offer_type' in chunk.columns:
+            offers = chunk['offer_type']
+            offers = offers[offers.notna() & ~offers.isin(INVALID_OFFERS)].value_counts()
+            self.offer_counts = self.offer_counts.add(sign * offers, fill_value=0).astype('int64')
+
+        return self
+
+    def merge(self, other):
+        # Combine totals gathered separately, e.g. by worker processes over partitions
+        self.rows += other.rows
+        self.followers_sum += other.followers_sum
+        self.eng_sum += other.eng_sum
+        self.eng_count += other.eng_count
+        self.high_performers += other.high_performers
+        self.segment_counts = self.segment_counts.add(other.segment_counts, fill_value=0).astype('int64')
+        self.offer_counts = self.offer_counts.add(other.offer_counts, fill_value=0).astype('int64')
+        return self
+
+    def metrics(self):
+        # Same keys as utils.metrics.calculate_metrics
+        return {
+            "total_influencers": self.rows,
+            "total_reach": self.followers_sum,
+            "avg_eng_rate": self.eng_sum / self.eng_count if self.eng_count else float('nan'),
+            "high_performers": self.high_performers
+        }
+
+
+def stream_csv(source, chunksize=250_000, aggregates=None, column_map=COLUMN_MAP):
+    """Yield (chunk, aggregates) per normalized chunk of a CSV path or file object."""
+    aggregates = aggregates or RunningAggregates()
+    reader = pd.read_csv(
+        source,
+        chunksize=chunksize,
+        usecols=lambda col: _normalized_name(col, column_map) in STREAM_COLUMNS
+    )
+    with reader:
+        for chunk in reader:
+            chunk = prepare_frame(chunk, column_map)
+            aggregates.update(chunk)
+            yield chunk, aggregates
@@ -1,17 +1,11 @@
 import streamlit as st
-import pandas as pd
+from components.ingest import load_uploaded
 
 def upload_data():
     uploaded_file = st.file_uploader("Upload influencer data (.csv)", type=["csv"])
     if uploaded_file:
-        df = pd.read_csv(uploaded_file)
-
-        # ✅ Rename column if necessary
-        if "channel_id" not in df.columns and "channel_info" in df.columns:
-            df = df.rename(columns={"channel_info": "channel_id"})
-
-        # ✅ Optional: Remove extra spaces or casing issues
-        df.columns = df.columns.str.strip()
+        # ✅ Parsed, renamed and typed once per file content (cached across reruns)
+        df, _ = load_uploaded(uploaded_file)
 
         st.session_state['df'] = df
         st.success("✅ Data uploaded successfully!")
@@ -1,177 +1,327 @@
 import streamlit as st
-import plotly.express as px
 import pandas as pd
-from streamlit_extras.stylable_container import stylable_container
+from components.profiling import stage
 
-# ---------------------- SEGMENTATION & METRICS ----------------------
+# Component modules are imported inside each view, so a rerun only loads what the active view needs
 
-def segment_influencer(f):
-    if f < 10_000:
-        return 'Nano'
-    elif f < 100_000:
-        return 'Micro'
-    elif f < 1_000_000:
-        return 'Macro'
-    else:
-        return 'Mega'
+def _px():
+    # plotly.express is slow to import; only views that draw a chart pay for it
+    with stage("plotly.import"):
+        import plotly.express as px
+    return px
 
 # ---------------------- MAIN VISUALIZER FUNCTIONS ----------------------
 
 def show_overview(df):
+    from components.numeric_parser import parse_counts, parse_percent
+    from components.rollup import rollup_cube
+
     st.markdown('<div class="fadein">', unsafe_allow_html=True)
     st.subheader("📈 Metrics Overview")
 
-    df['followers'] = pd.to_numeric(df['followers'], errors='coerce')
+    with stage("overview.parse_followers", len(df)):
+        df['followers'] = parse_counts(df['followers'])
 
     if '60_day_eng_rate' not in df.columns:
         st.warning("Missing '60_day_eng_rate' column.")
         st.markdown('</div>', unsafe_allow_html=True)
         return
 
-    df['60_day_eng_rate'] = df['60_day_eng_rate'].astype(str).str.replace('%', '', regex=False)
+    # Multi-value cells like "4.1% 5.2%" are averaged by the parser
+    with stage("overview.parse_eng_rate", len(df)):
+        df['60_day_eng_rate'] = parse_percent(df['60_day_eng_rate'])
 
-    def extract_and_avg(cell):
-        try:
-            numbers = [float(x) for x in cell.replace(' ', '').split('%') if x.strip() != '']
-            if not numbers:
-                numbers = [float(x) for x in cell.split() if x.strip() != '']
-            return sum(numbers) / len(numbers) if numbers else None
-        except:
-            return None
+    # Totals come from the rollup cube, kept per dataset version and adjusted by delta upserts
+    with stage("overview.metrics", len(df)):
+        metrics = rollup_cube(df).metrics()
+    show_metric_cards(metrics)
 
-    df['60_day_eng_rate_clean'] = df['60_day_eng_rate'].apply(extract_and_avg)
+    st.markdown('</div>', unsafe_allow_html=True)
 
-    avg_engagement = df['60_day_eng_rate_clean'].mean()
-    total_influencers = len(df)
-    total_reach = df['followers'].sum()
-    high_performers = df[df['60_day_eng_rate_clean'] > 5].shape[0]
+def show_metric_cards(metrics, container=None):
+    container = container or st
+    col1, col2, col3, col4 = container.columns(4)
+    col1.metric("Total Influencers", f"{metrics['total_influencers']:,}")
+    col2.metric("Total Reach", f"{metrics['total_reach']:,.0f}")
+    col3.metric("Avg Engagement Rate", f"{metrics['avg_eng_rate']:.2f}%")
+    col4.metric("High Performers", f"{metrics['high_performers']:,}")
+
+def show_streaming_overview(source, total_bytes=None, chunksize=250_000):
+    from components.streaming import stream_csv
+
+    px = _px()
+    st.subheader("🌊 Streaming Overview")
+    progress = st.progress(0.0, text="Reading first chunk...")
+    cards = st.empty()
+
+    aggregates, chunk_no = None, 0
+    chunks = stream_csv(source, chunksize=chunksize)
+    while True:
+        # The reader is lazy: each chunk is parsed and aggregated inside next()
+        with stage("streaming.chunk") as record:
+            chunk, aggregates = next(chunks, (None, aggregates))
+            record["rows"] = 0 if chunk is None else len(chunk)
+        if chunk is None:
+            break
+        chunk_no += 1
+        # Metrics refresh after every chunk; only the running totals stay in memory
+        show_metric_cards(aggregates.metrics(), container=cards.container())
+        done = min(source.tell() / total_bytes, 1.0) if total_bytes and hasattr(source, 'tell') else 0.0
+        progress.progress(done, text=f"Chunk {chunk_no} · {aggregates.rows:,} rows processed")
+
+    progress.progress(1.0, text=f"✅ Done · {aggregates.rows if aggregates else 0:,} rows")
+    if aggregates is None:
+        return None
 
-    col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Total Influencers", total_influencers)
-    col2.metric("Total Reach", f"{total_reach:,.0f}")
-    col3.metric("Avg Engagement Rate", f"{avg_engagement:.2f}%")
-    col4.metric("High Performers", high_performers)
+    col1, col2 = st.columns(2)
+    if not aggregates.segment_counts.empty:
+        seg_counts = aggregates.segment_counts.rename_axis('Segment').reset_index(name='Count')
+        col1.plotly_chart(
+            px.bar(seg_counts, x='Segment', y='Count', color='Segment', title="Segment Distribution"),
+            use_container_width=True
+        )
+    if not aggregates.offer_counts.empty:
+        offer_counts = aggregates.offer_counts.rename_axis('offer_type').reset_index(name='count')
+        col2.plotly_chart(
+            px.pie(offer_counts, names='offer_type', values='count', title="📊 Campaign Offer Distribution"),
+            use_container_width=True
+        )
+    return aggregates
 
-    st.markdown('</div>', unsafe_allow_html=True)
+def cube_filters(cube, key):
+    # Filters on cube dimensions are answered by slicing the cube, not the frame
+    col1, col2 = st.columns(2)
+    return cube.where({
+        'country': col1.multiselect("Filter by Country", cube.values('country'), key=f"{key}_country"),
+        'domain': col2.multiselect("Filter by Domain", cube.values('domain'), key=f"{key}_domain"),
+    })
 
 def show_segmentation(df):
-    st.subheader("🧹 Influencer Segmentation")
-    df['followers'] = pd.to_numeric(df['followers'], errors='coerce')
-    df['Segment'] = df['followers'].apply(segment_influencer)
-    seg_counts = df['Segment'].value_counts().reset_index()
-    seg_counts.columns = ['Segment', 'Count']
+    from components.features import ensure
+    from components.rollup import rollup_cube
 
-    st.plotly_chart(
-        px.bar(seg_counts, x='Segment', y='Count', color='Segment', title="Segment Distribution"),
-        use_container_width=True
-    )
+    px = _px()
+    st.subheader("🧹 Influencer Segmentation")
+    with stage("segmentation.cube", len(df)):
+        df = ensure(df, 'Segment')
+        cube = rollup_cube(df)
+
+    cube = cube_filters(cube, 'segmentation')
+    with stage("segmentation.counts"):
+        seg_counts = cube.segment_counts.rename_axis('Segment').reset_index(name='Count')
+
+    with stage("segmentation.plotly"):
+        st.plotly_chart(
+            px.bar(seg_counts, x='Segment', y='Count', color='Segment', title="Segment Distribution"),
+            use_container_width=True
+        )
 
 def show_offer_analysis(df):
+    from components.rollup import rollup_cube
+
+    px = _px()
     st.subheader("🎯 Offer Personalization")
 
     if 'offer_type' in df.columns:
-        cleaned = df[df['offer_type'].notna() & ~df['offer_type'].isin(['', 'N/A', 'unknown'])]
-        offer_counts = cleaned['offer_type'].value_counts().reset_index()
-        offer_counts.columns = ['offer_type', 'count']
+        with stage("offers.cube", len(df)):
+            cube = rollup_cube(df)
 
-        fig = px.pie(offer_counts, names='offer_type', values='count', title="📊 Campaign Offer Distribution")
-        st.plotly_chart(fig, use_container_width=True)
+        cube = cube_filters(cube, 'offers')
+        with stage("offers.value_counts"):
+            offer_counts = cube.offer_counts.rename_axis('offer_type').reset_index(name='count')
+
+        with stage("offers.plotly"):
+            fig = px.pie(offer_counts, names='offer_type', values='count', title="📊 Campaign Offer Distribution")
+            st.plotly_chart(fig, use_container_width=True)
 
 def show_discovery_filters(df):
+    from components.numeric_parser import parse_counts, parse_percent
+    from components.features import ensure
+    from components.filter_index import get_filter_index
+    from components.paginated_table import show_paginated_table
+    from components.report_export import download_report_builder
+
     st.subheader("🔍 Influencer Discovery Filters")
 
-    df['followers'] = pd.to_numeric(df['followers'], errors='coerce')
-    df['60_day_eng_rate'] = pd.to_numeric(df['60_day_eng_rate'], errors='coerce')
+    with stage("discovery.parse", len(df)):
+        df['followers'] = parse_counts(df['followers'])
+        df['60_day_eng_rate'] = parse_percent(df['60_day_eng_rate'])
+        df = ensure(df, 'Segment')
 
-    max_followers_val = df['followers'].max()
+    # Built once per dataset version; reruns only run the binary searches below
+    with stage("discovery.index", len(df)):
+        index = get_filter_index(df)
+
+    max_followers_val = index.bounds.get('followers', (0, float('nan')))[1]
     max_followers_val = int(max_followers_val) if pd.notna(max_followers_val) else 1_000_000
 
     col1, col2 = st.columns(2)
 
     with col1:
-        countries = df['country'].dropna().unique()
-        domains = df['domain'].dropna().unique()
-        country = st.multiselect("Filter by Country", sorted(countries))
-        domain = st.multiselect("Filter by Domain", sorted(domains))
+        country = st.multiselect("Filter by Country", index.options.get('country', []))
+        domain = st.multiselect("Filter by Domain", index.options.get('domain', []))
 
     with col2:
         min_followers, max_followers = st.slider("Follower Range", 0, max_followers_val, (0, max_followers_val))
         min_eng, max_eng = st.slider("Engagement Rate (%)", 0.0, 10.0, (0.0, 10.0))
 
-    mask = (
-        df['followers'].between(min_followers, max_followers, inclusive="both") &
-        df['60_day_eng_rate'].between(min_eng, max_eng, inclusive="both")
-    )
-    if country:
-        mask &= df['country'].isin(country)
-    if domain:
-        mask &= df['domain'].isin(domain)
-
-    filtered = df[mask]
-    if filtered.empty:
+    with stage("discovery.query") as record:
+        rows = index.query(
+            ranges={'followers': (min_followers, max_followers), '60_day_eng_rate': (min_eng, max_eng)},
+            members={'country': country, 'domain': domain}
+        )
+        record["rows"] = len(rows)
+
+    # Only the requested page is sliced out of the frame and sent to the browser
+    if len(rows) == 0:
         st.warning("No influencers found with selected filters.")
     else:
-        st.dataframe(filtered.reset_index(drop=True))
+        with stage("discovery.table", len(rows)):
+            show_paginated_table(df, rows, key='discovery')
+        with stage("discovery.export", len(rows)):
+            download_report_builder(df, rows, key='discovery_export')
 
 def show_score_ranking(df):
-    st.subheader("🏆 Influence & Brand Fit Scores")
+    from components.features import ensure
+    from components.scoring import WEIGHT_PRESETS, DEFAULT_PRESET, SCORE_FEATURES, add_scores, top_k
 
-    df['followers'] = pd.to_numeric(df['followers'], errors='coerce')
-    df['60_day_eng_rate'] = pd.to_numeric(df['60_day_eng_rate'], errors='coerce')
+    st.subheader("🏆 Influence & Brand Fit Scores")
 
     if 'channel_id' not in df.columns:
         st.error("Missing 'channel_id' in data.")
         return
-    if 'influence_score' not in df.columns:
-        df['influence_score'] = (df['followers'] * df['60_day_eng_rate']) / 10000
+    if 'followers' in df.columns:
+        df = ensure(df, 'Segment')
+
+    col1, col2, col3 = st.columns(3)
+    preset = col1.selectbox("Weight preset", list(WEIGHT_PRESETS), index=list(WEIGHT_PRESETS).index(DEFAULT_PRESET))
+    top_n = col2.number_input("Top N", min_value=1, max_value=1000, value=10, step=5)
+    group_options = ["All influencers"] + [col for col in ['Segment', 'domain', 'country'] if col in df.columns]
+    group_by = col3.selectbox("Rank within", group_options)
+
+    # Sliders are keyed by preset so picking a preset resets them to its weights
+    weight_cols = st.columns(len(SCORE_FEATURES))
+    weights = {
+        name: weight_cols[i].slider(name.title(), 0.0, 1.0, float(WEIGHT_PRESETS[preset][name]), 0.05, key=f"w_{preset}_{name}")
+        for i, name in enumerate(SCORE_FEATURES)
+    }
+
+    # Feature matrix is cached per dataset, so re-weighting is one matrix-vector product.
+    # Scored on a shallow copy so other views keep the registry's default-weight scores.
+    with stage("ranking.scores", len(df)):
+        df = add_scores(df.copy(deep=False), weights)
+        groups = df[group_by] if group_by in df.columns else None
+        rows = top_k(df['influence_score'].to_numpy(), int(top_n), groups)
+
+    display_cols = ['channel_id', group_by, 'followers', '60_day_eng_rate', 'influence_score', 'brand_fit_score']
+    available_cols = [col for col in dict.fromkeys(display_cols) if col in df.columns]
+    st.dataframe(df.iloc[rows][available_cols].reset_index(drop=True))
+
+def show_lookalikes(df):
+    from components.numeric_parser import parse_counts, parse_percent
+    from components.features import ensure
+    from components.filter_index import get_filter_index
+    from components.lookalike import NUMERIC_FEATURES, get_lookalike_index, similarity
+    from components.delta_merge import KEY_COLUMN, key_index, normalize_keys
+
+    st.subheader("🧬 Lookalike Influencers")
+
+    if KEY_COLUMN not in df.columns:
+        st.error("Missing 'channel_id' in data.")
+        return
+
+    with stage("lookalikes.features", len(df)):
+        df['followers'] = parse_counts(df['followers'])
+        df['60_day_eng_rate'] = parse_percent(df['60_day_eng_rate'])
+        df = ensure(df, 'Segment', 'engagement_quality')
+
+    col1, col2 = st.columns([3, 1])
+    channel = col1.text_input("Find influencers similar to (channel_id)")
+    k = int(col2.number_input("Results", min_value=1, max_value=500, value=20, step=5))
+
+    # Filters narrow the candidates before the search, so k matches are always returned when possible
+    with stage("lookalikes.filter_index", len(df)):
+        filters = get_filter_index(df)
+    col1, col2 = st.columns(2)
+    country = col1.multiselect("Only in Country", filters.options.get('country', []), key='lookalike_country')
+    domain = col2.multiselect("Only in Domain", filters.options.get('domain', []), key='lookalike_domain')
+
+    if not channel.strip():
+        st.info("Enter a channel_id to search for lookalikes.")
+        return
 
-    if 'brand_fit_score' not in df.columns:
-        df['brand_fit_score'] = (df['influence_score'] * 0.8).round(2)
+    position = key_index(df).lookup(normalize_keys([channel]).to_numpy(dtype=object))[0]
+    if position < 0:
+        st.warning(f"No influencer with channel_id '{channel.strip()}'.")
+        return
+
+    with stage("lookalikes.index", len(df)):
+        index = get_lookalike_index(df)
+
+    with stage("lookalikes.query") as record:
+        rows = filters.query(members={'country': country, 'domain': domain}) if country or domain else None
+        positions, distances = index.query(position, k, rows=rows)
+        record["rows"] = len(df) if rows is None else len(rows)
 
-    display_cols = ['channel_id', 'followers', '60_day_eng_rate', 'influence_score', 'brand_fit_score']
+    display_cols = [KEY_COLUMN, 'domain', 'country', 'Segment'] + NUMERIC_FEATURES
     available_cols = [col for col in display_cols if col in df.columns]
-    st.dataframe(df[available_cols].sort_values(by='influence_score', ascending=False).head(10))
+    st.caption("Query profile")
+    st.dataframe(df.iloc[[position]][available_cols].reset_index(drop=True))
+
+    if len(positions) == 0:
+        st.warning("No influencers found with selected filters.")
+        return
+    results = df.iloc[positions][available_cols].reset_index(drop=True)
+    results.insert(1, 'similarity', similarity(distances))
+    st.dataframe(results)
 
 def show_advanced_charts(df):
+    from components.numeric_parser import parse_counts, parse_percent
+    from components.features import ensure
+    from components.rollup import rollup_cube
+
+    px = _px()
     st.subheader("📊 Advanced Visual Analytics")
 
-    df['followers'] = pd.to_numeric(df['followers'], errors='coerce')
-    if 'Segment' not in df.columns:
-        df['Segment'] = df['followers'].apply(segment_influencer)
+    with stage("charts.features", len(df)):
+        df['avg_likes'] = parse_counts(df['avg_likes'])
+        df['60_day_eng_rate'] = parse_percent(df['60_day_eng_rate'])
+        df = ensure(df, 'Segment', 'influence_score')
 
     radar_df = df[['channel_id', '60_day_eng_rate', 'avg_likes', 'influence_score']].dropna().head(5)
     if not radar_df.empty:
         melted = radar_df.melt(id_vars='channel_id', var_name='Metric', value_name='value')
-        fig = px.line_polar(
-            melted,
-            r='value',
-            theta='Metric',
-            color='channel_id',
-            line_close=True,
-            title="📍 Influencer Profile Radar (Top 5 Normalized)"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        with stage("charts.radar_plotly"):
+            fig = px.line_polar(
+                melted,
+                r='value',
+                theta='Metric',
+                color='channel_id',
+                line_close=True,
+                title="📍 Influencer Profile Radar (Top 5 Normalized)"
+            )
+            st.plotly_chart(fig, use_container_width=True)
     else:
         st.warning("Not enough data for radar chart.")
 
     st.subheader("📊 Segment-wise Engagement vs Likes")
-    heatmap_df = df[['Segment', 'avg_likes', '60_day_eng_rate']].dropna()
-
-    if not heatmap_df.empty:
-        grouped = heatmap_df.groupby('Segment').agg(
-            avg_likes=('avg_likes', 'mean'),
-            avg_eng_rate=('60_day_eng_rate', 'mean')
-        ).reset_index()
-
-        fig = px.scatter(
-            grouped,
-            x='avg_likes',
-            y='avg_eng_rate',
-            color='Segment',
-            size='avg_eng_rate',
-            text='Segment',
-            title="Average Likes vs Engagement Rate per Segment"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    with stage("charts.cube", len(df)):
+        grouped = rollup_cube(df).summary('Segment').rename(
+            columns={'avg_likes_mean': 'avg_likes', '60_day_eng_rate_mean': 'avg_eng_rate'}
+        )[['Segment', 'avg_likes', 'avg_eng_rate']].dropna()
+
+    if not grouped.empty:
+
+        with stage("charts.scatter_plotly"):
+            fig = px.scatter(
+                grouped,
+                x='avg_likes',
+                y='avg_eng_rate',
+                color='Segment',
+                size='avg_eng_rate',
+                text='Segment',
+                title="Average Likes vs Engagement Rate per Segment"
+            )
+            st.plotly_chart(fig, use_container_width=True)
     else:
         st.warning("Not enough data for segment-wise chart.")
@@ -2,8 +2,12 @@
 
 import streamlit as st
 import plotly.express as px
-from components.llm_brand_suitability import build_influencer_context, get_brand_suitability
-import pandas as pd
+from components.features import ensure
+from components.llm_brand_suitability import build_influencer_context, analyze_many, is_available
+from components.llm_cache import get_cache
+from components.numeric_parser import parse_percent
+from components.rollup import rollup_cube
+from components.scoring import top_k
 
 st.header("🎯 Offer Personalization")
 
@@ -19,18 +23,41 @@ target_audience = st.session_state.get('target_audience', 'Young adults')
 run_llm = st.session_state.get('run_suitability', False)
 
 # 👉 Suitability Analysis (LLM)
-if run_llm:
+if run_llm and not is_available():
+    st.info("🔒 Gemini is disabled. Set `GEMINI_API_KEY` to enable brand-suitability insights.")
+elif run_llm:
     st.subheader("📋 Brand Suitability Insights (LLM-Powered)")
-    top_influencers = df.sort_values(by='influence_score', ascending=False).head(5)
 
-    for i, row in top_influencers.iterrows():
-        profile_text = build_influencer_context(row)
-        with st.spinner(f"Analyzing @{row.get('channel_id', f'user_{i+1}')}..."):
-            suitability = get_brand_suitability(profile_text, target_domain, target_audience)
-
-        st.markdown(f"### 🧑‍💼 @{row.get('channel_id', f'user_{i+1}')}")
+    col1, col2, col3 = st.columns(3)
+    shortlist_size = col1.slider("Shortlist size", 5, 200, 5, step=5)
+    max_workers = col2.slider("Parallel requests", 1, 16, 4)
+    requests_per_minute = col3.number_input("Rate limit (requests/min)", 1, 1000, 60)
+    force_refresh = st.checkbox("🔄 Force refresh (ignore cached answers)")
+
+    # Session frames carry influence_score only once the feature registry has computed it
+    scored = ensure(df, 'influence_score')
+    top_influencers = scored.iloc[top_k(scored['influence_score'].to_numpy(), shortlist_size)]
+    rows = {
+        f"{row.get('channel_id', f'user_{n + 1}')}#{n}": row
+        for n, (_, row) in enumerate(top_influencers.iterrows())
+    }
+    contexts = {key: build_influencer_context(row) for key, row in rows.items()}
+
+    # Results render as each request completes instead of after the whole batch
+    progress = st.progress(0.0, text=f"Analyzing {len(contexts)} influencers...")
+    for done, (key, suitability, ok) in enumerate(
+        analyze_many(contexts, target_domain, target_audience, max_workers=max_workers,
+                     requests_per_minute=requests_per_minute, force_refresh=force_refresh),
+        start=1
+    ):
+        row = rows[key]
+        progress.progress(done / len(contexts), text=f"{done}/{len(contexts)} analyzed")
+        st.markdown(f"### 🧑‍💼 @{key.rsplit('#', 1)[0]}")
         st.write(f"**Domain**: {row['domain']} | **Followers**: {row['followers']} | **Offer Type**: {row['offer_type']}")
-        st.info(suitability)
+        (st.info if ok else st.error)(suitability)
+
+    stats = get_cache().stats()
+    st.caption(f"💾 LLM cache: {stats['hits']} hits / {stats['misses']} misses · {stats['entries']} stored answers")
 
 # ------------------------
 # 📊 Offer Analytics Section
@@ -40,48 +67,51 @@ if "offer_type" not in df.columns:
     st.error("❌ Dataset must include an 'offer_type' column.")
     st.stop()
 
+# 🧊 Offer analytics are read from the dataset's rollup cube
+df = df.copy(deep=False)
+if "60_day_eng_rate" in df.columns:
+    df['60_day_eng_rate'] = parse_percent(df['60_day_eng_rate'])
+# Segment is binned from followers by the cube itself
+cube = rollup_cube(df)
+
 # Clean offer_type
-df = df[df['offer_type'].notna()]
-df = df[~df['offer_type'].isin(['', 'N/A', 'unknown', '?'])]
+by_offer = cube.summary('offer_type')
+by_offer = by_offer[~by_offer['offer_type'].isin(['', 'N/A', 'unknown', '?'])]
 
-if df['offer_type'].nunique() == 0:
+if by_offer.empty:
     st.warning("⚠️ No valid 'offer_type' entries found in the dataset.")
 else:
     st.subheader("📊 Campaign Offer Distribution")
 
-    offer_counts = df['offer_type'].value_counts().reset_index()
-    offer_counts.columns = ['offer_type', 'count']
+    offer_counts = by_offer[['offer_type', 'count']].sort_values('count', ascending=False)
+    offer_counts = offer_counts[offer_counts['count'] > 0]
 
     fig = px.pie(offer_counts, names='offer_type', values='count', title="Offer Types in the Campaign")
     st.plotly_chart(fig, use_container_width=True)
 
     # Avg Engagement Rate by Offer Type
     if "60_day_eng_rate" in df.columns:
-        try:
-            df['60_day_eng_rate'] = df['60_day_eng_rate'].astype(str).str.rstrip('%').astype(float)
-
-            engagement_avg = (
-                df.groupby('offer_type')['60_day_eng_rate']
-                .mean()
-                .reset_index()
-                .sort_values(by='60_day_eng_rate', ascending=False)
-            )
-
-            st.subheader("📈 Average Engagement Rate by Offer Type")
-            fig2 = px.bar(
-                engagement_avg,
-                x='offer_type',
-                y='60_day_eng_rate',
-                color='offer_type',
-                title="Avg. Engagement Rate (%) per Offer Type"
-            )
-            st.plotly_chart(fig2, use_container_width=True)
-        except Exception as e:
-            st.warning(f"Could not process engagement rate data: {e}")
+        engagement_avg = (
+            by_offer[['offer_type', '60_day_eng_rate_mean']]
+            .dropna()
+            .rename(columns={'60_day_eng_rate_mean': '60_day_eng_rate'})
+            .sort_values(by='60_day_eng_rate', ascending=False)
+        )
+
+        st.subheader("📈 Average Engagement Rate by Offer Type")
+        fig2 = px.bar(
+            engagement_avg,
+            x='offer_type',
+            y='60_day_eng_rate',
+            color='offer_type',
+            title="Avg. Engagement Rate (%) per Offer Type"
+        )
+        st.plotly_chart(fig2, use_container_width=True)
 
     # Segment breakdown
-    if 'Segment' in df.columns:
-        segment_offer = df.groupby(['Segment', 'offer_type']).size().reset_index(name='count')
+    if 'followers' in df.columns:
+        segment_offer = cube.summary('Segment', 'offer_type')[['Segment', 'offer_type', 'count']]
+        segment_offer = segment_offer[segment_offer['offer_type'].isin(by_offer['offer_type'])]
         st.subheader("📊 Offer Type Distribution by Segment")
         fig3 = px.bar(
             segment_offer,
@@ -0,0 +1,111 @@
+# tests/test_batch_scoring.py
+
+import json
+import os
+
+import pandas as pd
+import pytest
+from benchmarks.synthetic_data import write_csv
+from components import batch_scoring
+from components.batch_scoring import EXIT_FAILED, EXIT_OK, EXIT_SCHEMA, check_schema, main, plan_partitions, run_batch
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    return [write_csv(str(tmp_path / "in" / f"part{i}.csv"), rows, seed=i) for i, rows in enumerate([300, 200])]
+
+
+def quiet(*args):
+    pass
+
+
+# ---------------------- PLANNING ----------------------
+
+@pytest.mark.parametrize('partition_bytes', [1, 100, 4096, None])
+def test_partitions_cover_the_body_on_line_boundaries(inputs, partition_bytes):
+    path = inputs[0]
+    with open(path, 'rb') as f:
+        data = f.read()
+    header_end = data.index(b"\n") + 1
+
+    ranges = [(start, end) for p, start, end in plan_partitions([path], partition_bytes) if p == path]
+    assert ranges[0][0] == header_end and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start and data[end - 1:end] == b"\n"
+    assert b"".join(data[start:end] for start, end in ranges) == data[header_end:]
+    if partition_bytes is None:
+        assert len(ranges) == 1
+
+
+def test_header_only_file_gets_one_empty_partition(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text("channel_id,followers,avg_likes\n")
+    size = path.stat().st_size
+    assert plan_partitions([str(path)], 10) == [(str(path), size, size)]
+
+
+def test_check_schema_reports_unreadable_and_incomplete_files(inputs, tmp_path):
+    missing = tmp_path / "missing.csv"
+    missing.write_text("channel_id,followers\n@a,10\n")
+    empty = tmp_path / "empty.csv"
+    empty.write_text("")
+
+    problems = check_schema(inputs + [str(missing), str(empty)])
+    # Inputs use channel_info, which COLUMN_MAP accepts for channel_id
+    assert set(problems) == {str(missing), str(empty)}
+    assert "avg_likes" in problems[str(missing)]
+
+
+def test_main_exits_with_schema_code(tmp_path, capsys):
+    bad = tmp_path / "bad.csv"
+    bad.write_text("name,reach\nx,1\n")
+    assert main([str(bad), '--out', str(tmp_path / "out")]) == EXIT_SCHEMA
+    assert main([str(tmp_path / "nothing" / "*.csv"), '--out', str(tmp_path / "out")]) == EXIT_SCHEMA
+    assert "Required columns" in capsys.readouterr().err
+
+
+# ---------------------- PIPELINE ----------------------
+
+def test_run_batch_scores_every_row(inputs, tmp_path):
+    out = str(tmp_path / "out")
+    summary = run_batch(inputs, out, max_workers=1, snapshot='nightly', snapshot_root=str(tmp_path / "snaps"), log=quiet)
+
+    assert summary['errors'] == [] and summary['rows'] == 500
+    parts = pd.concat([pd.read_parquet(path) for path in summary['outputs']], ignore_index=True)
+    assert len(parts) == 500
+    assert parts['influence_score'].between(0, 100).all() and parts['brand_fit_score'].notna().all()
+    assert sorted(parts['source_file'].unique()) == sorted(inputs)
+    # Rows with unknown followers have no segment
+    assert sum(summary['segments'].values()) == parts['followers'].notna().sum()
+    assert summary['snapshot'] and os.path.exists(summary['snapshot'])
+    with open(os.path.join(out, '_metrics.json')) as f:
+        assert json.load(f)['rows'] == 500
+    assert not os.path.exists(os.path.join(out, '.staging'))
+
+
+def test_failed_partition_is_reported_and_skips_the_snapshot(inputs, tmp_path, monkeypatch, capsys):
+    derive = batch_scoring._derive_partition
+
+    def flaky(task):
+        if task[0] == 1:
+            raise ValueError("corrupt range")
+        return derive(task)
+
+    monkeypatch.setattr(batch_scoring, '_derive_partition', flaky)
+    out = tmp_path / "out"
+    argv = [*inputs, '--out', str(out), '--workers', '1', '--snapshot', 'nightly', '--snapshot-dir', str(tmp_path / "snaps")]
+    assert main(argv) == EXIT_FAILED
+
+    summary = json.loads((out / "_metrics.json").read_text())
+    assert [e['file'] for e in summary['errors']] == [inputs[1]]
+    assert "corrupt range" in capsys.readouterr().err
+    assert summary['rows'] == 300 and summary['snapshot'] is None
+
+
+def test_main_with_worker_processes(inputs, tmp_path):
+    # Spawned workers import the pipeline from components.batch_scoring, as in production
+    out = tmp_path / "out"
+    assert main([*inputs, '--out', str(out), '--workers', '2', '--format', 'csv']) == EXIT_OK
+    summary = json.loads((out / "_metrics.json").read_text())
+    assert summary['workers'] == 2 and summary['rows'] == 500
+    assert sum(len(pd.read_csv(path)) for path in summary['outputs']) == 500
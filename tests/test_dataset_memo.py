@@ -0,0 +1,51 @@
+# tests/test_dataset_memo.py
+
+import pandas as pd
+import pytest
+from components import dataset_memo
+
+
+@pytest.fixture(autouse=True)
+def empty_memo():
+    dataset_memo.clear()
+    yield
+    dataset_memo.clear()
+
+
+def frame(n=200):
+    df = pd.DataFrame({'followers': range(n)})
+    df.attrs['dataset_version'] = 'v-test'
+    return df
+
+
+def build_sum(df):
+    return int(df['followers'].sum() + df['followers'].iloc[0])
+
+
+def test_shallow_copy_with_helper_columns_reuses_entry():
+    df = frame()
+    calls = []
+    dataset_memo.memoize(df, 'total', lambda d: calls.append(1) or build_sum(d))
+    view = df.copy(deep=False)
+    view['helper'] = 1
+    dataset_memo.memoize(view, 'total', lambda d: calls.append(1) or build_sum(d))
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize('derive', [
+    lambda df: df.iloc[::-1],
+    lambda df: df.sample(frac=1, random_state=0),
+    lambda df: df.iloc[1:],
+])
+def test_derived_rows_get_their_own_entry(derive):
+    df = frame()
+    full = dataset_memo.memoize(df, 'total', build_sum)
+    derived = derive(df)
+    assert derived.attrs['dataset_version'] == 'v-test'
+    assert dataset_memo.memoize(derived, 'total', build_sum) == build_sum(derived) != full
+
+
+def test_store_seeds_the_entry_memoize_reads():
+    df = frame().iloc[::2]
+    dataset_memo.store(df, 'total', 'seeded')
+    assert dataset_memo.memoize(df, 'total', build_sum) == 'seeded'
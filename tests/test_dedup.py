@@ -0,0 +1,110 @@
+# tests/test_dedup.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from components import dataset_memo
+from components.dedup import (
+    DuplicateReport, assign_clusters, candidate_pairs, canonical_handles, connected_components, deduplicate,
+    trigram_similarity
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_memo():
+    dataset_memo.clear()
+    yield
+    dataset_memo.clear()
+
+
+@pytest.fixture
+def roster():
+    df = pd.DataFrame({
+        'channel_id': ['@Riley.Brown.Fitness', 'Riley Brown Fitness', 'rileybrownfitness_', '@rileybrownfitnesss',
+                       'jordan_lee', 'riley2fit', 'riley3fit', None, '@x'],
+        'followers': [1000.0, 5000.0, np.nan, 200.0, 300.0, 10.0, 20.0, 50.0, 60.0],
+    })
+    df.attrs['dataset_version'] = 'roster-v1'
+    return df
+
+
+def reference_similarity(a, b, max_length=32):
+    def grams(h):
+        padded = f"  {h[:max_length]} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    ga, gb = grams(a), grams(b)
+    return len(ga & gb) / len(ga | gb)
+
+
+def test_canonical_handles():
+    handles = canonical_handles(['@Riley.Brown', 'Riley Brown', 'rileybrown_', 'Café-Ünï', '', None])
+    assert handles.iloc[:5].tolist() == ['rileybrown', 'rileybrown', 'rileybrown', 'caféünï', '']
+    assert pd.isna(handles.iloc[5])
+
+
+def test_trigram_similarity_matches_set_jaccard():
+    rng = np.random.default_rng(5)
+    alphabet = list("abcdeé日") + ["1"]
+    left = ["".join(rng.choice(alphabet, rng.integers(1, 40))) for _ in range(300)]
+    right = [h[:-1] + "z" if i % 3 else h for i, h in enumerate(left)]
+    expected = [reference_similarity(a, b) for a, b in zip(left, right)]
+    # Object arrays: fixed-width str arrays are taken to be _padded() output already
+    scores = trigram_similarity(np.array(left, dtype=object), np.array(right, dtype=object), chunk_size=64)
+    np.testing.assert_allclose(scores, expected)
+
+
+def test_candidate_pairs_skip_digit_and_length_mismatches():
+    handles = np.array(['rileybrown', 'rileybrownn', 'riley2fit', 'riley3fit', 'abc', 'abcd', 'zzzzzzzzzzzzzzzzzzzz'],
+                       dtype=object)
+    pairs = candidate_pairs(handles, threshold=0.7)
+    assert list(zip(pairs['left'], pairs['right'])) == [(0, 1)]
+    assert pairs['score'].iloc[0] == pytest.approx(reference_similarity('rileybrown', 'rileybrownn'))
+
+
+def test_connected_components_match_union_find():
+    rng = np.random.default_rng(9)
+    n = 500
+    left, right = rng.integers(0, n, 300), rng.integers(0, n, 300)
+
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            x = parent[x]
+        return x
+
+    for a, b in zip(left, right):
+        ra, rb = find(a), find(b)
+        parent[max(ra, rb)] = min(ra, rb)
+    expected = [min(i for i in range(n) if find(i) == find(j)) for j in range(n)]
+
+    assert connected_components(n, left, right).tolist() == expected
+
+
+def test_clusters_tag_every_row_and_pick_the_largest_account(roster):
+    report = DuplicateReport(roster)
+    assert report.exact_duplicates == 2
+    tagged = assign_clusters(roster, report)
+
+    riley = tagged['cluster_id'].iloc[:4]
+    assert riley.nunique() == 1 and (tagged['cluster_size'].iloc[:4] == 4).all()
+    assert tagged['cluster_primary'].iloc[:4].tolist() == [False, True, False, False]
+    # Different digits, no usable handle and a too-short handle all stay on their own
+    assert tagged['cluster_id'].iloc[4:].nunique() == 5 and (tagged['cluster_size'].iloc[4:] == 1).all()
+    assert tagged.attrs['dataset_version'].startswith('roster-v1+dedup:')
+
+
+def test_rejected_pairs_are_not_merged(roster):
+    report = DuplicateReport(roster)
+    pair = report.review_table()['pair'].iloc[0]
+    tagged = assign_clusters(roster, report, rejected=[pair])
+    assert tagged['cluster_id'].iloc[:3].nunique() == 1
+    assert tagged['cluster_id'].iloc[3] != tagged['cluster_id'].iloc[0]
+
+
+def test_collapse_keeps_one_row_per_creator(roster):
+    collapsed = deduplicate(roster)
+    assert len(collapsed) == len(roster) - 3
+    assert collapsed['channel_id'].tolist()[0] == 'Riley Brown Fitness'
+    assert deduplicate(roster) is collapsed
+    assert deduplicate(roster, collapse=False) is not collapsed
@@ -0,0 +1,100 @@
+# tests/test_delta_merge.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic_data import generate_frame
+from components import dataset_memo
+from components.delta_merge import KeyIndex, key_index, upsert, upsert_csv
+from components.features import ensure
+from components.ingest import prepare_frame
+from components.rollup import RollupCube, rollup_cube
+
+
+@pytest.fixture(autouse=True)
+def empty_memo():
+    dataset_memo.clear()
+    yield
+    dataset_memo.clear()
+
+
+@pytest.fixture
+def roster():
+    df = prepare_frame(generate_frame(200, seed=3))
+    df.attrs['dataset_version'] = 'roster-v1'
+    return ensure(df, 'Segment', 'engagement_quality', 'influence_score')
+
+
+def delta_for(roster):
+    first, second = roster['channel_id'].iloc[0], roster['channel_id'].iloc[1]
+    return pd.DataFrame({
+        # Same creators spelled differently; the second appears twice and the last row wins
+        'channel_info': [f" {first.upper()} ", second.lstrip('@'), second, '@brand_new'],
+        'followers': ["2.5M", "10", "12k", "40k"],
+        'avg_likes': ["50k", "1", "600", "2,000"],
+        '60_day_eng_rate': ["2%", "1%", "5%", "5%"],
+        'country': ['France', 'Spain', 'Spain', 'Japan'],
+    })
+
+
+def assert_same_cube(seeded, rebuilt):
+    assert seeded.metrics() == pytest.approx(rebuilt.metrics())
+    pd.testing.assert_series_equal(seeded.segment_counts, rebuilt.segment_counts)
+    pd.testing.assert_series_equal(seeded.offer_counts.sort_index(), rebuilt.offer_counts.sort_index())
+
+
+def test_upsert_updates_and_inserts_by_normalized_key(roster):
+    before = roster.iloc[:2].copy()
+    merged, summary = upsert(roster, delta_for(roster), delta_id='d1')
+
+    assert summary == {'updated': 2, 'inserted': 1, 'duplicates_dropped': 1}
+    assert len(merged) == len(roster) + 1
+    # Existing rows keep their spelling and position; values come from the delta
+    assert merged['channel_id'].iloc[:2].tolist() == before['channel_id'].tolist()
+    assert merged['followers'].iloc[:2].tolist() == [2_500_000, 12_000]
+    assert merged['country'].iloc[:2].tolist() == ['France', 'Spain']
+    assert merged.iloc[-1][['channel_id', 'followers']].tolist() == ['@brand_new', 40_000]
+    # Untouched rows are unchanged
+    pd.testing.assert_frame_equal(merged.iloc[2:len(roster)].drop(columns='influence_score', errors='ignore'),
+                                  roster.iloc[2:].drop(columns='influence_score'), check_dtype=False)
+    assert merged.attrs['dataset_version'] == 'roster-v1+delta:d1'
+
+
+def test_rowwise_features_follow_the_delta_and_dataset_wide_ones_are_recomputed(roster):
+    merged, _ = upsert(roster, delta_for(roster), delta_id='d1')
+
+    assert merged['Segment'].iloc[0] == 'Mega' and merged['Segment'].iloc[-1] == 'Micro'
+    assert merged['engagement_quality'].iloc[0] == pytest.approx(50_000 / 2_500_000)
+    assert 'influence_score' not in merged.columns
+    rescored = ensure(merged.copy(deep=False), 'influence_score')['influence_score']
+    # A frame without a dataset version is never memoized, so this is computed from scratch
+    fresh = merged.drop(columns=['Segment', 'engagement_quality'])
+    fresh.attrs = {}
+    assert np.allclose(rescored, ensure(fresh, 'influence_score')['influence_score'])
+
+
+def test_seeded_cube_and_key_index_match_a_rebuild(roster):
+    rollup_cube(roster)
+    merged, _ = upsert(roster, delta_for(roster), delta_id='d1')
+    again, _ = upsert(merged, pd.DataFrame({'channel_id': ['@BRAND_NEW', '@another'], 'followers': ['1M', '5']}), delta_id='d2')
+
+    for frame in (merged, again):
+        assert_same_cube(rollup_cube(frame), RollupCube().update(frame))
+        keys = pd.Series(frame['channel_id']).str.lower().str.lstrip('@').to_numpy(dtype=object)
+        assert (key_index(frame).lookup(keys) == KeyIndex.build(frame).lookup(keys)).all()
+    assert again['followers'].iloc[len(roster)] == 1_000_000 and len(again) == len(roster) + 2
+
+
+def test_delta_without_key_column_is_rejected(roster):
+    with pytest.raises(ValueError, match="channel_id"):
+        upsert(roster, pd.DataFrame({'followers': ['1k']}))
+
+
+def test_csv_upserts_are_versioned_by_content(roster):
+    data = delta_for(roster).to_csv(index=False).encode()
+    first, _ = upsert_csv(roster, data)
+    second, _ = upsert_csv(roster, data)
+    other, _ = upsert_csv(roster, data.replace(b"France", b"Italy"))
+
+    assert first.attrs['dataset_version'] == second.attrs['dataset_version'] != other.attrs['dataset_version']
+    assert first.attrs['dataset_version'].startswith('roster-v1+delta:')
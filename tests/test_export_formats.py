@@ -0,0 +1,75 @@
+# tests/test_export_formats.py
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from components import export_formats
+from components.export_formats import export_to_tempfile, write_export
+
+FRAME = pd.DataFrame({
+    'a': [1, 2, 3],
+    'b': ['x', 'y', None],
+    'c': [1.5, np.nan, 3.25],
+})
+
+
+def _read_back(path, fmt):
+    if fmt == 'parquet':
+        return pd.read_parquet(path)
+    if fmt == 'xlsx':
+        return pd.read_excel(path)
+    return pd.read_csv(path)
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'csv.gz', 'parquet', 'xlsx'])
+@pytest.mark.parametrize('chunk_rows', [1, 2, 100])
+def test_round_trip(tmp_path, fmt, chunk_rows):
+    path = tmp_path / f"export.{fmt}"
+    assert write_export(FRAME, str(path), fmt, chunk_rows=chunk_rows) == len(FRAME)
+
+    back = _read_back(path, fmt)
+    assert list(back.columns) == list(FRAME.columns)
+    assert back['a'].tolist() == [1, 2, 3]
+    assert back['b'].iloc[:2].tolist() == ['x', 'y'] and pd.isna(back['b'].iloc[2])
+    assert back['c'].iloc[[0, 2]].tolist() == [1.5, 3.25] and pd.isna(back['c'].iloc[1])
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet', 'xlsx'])
+def test_rows_and_columns_subset(tmp_path, fmt):
+    path = tmp_path / f"subset.{fmt}"
+    assert write_export(FRAME, str(path), fmt, rows=[2, 0], columns=['c', 'a']) == 2
+
+    back = _read_back(path, fmt)
+    assert list(back.columns) == ['c', 'a']
+    assert back['a'].tolist() == [3, 1]
+
+
+def test_xlsx_writes_infinite_values_as_blank_cells(tmp_path):
+    frame = pd.DataFrame({'ratio': [1.0, np.inf, -np.inf], 'name': ['a', 'b', 'c']})
+    path = tmp_path / "inf.xlsx"
+    assert write_export(frame, str(path), 'xlsx') == 3
+
+    back = pd.read_excel(path)
+    assert back['ratio'].iloc[0] == 1.0 and back['ratio'].iloc[1:].isna().all()
+    assert back['name'].tolist() == ['a', 'b', 'c']
+
+
+def test_tempfile_exports_sweep_stale_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_formats, 'EXPORT_DIR', str(tmp_path))
+    stale, _ = export_to_tempfile(FRAME, 'csv')
+    old = time.time() - export_formats.EXPORT_MAX_AGE_SECONDS - 1
+    os.utime(stale, (old, old))
+
+    fresh, written = export_to_tempfile(FRAME, 'csv')
+    assert written == len(FRAME) and os.path.exists(fresh)
+    assert not os.path.exists(stale)
+
+
+def test_failed_tempfile_export_leaves_no_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_formats, 'EXPORT_DIR', str(tmp_path))
+    with pytest.raises(KeyError):
+        export_to_tempfile(FRAME, 'csv', columns=['missing'])
+    assert os.listdir(tmp_path) == []
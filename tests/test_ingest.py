@@ -0,0 +1,126 @@
+# tests/test_ingest.py
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+from components import ingest
+from components.compaction import memory_footprint
+from components.ingest import IngestCache, expand_sources, load_uploaded_many, resolve_local_path
+
+CSV = b"channel_info,followers,avg_likes,60_day_eng_rate,country\n" + b"".join(
+    f'@creator{i},"{1000 + i:,}",{i},{i % 9}.5%,Country name {i % 7}\n'.encode() for i in range(500)
+)
+
+
+def test_concurrent_requests_for_one_key_build_once():
+    cache = IngestCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        time.sleep(0.1)
+        return pd.DataFrame({'a': range(10)})
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_build('k', build))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert sorted(hit for _, hit in results) == [False] + [True] * 7
+    assert cache.stats()['hits'] == 7 and cache.stats()['misses'] == 1
+
+
+def test_size_counts_string_contents():
+    cache = IngestCache()
+    notes = pd.Series([f"free-text note number {i} " * 4 for i in range(500)], dtype=object)
+    df, hit = cache.get_or_build('k', lambda: pd.DataFrame({'notes': notes}))
+    assert not hit and df['notes'].dtype == object
+    # Deep size: the Python string payloads, not just the pointer array
+    assert cache.nbytes == memory_footprint(df) == cache.stats()['bytes']
+    assert cache.nbytes > 10 * int(df.memory_usage(deep=False).sum())
+
+
+def test_evicts_least_recent_entries_over_the_byte_budget():
+    cache = IngestCache(max_entries=10)
+    first, _ = cache.get_or_load(CSV)
+    cache.max_bytes = int(cache.nbytes * 1.5)
+    cache.get_or_load(CSV + b"@extra,1,1,1%,X\n")
+
+    assert cache.stats()['entries'] == 1
+    _, hit = cache.get_or_load(CSV)
+    assert not hit
+
+
+class Upload:
+    # The parts of Streamlit's UploadedFile that ingest reads
+    def __init__(self, name, data):
+        self.name = name
+        self._data = data
+
+    def getvalue(self):
+        return self._data
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    cache = IngestCache()
+    monkeypatch.setattr(ingest, '_CACHE', cache)
+    return cache
+
+
+def test_uploads_sharing_a_name_are_both_loaded(fresh_cache):
+    other = CSV.replace(b"@creator", b"@other")
+    df, _ = load_uploaded_many([Upload('roster.csv', CSV), Upload('roster.csv', other)], max_workers=1)
+
+    assert len(df) == 1000
+    assert df['source_file'].value_counts().to_dict() == {'roster.csv': 500, 'roster.csv (2)': 500}
+
+
+def test_partial_failures_are_reported(fresh_cache):
+    df, _ = load_uploaded_many([Upload('good.csv', CSV), Upload('bad.csv', b"")], max_workers=1)
+
+    assert len(df) == 500
+    assert [e['file'] for e in df.attrs['ingest_errors']] == ['bad.csv']
+
+
+def test_batch_where_every_file_fails_raises_and_is_not_cached(fresh_cache):
+    uploads = [Upload('a.csv', b""), Upload('b.csv', b"")]
+    with pytest.raises(ValueError, match="None of the 2 files"):
+        load_uploaded_many(uploads, max_workers=1)
+    assert fresh_cache.stats()['entries'] == 0
+
+
+@pytest.fixture
+def data_tree(tmp_path):
+    root = tmp_path / "data"
+    (root / "exports").mkdir(parents=True)
+    (root / "exports" / "a.csv").write_bytes(CSV)
+    (root / "exports" / "b.csv").write_bytes(CSV)
+    (tmp_path / "secret.csv").write_bytes(CSV)
+    (root / "exports" / "link.csv").symlink_to(tmp_path / "secret.csv")
+    return str(root), tmp_path
+
+
+def test_sources_resolve_inside_the_data_root(data_tree):
+    root, _ = data_tree
+    assert [p.rsplit('/', 1)[1] for p in expand_sources("exports", root)] == ['a.csv', 'b.csv']
+    assert len(expand_sources("**/*.csv", root)) == 2
+
+
+@pytest.mark.parametrize('pattern', ["../*.csv", "exports/../../secret.csv", "{outside}/secret.csv"])
+def test_sources_outside_the_data_root_are_dropped(data_tree, pattern):
+    root, outside = data_tree
+    assert expand_sources(pattern.format(outside=outside), root) == []
+
+
+def test_local_path_outside_the_data_root_is_rejected(data_tree):
+    root, outside = data_tree
+    assert resolve_local_path("exports/a.csv", root).endswith("exports/a.csv")
+    for path in ["../secret.csv", str(outside / "secret.csv"), "exports/link.csv"]:
+        with pytest.raises(ValueError):
+            resolve_local_path(path, root)
@@ -0,0 +1,109 @@
+# tests/test_llm_brand_suitability.py
+
+import threading
+import time
+
+import pytest
+from components import llm_brand_suitability as llm
+from components.llm_cache import LLMResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setattr(llm, "get_cache", lambda: cache)
+    return cache
+
+
+class FakeGenerate:
+    """Stand-in for _generate that records prompts and fails the first `failures` calls."""
+
+    def __init__(self, failures=0, error=TimeoutError, delay=0.0):
+        self.failures = failures
+        self.error = error
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt, model_name, timeout=None, generation_config=None):
+        with self._lock:
+            self.calls.append((prompt, model_name, timeout))
+            failing = len(self.calls) <= self.failures
+        if self.delay:
+            time.sleep(self.delay)
+        if failing:
+            raise self.error("boom")
+        return f"analysis of {prompt.split('@', 1)[1].split()[0]}"
+
+
+def test_token_bucket_spaces_requests_after_the_burst():
+    bucket = llm.TokenBucket(rate=20, capacity=2)
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    # Two tokens up front, then one every 1/20 s
+    assert time.monotonic() - start >= 0.09
+
+
+def call(fake, retries):
+    return llm.call_with_retry(lambda: fake("@a", "m", 5), retries=retries, base_delay=0)
+
+
+def test_call_with_retry_retries_retryable_errors():
+    fake = FakeGenerate(failures=2)
+    assert call(fake, retries=3) == "analysis of a"
+    assert len(fake.calls) == 3
+
+
+def test_call_with_retry_gives_up_after_retries():
+    fake = FakeGenerate(failures=10)
+    with pytest.raises(TimeoutError):
+        call(fake, retries=2)
+    assert len(fake.calls) == 3
+
+
+def test_call_with_retry_does_not_retry_other_errors():
+    fake = FakeGenerate(failures=1, error=ValueError)
+    with pytest.raises(ValueError):
+        call(fake, retries=3)
+    assert len(fake.calls) == 1
+
+
+def test_analyze_many_yields_every_key_and_caches(cache, monkeypatch):
+    fake = FakeGenerate()
+    monkeypatch.setattr(llm, "_generate", fake)
+    contexts = {i: llm.build_influencer_context({"channel_id": f"user{i}"}) for i in range(6)}
+
+    first = {key: (text, ok) for key, text, ok in llm.analyze_many(contexts, "tech", "gamers", max_workers=3,
+                                                                       requests_per_minute=6000, timeout=7)}
+    assert first == {i: (f"analysis of user{i}", True) for i in range(6)}
+    assert len(fake.calls) == 6 and all(timeout == 7 for _, _, timeout in fake.calls)
+
+    # Second run is answered from the cache
+    second = dict((key, text) for key, text, _ in llm.analyze_many(contexts, "tech", "gamers"))
+    assert second == {i: f"analysis of user{i}" for i in range(6)}
+    assert len(fake.calls) == 6
+
+
+def test_analyze_many_reports_failures_without_caching(cache, monkeypatch):
+    monkeypatch.setattr(llm, "_generate", FakeGenerate(failures=100, error=ValueError))
+    contexts = {"a": llm.build_influencer_context({"channel_id": "a"})}
+
+    (key, text, ok), = llm.analyze_many(contexts, "tech", "gamers", requests_per_minute=6000)
+    assert key == "a" and not ok and text.startswith("❌ Gemini Error")
+    assert cache.stats()["entries"] == 0
+
+
+def test_closing_analyze_many_drops_queued_prompts(cache, monkeypatch):
+    fake = FakeGenerate(delay=0.2)
+    monkeypatch.setattr(llm, "_generate", fake)
+    contexts = {i: llm.build_influencer_context({"channel_id": f"user{i}"}) for i in range(10)}
+
+    results = llm.analyze_many(contexts, "tech", "gamers", max_workers=1, requests_per_minute=6000)
+    next(results)
+    start = time.monotonic()
+    results.close()
+    # close() neither waits for nor starts the prompts still queued
+    assert time.monotonic() - start < 0.15
+    time.sleep(0.3)
+    assert len(fake.calls) <= 2
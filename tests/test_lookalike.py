@@ -0,0 +1,83 @@
+# tests/test_lookalike.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from components.lookalike import LookalikeIndex, similarity
+
+
+@pytest.fixture(scope='module')
+def roster():
+    rng = np.random.default_rng(11)
+    n = 3000
+    followers = rng.lognormal(10, 2, n)
+    likes = followers * rng.uniform(0.005, 0.08, n)
+    df = pd.DataFrame({
+        'followers': followers,
+        'avg_likes': likes,
+        '60_day_eng_rate': rng.gamma(2, 2, n),
+        'engagement_quality': likes / followers,
+        'domain': rng.choice(['Tech', 'Beauty', 'Gaming', None], n, p=[0.4, 0.3, 0.25, 0.05]),
+        'country': rng.choice(['India', 'USA', 'UK', 'Brazil'], n),
+        'Segment': rng.choice(['Nano', 'Micro', 'Macro', 'Mega'], n),
+    })
+    df.loc[rng.choice(n, 100, replace=False), 'followers'] = np.nan
+    return df
+
+
+def brute_force(index, position, k, rows=None, include_self=False):
+    rows = np.arange(index.n_rows) if rows is None else np.asarray(rows)
+    if not include_self:
+        rows = rows[rows != position]
+    dist = np.sqrt(index.distances(position, rows))
+    order = np.lexsort((rows, dist))[:k]
+    return rows[order], dist[order]
+
+
+def assert_same_neighbours(index, found, expected, position):
+    rows, dist = found
+    assert len(rows) == len(expected[0])
+    np.testing.assert_allclose(dist, expected[1], rtol=1e-5, atol=1e-6)
+    # Ties may be broken differently; every returned row must sit at its reported distance
+    np.testing.assert_allclose(np.sqrt(index.distances(position, rows)), dist, rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize('position', [0, 17, 1234, 2999])
+@pytest.mark.parametrize('k', [1, 10, 200])
+def test_pruned_search_is_exact(roster, position, k):
+    index = LookalikeIndex(roster)
+    assert_same_neighbours(index, index.query(position, k), brute_force(index, position, k), position)
+
+
+@pytest.mark.parametrize('block_rows', [50, 1_000_000])
+def test_filtered_search_is_exact_on_both_paths(roster, block_rows):
+    index = LookalikeIndex(roster)
+    rows = np.flatnonzero(roster['country'].isin(['India', 'UK']).to_numpy())
+    position = int(rows[5])
+
+    found = index.query(position, 25, rows=rows, block_rows=block_rows)
+    assert set(found[0]) <= set(rows) and position not in found[0]
+    assert_same_neighbours(index, found, brute_force(index, position, 25, rows), position)
+
+
+def test_include_self_puts_the_query_first(roster):
+    index = LookalikeIndex(roster)
+    rows, dist = index.query(42, 5, include_self=True)
+    assert rows[0] == 42 and dist[0] == 0
+
+
+def test_k_larger_than_candidates_returns_every_candidate(roster):
+    index = LookalikeIndex(roster)
+    rows, _ = index.query(3, 50, rows=[1, 2, 3, 4])
+    assert sorted(rows) == [1, 2, 4]
+
+
+def test_missing_columns_are_skipped():
+    df = pd.DataFrame({'followers': [10.0, 11.0, 5000.0], 'domain': ['Tech', 'Tech', 'Beauty']})
+    index = LookalikeIndex(df)
+    assert index.numeric == ['followers'] and list(index.categorical) == ['domain']
+    assert index.query(0, 1)[0].tolist() == [1]
+
+
+def test_similarity_scale():
+    assert similarity([0, 1, 3]).tolist() == [100.0, 50.0, 25.0]
@@ -0,0 +1,65 @@
+# tests/test_numeric_parser.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from components.numeric_parser import coerce_numeric_columns, parse_counts, parse_percent
+
+
+def counts(*values):
+    return parse_counts(pd.Series(values, dtype=object)).tolist()
+
+
+@pytest.mark.parametrize('cell, expected', [
+    ("15000", 15000.0),
+    ("15,000", 15000.0),
+    ("1.2M", 1_200_000.0),
+    ("2.5k", 2500.0),
+    (" 2 K ", 2000.0),
+    (".5m", 500_000.0),
+    ("1e3", 1000.0),
+    ("-15000", -15000.0),
+    ("-2.5k", -2500.0),
+    ("+3k", 3000.0),
+    ("-.5m", -500_000.0),
+])
+def test_single_values(cell, expected):
+    assert counts(cell) == [expected]
+
+
+@pytest.mark.parametrize('cell, expected', [
+    ("10k-20k", 15000.0),
+    ("10k - 20k", 15000.0),
+    ("10k to 20k", 15000.0),
+    ("100/200", 150.0),
+    ("4 5 6", 5.0),
+])
+def test_multi_value_cells_are_averaged(cell, expected):
+    assert counts(cell) == [expected]
+
+
+@pytest.mark.parametrize('cell', [
+    "unknown", "N/A", "-", "", None, np.nan,
+    "1.2M followers", "12abc", "abc 12", "1.2.3", "about 5k", "k",
+])
+def test_sentinels_and_malformed_cells_are_nan(cell):
+    assert np.isnan(counts(cell)[0])
+
+
+def test_percentages():
+    values = pd.Series(["4.5%", "4.1% 5.2%", "-1.5%", "5%-6%", "n/a", "high"])
+    assert parse_percent(values).tolist()[:4] == [4.5, 4.65, -1.5, 5.5]
+    assert parse_percent(values).iloc[4:].isna().all()
+
+
+def test_repeated_values_keep_their_positions():
+    parsed = parse_counts(pd.Series(["1k", "bad", "1k", None, "2k"], index=[5, 3, 9, 1, 0], name='followers'))
+    assert parsed.index.tolist() == [5, 3, 9, 1, 0] and parsed.name == 'followers'
+    assert parsed.fillna(-1).tolist() == [1000.0, -1, 1000.0, -1, 2000.0]
+
+
+def test_numeric_columns_pass_through():
+    df = pd.DataFrame({'followers': pd.Series([1, 2], dtype='int32'), '60_day_eng_rate': ["1%", "2%"]})
+    out = coerce_numeric_columns(df)
+    assert out['followers'].dtype == 'int32'
+    assert out['60_day_eng_rate'].tolist() == [1.0, 2.0]
@@ -0,0 +1,108 @@
+# tests/test_rollup.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic_data import generate_frame
+from components.ingest import prepare_frame
+from components.rollup import DIMENSIONS, HIGH_PERFORMER_THRESHOLD, MEASURES, RollupCube
+from components.segmentation import SEGMENT_LABELS, segment_followers
+from components.streaming import INVALID_OFFERS
+
+
+@pytest.fixture
+def roster():
+    df = prepare_frame(generate_frame(400, seed=7))
+    # Missing dimension values get their own cell
+    df.loc[df.index[::37], 'domain'] = None
+    return df
+
+
+def normalized(cube):
+    # Cell order depends on insertion order; compare cells by their dimension values
+    cells = cube.cells.copy()
+    key = cells[DIMENSIONS].map(str).agg('|'.join, axis=1)
+    return cells.set_index(key).sort_index()[cube.stats]
+
+
+def assert_same_cells(cube, expected):
+    pd.testing.assert_frame_equal(normalized(cube), normalized(expected), check_exact=False, rtol=1e-9)
+
+
+# ---------------------- RETRACTION ----------------------
+
+def test_retracting_a_chunk_restores_the_previous_cube(roster):
+    cube = RollupCube().update(roster.iloc[:300])
+    before = RollupCube().update(roster.iloc[:300])
+
+    cube.update(roster.iloc[300:]).update(roster.iloc[300:], sign=-1)
+    assert_same_cells(cube, before)
+    assert cube.metrics() == pytest.approx(before.metrics(), nan_ok=True)
+
+
+def test_fully_retracted_cells_disappear(roster):
+    lone = roster.iloc[:1].assign(country='Atlantis')
+    cube = RollupCube().update(roster).update(lone)
+    assert 'Atlantis' in cube.values('country')
+
+    cube.update(lone, sign=-1)
+    assert 'Atlantis' not in cube.values('country') and cube.rows == len(roster)
+    assert len(cube.update(roster, sign=-1).cells) == 0 and cube.rows == 0
+
+
+def test_retracting_an_updated_row_moves_it_between_cells(roster):
+    old = roster.iloc[[5]]
+    new = old.assign(followers=5_000_000.0, country='Brazil')
+    cube = RollupCube().update(roster).update(old, sign=-1).update(new)
+
+    assert_same_cells(cube, RollupCube().update(pd.concat([roster.drop(index=old.index), new])))
+
+
+# ---------------------- AGGREGATES ----------------------
+
+def test_merge_of_partial_cubes_matches_one_pass(roster):
+    merged = RollupCube().update(roster.iloc[:150]).merge(RollupCube().update(roster.iloc[150:]))
+    assert_same_cells(merged, RollupCube().update(roster))
+
+
+@pytest.mark.parametrize('dims', [('domain',), ('Segment', 'country')])
+def test_summary_matches_pandas_groupby(roster, dims):
+    frame = roster.assign(Segment=segment_followers(roster['followers']).astype(object))
+    grouped = frame.groupby(list(dims))
+    summary = RollupCube().update(roster).summary(*dims)
+    # summary() orders Segment as a categorical; compare on plain labels
+    summary = summary.astype({dim: object for dim in dims}).set_index(list(dims)).sort_index()
+
+    assert summary['count'].tolist() == grouped.size().sort_index().tolist()
+    for measure in MEASURES:
+        expected = grouped[measure].agg(['sum', 'mean', 'std']).sort_index()
+        for stat in ('sum', 'mean', 'std'):
+            np.testing.assert_allclose(summary[f"{measure}_{stat}"], expected[stat], rtol=1e-7, atol=1e-9)
+
+
+def test_where_metrics_and_counts_match_the_filtered_frame(roster):
+    members = {'country': ['India', 'USA'], 'domain': [], 'offer_type': ['Affiliate', 'N/A', '']}
+    sub = RollupCube().update(roster).where(members)
+    frame = roster[roster['country'].isin(members['country']) & roster['offer_type'].isin(members['offer_type'])]
+
+    assert sub.metrics() == pytest.approx({
+        "total_influencers": len(frame),
+        "total_reach": frame['followers'].sum(),
+        "avg_eng_rate": frame['60_day_eng_rate'].mean(),
+        "high_performers": int((frame['60_day_eng_rate'] > HIGH_PERFORMER_THRESHOLD).sum()),
+    })
+    segments = segment_followers(frame['followers']).value_counts().reindex(SEGMENT_LABELS, fill_value=0)
+    assert sub.segment_counts.tolist() == segments.tolist()
+    assert sub.offer_counts.to_dict() == {'Affiliate': int((frame['offer_type'] == 'Affiliate').sum())}
+    assert not set(sub.offer_counts.index) & set(INVALID_OFFERS)
+
+
+def test_only_primary_cluster_rows_are_counted(roster):
+    primary = pd.Series(True, index=roster.index, dtype=object)
+    primary.iloc[::4] = False
+    primary.iloc[1::4] = np.nan
+    cube = RollupCube().update(roster.assign(cluster_primary=primary))
+
+    assert_same_cells(cube, RollupCube().update(roster[primary.ne(False)]))
+    # Retraction filters the same rows, so it undoes the update exactly
+    assert cube.update(roster.assign(cluster_primary=primary), sign=-1).rows == 0
@@ -0,0 +1,97 @@
+# tests/test_score_many.py
+
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+from benchmarks.fake_gemini_server import make_handler
+from components import llm_brand_suitability as llm
+from components.llm_cache import LLMResponseCache
+
+PROFILES = {
+    i: llm.build_influencer_context({'channel_id': f"creator{i}", 'domain': 'Tech', 'followers': 1000 * (i + 1)})
+    for i in range(24)
+}
+
+
+@pytest.fixture
+def fake_gemini(tmp_path, monkeypatch):
+    """Start a fake Gemini server with the given fault rates and point the client at it."""
+    servers = []
+
+    def start(**rates):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(seed=7, **rates))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        monkeypatch.setenv('GEMINI_API_KEY', 'fake')
+        monkeypatch.setenv('GEMINI_API_ENDPOINT', f"http://127.0.0.1:{server.server_address[1]}")
+        # Drop any client configured for an earlier server
+        monkeypatch.setattr(llm, '_genai', None)
+        monkeypatch.setattr(llm, '_models', OrderedDict())
+        return server
+
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setattr(llm, 'get_cache', lambda: cache)
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def score(contexts, **kwargs):
+    stats = {}
+    results = {}
+    for key, result, ok in llm.score_many(contexts, 'Tech', 'Gamers', batch_size=8, requests_per_minute=60_000,
+                                          retries=0, stats=stats, **kwargs):
+        assert key not in results, f"{key} yielded twice"
+        results[key] = (result, ok)
+    return results, stats
+
+
+def test_clean_replies_score_every_profile_in_one_request_per_batch(fake_gemini):
+    fake_gemini()
+    results, stats = score(PROFILES)
+
+    assert set(results) == set(PROFILES)
+    assert all(ok and 0 <= result['score'] <= 100 for result, ok in results.values())
+    assert stats == {'requests': 3, 'resplits': 0, 'cached': 0}
+
+
+def test_dropped_and_invalid_items_are_resplit(fake_gemini):
+    fake_gemini(drop_rate=0.3, invalid_rate=0.2)
+    results, stats = score(PROFILES)
+
+    # Every profile is reported once, either scored or with the reason it was not
+    assert set(results) == set(PROFILES)
+    assert stats['resplits'] > 0
+    for result, ok in results.values():
+        assert (ok and 0 <= result['score'] <= 100) or (not ok and result.startswith("❌ Invalid result"))
+    assert sum(ok for _, ok in results.values()) > len(PROFILES) // 2
+
+
+def test_garbage_replies_fail_each_profile_without_caching(fake_gemini):
+    fake_gemini(garbage_rate=1.0)
+    results, _ = score(dict(list(PROFILES.items())[:4]))
+
+    assert all(not ok and "Unparseable response" in result for result, ok in results.values())
+    assert llm.get_cache().stats()['entries'] == 0
+
+
+def test_second_run_is_served_from_cache(fake_gemini):
+    fake_gemini()
+    first, _ = score(PROFILES)
+    second, stats = score(PROFILES)
+
+    assert second == first
+    assert stats == {'requests': 0, 'resplits': 0, 'cached': len(PROFILES)}
+
+
+def test_suitability_columns_align_with_roster_index():
+    results = {10: {'score': 80.0, 'alignment': 'Good fit.', 'risk_flags': ['a', 'b']}, 12: "❌ Invalid result: x"}
+    columns = llm.suitability_columns(results, pd.Index([12, 11, 10]))
+
+    assert columns['suitability_score'].tolist()[2] == 80.0
+    assert columns['suitability_score'].iloc[:2].isna().all()
+    assert columns.loc[10, 'suitability_risk_flags'] == "a; b"